@@ -0,0 +1,66 @@
+"""Mede o custo de atualizar a interface durante edições rápidas.
+
+Compara a atualização imediata a cada alteração (comportamento antigo)
+com o agendador, que agrupa as marcações em uma passada por volta do
+event loop.
+
+Uso: QT_QPA_PLATFORM=offscreen python benchmarks/bench_atualizacao_interface.py [n_edicoes]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+def main():
+    n_edicoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # O diretório de dados fica dentro da "home" temporária
+        os.environ['HOME'] = os.environ['USERPROFILE'] = diretorio
+        os.environ.pop('COLLECT_FEE_POOLS_ARMAZENAMENTO', None)
+
+        from PySide6.QtWidgets import QApplication
+
+        from gui.main_window import MonitorColetasApp
+
+        app = QApplication(sys.argv)
+        janela = MonitorColetasApp()
+        # Aguardar o carregamento em segundo plano
+        janela.pool_tarefas.waitForDone()
+        app.processEvents()
+        pool_id = janela.monitor.criar_nova_pool('Benchmark', '01/01/2024', 1000.0, 'ETH')
+        janela.monitor.definir_pool_ativa(pool_id)
+        janela.show()
+        app.processEvents()
+
+        # Atualização imediata: uma passada completa por alteração
+        inicio = time.perf_counter()
+        for i in range(n_edicoes):
+            janela.monitor.registrar_nova_coleta('01/02/2024', 1.0 + i)
+            janela.agendador.marcar('tabela', 'cards')
+            janela.agendador.executar()
+            app.processEvents()
+        imediato = time.perf_counter() - inicio
+
+        # Agrupada: as alterações só marcam; uma passada por volta do event loop
+        inicio = time.perf_counter()
+        for i in range(n_edicoes):
+            janela.monitor.registrar_nova_coleta('02/02/2024', 1.0 + i)
+            janela.agendador.marcar('tabela', 'cards')
+        app.processEvents()
+        agrupado = time.perf_counter() - inicio
+
+        print(f"{n_edicoes} edições")
+        print(f"  imediata: {imediato * 1000:.1f} ms ({imediato * 1000 / n_edicoes:.3f} ms por edição)")
+        print(f"  agrupada: {agrupado * 1000:.1f} ms ({agrupado * 1000 / n_edicoes:.3f} ms por edição)")
+
+        janela.monitor.fechar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Compara a carga de todas as pools com e sem o cache de inicialização.
+
+Gera pools sintéticas (CSV) em um diretório de dados temporário, grava o
+cache fechando o monitor uma vez e mede, em um processo novo para cada
+caso, o tempo de criar o monitor e carregar as coletas de todas as pools.
+
+Uso: python benchmarks/bench_cache_inicializacao.py [pools] [coletas_por_pool]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_carregamento_paralelo import gerar_dados  # noqa: E402
+
+SCRIPT = """
+import time
+inicio = time.perf_counter()
+from core.monitor import MonitorLiquidez
+monitor = MonitorLiquidez(usar_cache={usar_cache}, processos_carregamento=0)
+monitor.carregar_dados_pools()
+duracao = time.perf_counter() - inicio
+print(f"{{duracao:.3f}}|{{sum(len(dados) for dados in monitor.dados_pools.values())}}")
+"""
+
+
+def medir(usar_cache: bool) -> tuple:
+    saida = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(usar_cache=usar_cache)],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    duracao, coletas = saida.split('|')
+    return float(duracao), int(coletas)
+
+
+def main():
+    total_pools = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    coletas_por_pool = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # O diretório de dados fica dentro da "home" temporária
+        os.environ['HOME'] = os.environ['USERPROFILE'] = diretorio
+        os.environ.pop('COLLECT_FEE_POOLS_ARMAZENAMENTO', None)
+        sys.path.insert(0, RAIZ)
+
+        print(f"Gerando {total_pools} pools x {coletas_por_pool} coletas...")
+        gerar_dados(total_pools, coletas_por_pool)
+
+        # Uma execução completa grava o cache
+        from core.monitor import MonitorLiquidez
+        monitor = MonitorLiquidez()
+        monitor.carregar_dados_pools()
+        monitor.fechar()
+
+        sem_cache, coletas = medir(False)
+        com_cache, _ = medir(True)
+        print(f"sem cache  {sem_cache:7.2f} s  ({coletas} coletas)")
+        print(f"com cache  {com_cache:7.2f} s  {sem_cache / com_cache:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Compara o carregamento das coletas de todas as pools, sequencial e em paralelo.
+
+Gera pools sintéticas (CSV) em um diretório de dados temporário e mede, em um
+processo novo para cada configuração, o tempo de `carregar_dados_pools()` com
+1 (sequencial), 2, 4, ... processos até o nº de núcleos.
+
+Uso: python benchmarks/bench_carregamento_paralelo.py [pools] [coletas_por_pool]
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import time
+inicio = time.perf_counter()
+from core.monitor import MonitorLiquidez
+# Sem o cache de inicialização: mede a leitura e a interpretação, não acertos do cache
+monitor = MonitorLiquidez(processos_carregamento={processos}, usar_cache=False)
+monitor.carregar_dados_pools()
+duracao = time.perf_counter() - inicio
+print(f"{{duracao:.3f}}|{{sum(len(dados) for dados in monitor.dados_pools.values())}}")
+"""
+
+
+def gerar_dados(total_pools: int, coletas_por_pool: int) -> None:
+    """Cria as pools e suas coletas no diretório de dados atual."""
+    from core.monitor import MonitorLiquidez
+
+    aleatorio = random.Random(42)
+    monitor = MonitorLiquidez(gravacao_manual=True, usar_cache=False)
+    for numero in range(total_pools):
+        pool_id = monitor.criar_nova_pool(f'Pool {numero}', '01/01/2015', 1000.0, 'ETH/USDC')
+        monitor.registrar_coletas_em_lote(pool_id, (
+            (f'{aleatorio.randint(1, 28):02d}/{aleatorio.randint(1, 12):02d}/{aleatorio.randint(2015, 2025)}',
+             round(aleatorio.uniform(0.01, 500), 2))
+            for _ in range(coletas_por_pool)
+        ))
+    monitor.fechar()
+
+
+def medir(processos: int) -> tuple:
+    saida = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(processos=processos)],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    duracao, coletas = saida.split('|')
+    return float(duracao), int(coletas)
+
+
+def main():
+    total_pools = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    coletas_por_pool = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    nucleos = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # O diretório de dados fica dentro da "home" temporária
+        os.environ['HOME'] = os.environ['USERPROFILE'] = diretorio
+        os.environ.pop('COLLECT_FEE_POOLS_ARMAZENAMENTO', None)
+        sys.path.insert(0, RAIZ)
+
+        print(f"Gerando {total_pools} pools x {coletas_por_pool} coletas...")
+        gerar_dados(total_pools, coletas_por_pool)
+
+        configuracoes = [1]
+        while configuracoes[-1] * 2 <= nucleos:
+            configuracoes.append(configuracoes[-1] * 2)
+        if configuracoes[-1] != nucleos:
+            configuracoes.append(nucleos)
+
+        base = None
+        for processos in configuracoes:
+            duracao, coletas = medir(processos)
+            base = base or duracao
+            modo = 'sequencial' if processos == 1 else f'{processos} processos'
+            print(f"{modo:<14} {duracao:7.2f} s  {base / duracao:5.2f}x  ({coletas} coletas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compara a exportação de todas as pools em CSV (uma a uma) e no arquivo colunar.
+
+Gera pools sintéticas em um diretório de dados temporário e mede, com as
+coletas já carregadas: a exportação CSV de cada pool, a exportação para
+Parquet (se o pyarrow estiver instalado) e .cfpz, a leitura de cada arquivo
+e a importação completa em um diretório de dados vazio.
+
+Uso: python benchmarks/bench_exportacao_colunar.py [pools] [coletas_por_pool]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_carregamento_paralelo import gerar_dados  # noqa: E402
+
+
+def cronometrar(descricao: str, funcao) -> None:
+    inicio = time.perf_counter()
+    funcao()
+    print(f"{descricao:<28} {time.perf_counter() - inicio:7.2f} s")
+
+
+def main():
+    total_pools = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    coletas_por_pool = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # O diretório de dados fica dentro da "home" temporária
+        os.environ['HOME'] = os.environ['USERPROFILE'] = os.path.join(diretorio, 'origem')
+        os.environ.pop('COLLECT_FEE_POOLS_ARMAZENAMENTO', None)
+        sys.path.insert(0, RAIZ)
+
+        print(f"Gerando {total_pools} pools x {coletas_por_pool} coletas...")
+        gerar_dados(total_pools, coletas_por_pool)
+
+        from core.exportacao_colunar import EXTENSOES, FORMATO_COLUNAR, FORMATO_PARQUET, exportar_pools, ler_pools, pa
+        from core.monitor import MonitorLiquidez
+
+        monitor = MonitorLiquidez(gravacao_manual=True)
+        monitor.carregar()
+        monitor.carregar_dados_pools()
+
+        def exportar_csv():
+            for numero, pool in enumerate(monitor.get_lista_pools()):
+                monitor.definir_pool_ativa(pool.pool_id)
+                monitor.exportar_dados_pool_ativa(os.path.join(diretorio, f'pool_{numero}.csv'))
+
+        cronometrar("exportar CSV (por pool)", exportar_csv)
+
+        formatos = [FORMATO_PARQUET, FORMATO_COLUNAR] if pa is not None else [FORMATO_COLUNAR]
+        arquivos = {}
+        for formato in formatos:
+            arquivos[formato] = os.path.join(diretorio, f'pools{EXTENSOES[formato]}')
+            cronometrar(f"exportar {formato}", lambda: exportar_pools(monitor, arquivos[formato], formato))
+        monitor.fechar()
+
+        for formato in formatos:
+            tamanho = os.path.getsize(arquivos[formato]) / (1024 * 1024)
+            cronometrar(f"ler {formato} ({tamanho:.1f} MB)", lambda: ler_pools(arquivos[formato]))
+
+        # Importação completa: cria as pools e grava as coletas em um diretório vazio
+        from core.exportacao_colunar import importar_pools
+        for formato in formatos:
+            os.environ['HOME'] = os.environ['USERPROFILE'] = os.path.join(diretorio, f'destino_{formato}')
+            destino = MonitorLiquidez(gravacao_manual=True)
+            destino.carregar()
+            cronometrar(f"importar {formato}", lambda: (importar_pools(destino, arquivos[formato]), destino.flush()))
+            destino.fechar()
+
+        print(f"Pyarrow {'disponível' if pa is not None else 'ausente'}; "
+              f"{total_pools * coletas_por_pool} coletas no total")
+
+
+if __name__ == '__main__':
+    main()
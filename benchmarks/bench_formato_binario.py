@@ -0,0 +1,88 @@
+"""Compara o carregamento de uma pool grande em CSV e no formato binário.
+
+Gera uma pool sintética com N coletas (padrão 10⁶) em um diretório de dados
+temporário, converte-a para o formato binário e mede, em um processo novo
+para cada formato, o tempo de `carregar_dados_pool`, a memória
+residente (RSS) do processo antes e depois da carga e o pico de RSS.
+
+Uso: python benchmarks/bench_formato_binario.py [coletas]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_carregamento_paralelo import gerar_dados  # noqa: E402
+
+SCRIPT = """
+import os, sys, time
+from core.armazenamento import criar_armazenamento
+from core.monitor import MonitorLiquidez
+
+def pico_mb():
+    # No Linux, VmHWM (o ru_maxrss herda o pico do processo pai)
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as file:
+            for linha in file:
+                if linha.startswith('VmHWM:'):
+                    return int(linha.split()[1]) / 1024
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def rss_mb():
+    # RSS atual no Linux; nas demais plataformas, o pico informado pelo sistema
+    if os.path.exists('/proc/self/statm'):
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    return pico_mb()
+
+monitor = MonitorLiquidez(criar_armazenamento('{formato}'), usar_cache=False, processos_carregamento=0)
+pool_id = monitor.get_lista_pools()[0].pool_id
+antes = rss_mb()
+inicio = time.perf_counter()
+monitor.carregar_dados_pool(pool_id)
+duracao = time.perf_counter() - inicio
+print(f"{{duracao:.3f}}|{{antes:.1f}}|{{rss_mb():.1f}}|{{pico_mb():.1f}}|{{len(monitor.dados_pools[pool_id])}}")
+"""
+
+
+def medir(formato: str) -> tuple:
+    saida = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(formato=formato)],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    duracao, antes, depois, pico, coletas = saida.split('|')
+    return float(duracao), float(antes), float(depois), float(pico), int(coletas)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # O diretório de dados fica dentro da "home" temporária
+        os.environ['HOME'] = os.environ['USERPROFILE'] = diretorio
+        os.environ.pop('COLLECT_FEE_POOLS_ARMAZENAMENTO', None)
+        sys.path.insert(0, RAIZ)
+
+        print(f"Gerando uma pool com {total} coletas...")
+        gerar_dados(1, total)
+
+        from core.armazenamento import ArmazenamentoBinario, migrar_csv_para_binario
+        migrar_csv_para_binario(ArmazenamentoBinario())
+
+        base = None
+        for formato in ('csv', 'binario'):
+            duracao, antes, depois, pico, coletas = medir(formato)
+            base = base or duracao
+            print(f"{formato:<8} {duracao:7.3f} s  {base / duracao:6.1f}x  "
+                  f"RSS {antes:6.1f} -> {depois:6.1f} MB (+{depois - antes:.1f}, pico +{pico - antes:.1f})  "
+                  f"({coletas} coletas)")
+
+
+if __name__ == '__main__':
+    main()
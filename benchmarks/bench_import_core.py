@@ -0,0 +1,43 @@
+"""Mede o tempo de importação do núcleo e verifica que ele não carrega o PySide6.
+
+Cada módulo é importado em um processo novo, para medir a partida a frio.
+Sai com código 1 se algum deles carregar o PySide6.
+
+Uso: python benchmarks/bench_import_core.py
+"""
+
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS = ['core.monitor', 'core.armazenamento', 'models', 'utils']
+
+SCRIPT = """
+import sys, time
+inicio = time.perf_counter()
+import {modulo}
+duracao = time.perf_counter() - inicio
+qt = sorted(nome for nome in sys.modules if nome.split('.')[0] == 'PySide6')
+print(f"{{duracao * 1000:.1f}}|{{','.join(qt)}}")
+"""
+
+
+def main():
+    falhou = False
+    for modulo in MODULOS:
+        saida = subprocess.run(
+            [sys.executable, '-c', SCRIPT.format(modulo=modulo)],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        duracao, qt = saida.split('|')
+        status = 'ok' if not qt else f'CARREGOU PySide6 ({qt})'
+        falhou = falhou or bool(qt)
+        print(f"import {modulo:<22} {float(duracao):8.1f} ms  {status}")
+
+    sys.exit(1 if falhou else 0)
+
+
+if __name__ == '__main__':
+    main()
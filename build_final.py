@@ -46,11 +46,27 @@ hiddenimports = [
     'PySide6.QtGui',
     'models.coleta',
     'models.pool_config',
+    'models.resumo_pool',
+    'models.coleta_store',
     'core.monitor',
+    'core.armazenamento',
+    'core.persistencia',
+    'core.importador',
+    'core.carregamento',
+    'core.cache_coletas',
+    'core.formato_binario',
+    'core.exportacao_colunar',
+    'core.exportacao',
     'gui.main_window',
     'gui.dialogs',
     'gui.about_dialog',
+    'gui.coletas_model',
+    'gui.agendador',
+    'gui.tarefas',
     'utils.paths',
+    'utils.arquivos',
+    'utils.datas',
+    'utils.perfil',
     'utils.styles',
 ]
 
@@ -178,11 +194,27 @@ hiddenimports = [
     'pyside6_plugins',
     'models.coleta',
     'models.pool_config',
+    'models.resumo_pool',
+    'models.coleta_store',
     'core.monitor',
+    'core.armazenamento',
+    'core.persistencia',
+    'core.importador',
+    'core.carregamento',
+    'core.cache_coletas',
+    'core.formato_binario',
+    'core.exportacao_colunar',
+    'core.exportacao',
     'gui.main_window',
     'gui.dialogs',
     'gui.about_dialog',
+    'gui.coletas_model',
+    'gui.agendador',
+    'gui.tarefas',
     'utils.paths',
+    'utils.arquivos',
+    'utils.datas',
+    'utils.perfil',
     'utils.styles',
 ]
 
@@ -292,11 +324,27 @@ hiddenimports = [
     'PySide6.QtGui',
     'models.coleta',
     'models.pool_config',
+    'models.resumo_pool',
+    'models.coleta_store',
     'core.monitor',
+    'core.armazenamento',
+    'core.persistencia',
+    'core.importador',
+    'core.carregamento',
+    'core.cache_coletas',
+    'core.formato_binario',
+    'core.exportacao_colunar',
+    'core.exportacao',
     'gui.main_window',
     'gui.dialogs',
     'gui.about_dialog',
+    'gui.coletas_model',
+    'gui.agendador',
+    'gui.tarefas',
     'utils.paths',
+    'utils.arquivos',
+    'utils.datas',
+    'utils.perfil',
     'utils.styles',
 ]
 
@@ -0,0 +1,237 @@
+"""Linha de comando do Monitor de Coletas (sem interface gráfica).
+
+Usa o mesmo núcleo (`core`) da aplicação. As alterações de uma execução
+são gravadas uma única vez, ao final.
+
+Exemplos:
+    collect-fee-pools pools
+    collect-fee-pools registrar "Minha Pool" 15/03/2025 12.50
+    collect-fee-pools importar "Minha Pool" coletas.csv
+    cat coletas.csv | collect-fee-pools importar "Minha Pool"
+    collect-fee-pools estatisticas
+    collect-fee-pools exportar "Minha Pool" saida.csv
+    collect-fee-pools exportar "Pool A" "Pool B" exportacao/
+    collect-fee-pools exportar-pools carteira.parquet
+    collect-fee-pools importar-pools carteira.parquet
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from core.exportacao import exportar_coletas
+from core.exportacao_colunar import EXTENSOES, exportar_pools, importar_pools
+from core.importador import FORMATOS_DATA, ConfiguracaoImportacao, importar_arquivo
+from core.monitor import MonitorLiquidez
+from models.pool_config import PoolConfig
+
+
+class ErroCli(Exception):
+    """Erro de uso exibido sem traceback."""
+
+
+def _resolver_pool(monitor: MonitorLiquidez, referencia: str) -> PoolConfig:
+    """Encontra uma pool pelo id (completo ou prefixo) ou pelo nome."""
+    pools = monitor.get_lista_pools()
+    for pool in pools:
+        if pool.pool_id == referencia:
+            return pool
+
+    encontradas = [pool for pool in pools if pool.nome.lower() == referencia.lower()]
+    if not encontradas:
+        encontradas = [pool for pool in pools if pool.pool_id.startswith(referencia)]
+
+    if not encontradas:
+        raise ErroCli(f"Pool não encontrada: {referencia}")
+    if len(encontradas) > 1:
+        raise ErroCli(f"Mais de uma pool corresponde a '{referencia}'; use o id")
+    return encontradas[0]
+
+
+def _ler_valor(texto: str) -> float:
+    """Converte um valor em USD, aceitando vírgula decimal."""
+    try:
+        return float(texto.strip().replace('$', '').replace(',', '.'))
+    except ValueError:
+        raise ErroCli(f"Valor inválido: {texto!r}")
+
+
+def comando_pools(monitor: MonitorLiquidez, args) -> None:
+    pools = monitor.get_lista_pools()
+    if not pools:
+        print("Nenhuma pool configurada")
+        return
+    for pool in pools:
+        resumo = monitor.resumo_pools.get(pool.pool_id)
+        coletas = resumo.total_coletas if resumo else 0
+        total = resumo.total_usd if resumo else 0.0
+        print(f"{pool.pool_id[:8]}  {pool.nome:<24} {pool.tipo_moeda:<10} "
+              f"abertura {pool.data_abertura}  inicial ${pool.valor_inicial:.2f}  "
+              f"{coletas} coletas  ${total:.2f}")
+
+
+def comando_registrar(monitor: MonitorLiquidez, args) -> None:
+    pool = _resolver_pool(monitor, args.pool)
+    valor = _ler_valor(args.valor)
+    if not valor > 0:
+        raise ErroCli("Valor da coleta deve ser maior que zero")
+    monitor.definir_pool_ativa(pool.pool_id)
+    try:
+        coleta = monitor.registrar_nova_coleta(args.data, valor,
+                                               permitir_duplicada=args.permitir_duplicada)
+    except ValueError as e:
+        raise ErroCli(str(e))
+    print(f"Registrada em {pool.nome}: {coleta}")
+
+
+def comando_importar(monitor: MonitorLiquidez, args) -> None:
+    pool = _resolver_pool(monitor, args.pool)
+    config = ConfiguracaoImportacao(
+        formato=args.formato,
+        coluna_data=args.coluna_data,
+        coluna_valor=args.coluna_valor,
+        formatos_data=args.formato_data or FORMATOS_DATA,
+        ignorar_duplicadas=not args.manter_duplicadas,
+        ignorar_invalidas=args.ignorar_invalidas,
+    )
+
+    origem = sys.stdin if args.arquivo in (None, '-') else args.arquivo
+    try:
+        resultado = importar_arquivo(monitor, pool.pool_id, origem, config)
+    except (ValueError, OSError) as e:
+        raise ErroCli(str(e))
+    print(f"{pool.nome}: {resultado}")
+
+
+def comando_estatisticas(monitor: MonitorLiquidez, args) -> None:
+    if args.pool:
+        pools: List[PoolConfig] = [_resolver_pool(monitor, args.pool)]
+    else:
+        pools = monitor.get_lista_pools()
+        # Todas as pools de uma vez (em paralelo, se configurado)
+        monitor.carregar_dados_pools()
+
+    for pool in pools:
+        monitor.definir_pool_ativa(pool.pool_id)
+        total_coletas = monitor.contar_coletas_pool_ativa()
+        total = monitor.calcular_total_acumulado_pool_ativa()
+        media = total / total_coletas if total_coletas else 0.0
+        print(f"{pool.nome} ({pool.tipo_moeda})")
+        print(f"  Coletas:         {total_coletas}")
+        print(f"  Total acumulado: ${total:.2f}")
+        print(f"  Taxa acumulada:  {monitor.calcular_taxa_acumulada_pool_ativa():.2f}%")
+        print(f"  Média/coleta:    ${media:.2f}")
+
+    if not args.pool:
+        print("Todas as pools")
+        print(f"  Coletas:         {monitor.contar_total_coletas_todas_pools()}")
+        print(f"  Total acumulado: ${monitor.calcular_total_acumulado_todas_pools():.2f}")
+
+
+def comando_exportar(monitor: MonitorLiquidez, args) -> None:
+    pools = [_resolver_pool(monitor, referencia) for referencia in args.pools]
+    try:
+        resultado = exportar_coletas(monitor, [pool.pool_id for pool in pools], args.destino, args.combinado)
+    except (ValueError, OSError) as e:
+        raise ErroCli(str(e))
+    print(f"{resultado}:")
+    for arquivo in resultado.arquivos:
+        print(f"  {arquivo}")
+
+
+def comando_exportar_pools(monitor: MonitorLiquidez, args) -> None:
+    try:
+        total = exportar_pools(monitor, args.arquivo, args.formato)
+    except ValueError as e:
+        raise ErroCli(str(e))
+    print(f"{len(monitor.get_lista_pools())} pool(s) e {total} coleta(s) exportadas para: {args.arquivo}")
+
+
+def comando_importar_pools(monitor: MonitorLiquidez, args) -> None:
+    try:
+        resultado = importar_pools(monitor, args.arquivo, args.formato)
+    except (ValueError, OSError) as e:
+        raise ErroCli(str(e))
+    print(resultado)
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='collect-fee-pools',
+        description='Monitor de coletas de taxas em pools de liquidez (linha de comando).'
+    )
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    comando = comandos.add_parser('pools', help='lista as pools')
+    comando.set_defaults(executar=comando_pools)
+
+    comando = comandos.add_parser('registrar', help='registra uma coleta')
+    comando.add_argument('pool', help='id (ou prefixo) ou nome da pool')
+    comando.add_argument('data', help='data no formato dd/MM/yyyy')
+    comando.add_argument('valor', help='valor coletado em USD')
+    comando.add_argument('--permitir-duplicada', action='store_true',
+                         help='registra mesmo se já houver coleta com a mesma data e valor')
+    comando.set_defaults(executar=comando_registrar)
+
+    comando = comandos.add_parser('importar', help='registra coletas em lote a partir de um CSV ou JSON')
+    comando.add_argument('pool', help='id (ou prefixo) ou nome da pool')
+    comando.add_argument('arquivo', nargs='?', help="arquivo CSV/JSON; '-' ou omitido lê da entrada padrão")
+    comando.add_argument('--formato', choices=('auto', 'csv', 'json'), default='auto',
+                         help='formato do arquivo (padrão: pela extensão/conteúdo)')
+    comando.add_argument('--coluna-data', help='coluna (ou chave JSON) da data')
+    comando.add_argument('--coluna-valor', help='coluna (ou chave JSON, ex.: fees.usd) do valor em USD')
+    comando.add_argument('--formato-data', action='append',
+                         help="formato da data (strptime, 'iso' ou 'unix'); pode ser repetido")
+    comando.add_argument('--ignorar-invalidas', action='store_true',
+                         help='pula linhas inválidas em vez de interromper')
+    comando.add_argument('--manter-duplicadas', action='store_true',
+                         help='registra também coletas já existentes (mesma data e valor)')
+    comando.set_defaults(executar=comando_importar)
+
+    comando = comandos.add_parser('estatisticas', help='mostra as estatísticas por pool e de todas as pools')
+    comando.add_argument('pool', nargs='?', help='apenas esta pool')
+    comando.set_defaults(executar=comando_estatisticas)
+
+    comando = comandos.add_parser('exportar', help='exporta as coletas de uma ou mais pools para CSV')
+    comando.add_argument('pools', nargs='+', metavar='pool', help='id (ou prefixo) ou nome da pool')
+    comando.add_argument('destino',
+                         help='arquivo CSV (uma pool ou --combinado) ou diretório (um arquivo por pool)')
+    comando.add_argument('--combinado', action='store_true',
+                         help='grava todas as pools em um único CSV, identificadas pelas colunas Pool e Tipo de Moeda')
+    comando.set_defaults(executar=comando_exportar)
+
+    comando = comandos.add_parser('exportar-pools',
+                                  help='exporta todas as pools para um arquivo colunar (Parquet ou .cfpz)')
+    comando.add_argument('arquivo', help='arquivo de destino (.parquet ou .cfpz)')
+    comando.add_argument('--formato', choices=tuple(EXTENSOES),
+                         help='formato do arquivo (padrão: pela extensão; Parquet se o pyarrow estiver instalado)')
+    comando.set_defaults(executar=comando_exportar_pools)
+
+    comando = comandos.add_parser('importar-pools', help='importa pools exportadas com exportar-pools')
+    comando.add_argument('arquivo', help='arquivo .parquet ou .cfpz')
+    comando.add_argument('--formato', choices=tuple(EXTENSOES), help='formato do arquivo (padrão: pelo conteúdo)')
+    comando.set_defaults(executar=comando_importar_pools)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = criar_parser().parse_args(argv)
+
+    # Tudo o que o comando alterar é gravado uma única vez, em fechar()
+    monitor = MonitorLiquidez(gravacao_manual=True)
+    try:
+        args.executar(monitor, args)
+    except ErroCli as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        monitor.fechar()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,665 @@
+"""Camadas de armazenamento das pools e coletas (CSV e SQLite)."""
+
+import csv
+import io
+import itertools
+import operator
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from core.formato_binario import anexar_coletas, escrever_colunas, ler_colunas
+from models.coleta import Coleta
+from models.coleta_store import ColetaStore
+from models.pool_config import PoolConfig
+from models.resumo_pool import ResumoPool
+from utils.arquivos import escrever_csv_atomico
+from utils.paths import get_data_file_path
+
+# Quantidade de coletas no journal que dispara a compactação no arquivo base
+LIMITE_JOURNAL_COLETAS = 200
+
+# Variável de ambiente que escolhe o armazenamento padrão ('csv' ou 'sqlite')
+VARIAVEL_ARMAZENAMENTO = 'COLLECT_FEE_POOLS_ARMAZENAMENTO'
+
+# Registro lido do armazenamento: (data, coleta_usd, taxa_percentual, dias, coleta_id).
+# Taxa e dias são None quando ausentes em dados antigos e o monitor os recalcula.
+RegistroColeta = Tuple[str, float, Optional[float], Optional[int], int]
+
+# Conteúdo bruto das coletas de uma pool no CSV: (arquivo base, journal)
+ConteudoColetas = Tuple[str, str]
+
+
+def _ler_texto(caminho: str) -> str:
+    """Conteúdo de um arquivo de texto ('' se ele não existir)."""
+    if not os.path.exists(caminho):
+        return ''
+    with open(caminho, 'r', newline='', encoding='utf-8') as file:
+        return file.read()
+
+
+def interpretar_coletas_csv(reader: Iterator[List[str]], ids: Iterator[int]) -> List[RegistroColeta]:
+    """Interpreta as linhas de um CSV de coletas (formato atual ou antigo), após o cabeçalho."""
+    registros = []
+    if next(reader, None) is None:
+        return registros
+
+    for row in reader:
+        if len(row) < 2:
+            continue
+        try:
+            data = row[0]
+            coleta_usd = float(row[1])
+        except ValueError as e:
+            print(f'Erro ao ler a linha {row}. Erro: {e}')
+            continue
+
+        taxa = None
+        if len(row) >= 3:
+            try:
+                taxa = float(row[2])
+            except ValueError:
+                taxa = None
+
+        dias = None
+        if len(row) >= 5:  # 5ª coluna seria dias
+            try:
+                dias = int(float(row[4]))
+            except ValueError:
+                dias = None
+
+        registros.append((data, coleta_usd, taxa, dias, next(ids)))
+    return registros
+
+
+def interpretar_journal_csv(reader: Iterator[List[str]], ids: Iterator[int]) -> List[RegistroColeta]:
+    """Interpreta as linhas do journal de coletas de uma pool."""
+    registros = []
+    for row in reader:
+        # Linhas incompletas indicam uma gravação interrompida
+        if len(row) < 4:
+            continue
+        try:
+            registro = (row[0], float(row[1]), float(row[2]), int(float(row[3])), next(ids))
+        except ValueError as e:
+            print(f'Erro ao ler a linha {row} do journal. Erro: {e}')
+            continue
+        registros.append(registro)
+    return registros
+
+
+def interpretar_conteudo_coletas(conteudo: ConteudoColetas) -> Tuple[List[RegistroColeta], int]:
+    """Interpreta o conteúdo lido por `ArmazenamentoCSV.ler_conteudo_coletas`.
+
+    Não depende do armazenamento (pode rodar em outro processo): os ids ficam
+    zerados até `concluir_carregamento`. Retorna os registros e quantos vieram do journal.
+    """
+    base, journal = conteudo
+    sem_id = itertools.repeat(0)
+    registros = interpretar_coletas_csv(csv.reader(io.StringIO(base, newline='')), sem_id)
+    do_journal = interpretar_journal_csv(csv.reader(io.StringIO(journal, newline='')), sem_id)
+    registros.extend(do_journal)
+    return registros, len(do_journal)
+
+
+class Armazenamento(ABC):
+    """Interface comum dos armazenamentos usados pelo MonitorLiquidez."""
+
+    @abstractmethod
+    def existe(self) -> bool:
+        """Indica se já existem dados gravados neste armazenamento."""
+
+    @abstractmethod
+    def carregar_pools(self) -> List[PoolConfig]:
+        """Carrega as configurações de pools na ordem de criação."""
+
+    @abstractmethod
+    def salvar_pools(self, pools: List[PoolConfig], alteradas: Optional[Iterable[str]] = None) -> None:
+        """Salva as pools; `alteradas` restringe a gravação quando suportado."""
+
+    @abstractmethod
+    def excluir_pool(self, pool_id: str) -> None:
+        """Remove a pool e todas as suas coletas."""
+
+    @abstractmethod
+    def carregar_coletas(self, pool_id: str) -> List[RegistroColeta]:
+        """Carrega as coletas de uma pool."""
+
+    def carregar_dados(self, pool_id: str) -> Optional[ColetaStore]:
+        """Carrega as coletas já em colunas, quando o formato permite (sem passar por registros).
+
+        O padrão (None) indica que as coletas devem ser lidas com `carregar_coletas`.
+        """
+        return None
+
+    @abstractmethod
+    def salvar_coletas(self, pool_id: str, dados: ColetaStore) -> None:
+        """Grava todas as coletas de uma pool, substituindo as existentes."""
+
+    @abstractmethod
+    def aplicar_alteracoes(self, pool_id: str, dados: ColetaStore,
+                           anexadas: Iterable[Coleta] = (),
+                           alteradas: Iterable[Coleta] = (),
+                           removidas: Iterable[int] = ()) -> None:
+        """Grava apenas as coletas novas, alteradas e removidas de uma pool."""
+
+    @abstractmethod
+    def limpar_coletas(self, pool_id: str) -> None:
+        """Remove todas as coletas de uma pool."""
+
+    @abstractmethod
+    def novo_id_coleta(self) -> int:
+        """Reserva um identificador para uma nova coleta."""
+
+    @abstractmethod
+    def carregar_resumo(self) -> List[ResumoPool]:
+        """Carrega os totais persistidos de cada pool."""
+
+    @abstractmethod
+    def salvar_resumo(self, resumos: List[ResumoPool]) -> None:
+        """Grava os totais de todas as pools."""
+
+    def ler_conteudo_coletas(self, pool_id: str) -> Optional[ConteudoColetas]:
+        """Lê sem interpretar as coletas de uma pool, para o carregamento paralelo.
+
+        O conteúdo é interpretado por `interpretar_conteudo_coletas`, possivelmente
+        em outro processo. O padrão (None) indica que o armazenamento não separa as
+        duas etapas e as coletas são lidas com `carregar_coletas`.
+        """
+        return None
+
+    def concluir_carregamento(self, pool_id: str, dados: ColetaStore, linhas_journal: int) -> None:
+        """Completa as coletas montadas a partir de `ler_conteudo_coletas` (ids e journal)."""
+
+    def arquivos_coletas(self, pool_id: str) -> List[str]:
+        """Arquivos de onde as coletas da pool são lidas, para o cache de inicialização.
+
+        Vazio (padrão) quando o armazenamento não guarda cada pool em arquivos próprios.
+        """
+        return []
+
+    def linhas_journal(self, pool_id: str) -> int:
+        """Coletas da pool ainda no journal (passado a `concluir_carregamento`)."""
+        return 0
+
+    @contextmanager
+    def transacao(self):
+        """Agrupa as gravações do bloco numa unidade atômica, quando o armazenamento permite.
+
+        No CSV cada arquivo já é substituído de forma atômica; o padrão não faz nada.
+        """
+        yield
+
+    def fechar(self) -> None:
+        """Libera recursos abertos pelo armazenamento."""
+
+
+class ArmazenamentoCSV(Armazenamento):
+    """Armazenamento em pools_config.csv e um CSV (mais journal) por pool."""
+
+    def __init__(self):
+        self.arquivo_pools = get_data_file_path('pools_config.csv')
+        self.arquivo_resumo = get_data_file_path('pools_resumo.csv')
+        # Quantidade de coletas pendentes no journal de cada pool
+        self.tamanho_journal = {}
+        # Identificadores de coleta válidos apenas durante a sessão
+        self._ids = itertools.count(1)
+
+    def _arquivo_coletas(self, pool_id: str) -> str:
+        return get_data_file_path(f'pool_{pool_id}_coletas.csv')
+
+    def _arquivo_journal(self, pool_id: str) -> str:
+        return get_data_file_path(f'pool_{pool_id}_coletas.journal.csv')
+
+    def existe(self) -> bool:
+        return os.path.exists(self.arquivo_pools)
+
+    def carregar_pools(self) -> List[PoolConfig]:
+        if not os.path.exists(self.arquivo_pools):
+            return []
+
+        with open(self.arquivo_pools, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            return [PoolConfig.from_dict(row) for row in reader]
+
+    def salvar_pools(self, pools: List[PoolConfig], alteradas: Optional[Iterable[str]] = None) -> None:
+        fieldnames = ['pool_id', 'nome', 'data_abertura', 'valor_inicial', 'tipo_moeda']
+        linhas = [fieldnames]
+        linhas.extend([pool.to_dict()[campo] for campo in fieldnames] for pool in pools)
+        escrever_csv_atomico(self.arquivo_pools, linhas)
+
+    def excluir_pool(self, pool_id: str) -> None:
+        self.limpar_coletas(pool_id)
+
+    def novo_id_coleta(self) -> int:
+        return next(self._ids)
+
+    def carregar_resumo(self) -> List[ResumoPool]:
+        if not os.path.exists(self.arquivo_resumo):
+            return []
+
+        with open(self.arquivo_resumo, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            return [ResumoPool.from_dict(row) for row in reader]
+
+    def salvar_resumo(self, resumos: List[ResumoPool]) -> None:
+        fieldnames = ['pool_id', 'total_coletas', 'total_usd', 'total_taxa']
+        linhas = [fieldnames]
+        linhas.extend([resumo.to_dict()[campo] for campo in fieldnames] for resumo in resumos)
+        escrever_csv_atomico(self.arquivo_resumo, linhas)
+
+    def ler_arquivo_coletas(self, caminho: str) -> List[RegistroColeta]:
+        """Lê um CSV de coletas (formato atual ou antigo)."""
+        if not os.path.exists(caminho):
+            return []
+
+        with open(caminho, 'r', newline='', encoding='utf-8') as file:
+            return interpretar_coletas_csv(csv.reader(file), self._ids)
+
+    def carregar_coletas(self, pool_id: str) -> List[RegistroColeta]:
+        registros = self.ler_arquivo_coletas(self._arquivo_coletas(pool_id))
+        self.tamanho_journal[pool_id] = 0
+
+        # Aplicar coletas registradas no journal desde a última compactação
+        arquivo_journal = self._arquivo_journal(pool_id)
+        if os.path.exists(arquivo_journal):
+            with open(arquivo_journal, 'r', newline='', encoding='utf-8') as file:
+                do_journal = interpretar_journal_csv(csv.reader(file), self._ids)
+            registros.extend(do_journal)
+            self.tamanho_journal[pool_id] = len(do_journal)
+
+        return registros
+
+    def ler_conteudo_coletas(self, pool_id: str) -> Optional[ConteudoColetas]:
+        return _ler_texto(self._arquivo_coletas(pool_id)), _ler_texto(self._arquivo_journal(pool_id))
+
+    def arquivos_coletas(self, pool_id: str) -> List[str]:
+        return [self._arquivo_coletas(pool_id), self._arquivo_journal(pool_id)]
+
+    def linhas_journal(self, pool_id: str) -> int:
+        return self.tamanho_journal.get(pool_id, 0)
+
+    def concluir_carregamento(self, pool_id: str, dados: ColetaStore, linhas_journal: int) -> None:
+        # Os ids seguem a ordem das coletas, como na leitura sequencial
+        dados.ids = array('q', itertools.islice(self._ids, len(dados)))
+        self.tamanho_journal[pool_id] = linhas_journal
+
+    def salvar_coletas(self, pool_id: str, dados: ColetaStore) -> None:
+        """Grava o arquivo base da pool, compactando o journal."""
+        arquivo_journal = self._arquivo_journal(pool_id)
+
+        def linhas():
+            # Header atualizado com coluna Dias
+            yield ['Data', 'Coleta_USD', 'Taxa_Percentual', 'Total_Acumulado_USD', 'Dias']
+
+            for coleta, total_acumulado in zip(dados, dados.acumulado):
+                yield [
+                    coleta.data,
+                    coleta.coleta_usd,
+                    coleta.taxa_percentual,
+                    total_acumulado,
+                    coleta.dias
+                ]
+
+        escrever_csv_atomico(self._arquivo_coletas(pool_id), linhas())
+
+        # O arquivo base já contém todas as coletas do journal
+        if os.path.exists(arquivo_journal):
+            os.remove(arquivo_journal)
+        self.tamanho_journal[pool_id] = 0
+
+    def aplicar_alteracoes(self, pool_id: str, dados: ColetaStore,
+                           anexadas: Iterable[Coleta] = (),
+                           alteradas: Iterable[Coleta] = (),
+                           removidas: Iterable[int] = ()) -> None:
+        anexadas = list(anexadas)
+        alteradas = list(alteradas)
+        removidas = list(removidas)
+
+        # Apenas coletas novas vão para o journal; qualquer outra mudança
+        # (ou journal cheio) reescreve o arquivo base
+        if (alteradas or removidas
+                or not os.path.exists(self._arquivo_coletas(pool_id))
+                or self.tamanho_journal.get(pool_id, 0) + len(anexadas) > LIMITE_JOURNAL_COLETAS):
+            self.salvar_coletas(pool_id, dados)
+            return
+
+        if not anexadas:
+            return
+
+        with open(self._arquivo_journal(pool_id), 'a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            for coleta in anexadas:
+                writer.writerow([
+                    coleta.data,
+                    coleta.coleta_usd,
+                    coleta.taxa_percentual,
+                    coleta.dias
+                ])
+        self.tamanho_journal[pool_id] = self.tamanho_journal.get(pool_id, 0) + len(anexadas)
+
+    def limpar_coletas(self, pool_id: str) -> None:
+        for arquivo in (self._arquivo_coletas(pool_id), self._arquivo_journal(pool_id)):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+        self.tamanho_journal.pop(pool_id, None)
+
+
+class ArmazenamentoBinario(ArmazenamentoCSV):
+    """Coletas de cada pool em um arquivo binário de largura fixa (`core.formato_binario`).
+
+    Configuração e resumo das pools ficam nos mesmos CSVs do ArmazenamentoCSV.
+    As coletas são lidas com mmap, direto para as colunas, e novas coletas são
+    acrescentadas no próprio arquivo. Uma pool ainda sem arquivo binário é lida
+    do CSV e convertida na primeira gravação.
+    """
+
+    def _arquivo_binario(self, pool_id: str) -> str:
+        return get_data_file_path(f'pool_{pool_id}_coletas.bin')
+
+    def possui_binario(self, pool_id: str) -> bool:
+        """Indica se a pool já tem o arquivo binário de coletas."""
+        return os.path.exists(self._arquivo_binario(pool_id))
+
+    def carregar_dados(self, pool_id: str) -> Optional[ColetaStore]:
+        if not self.possui_binario(pool_id):
+            return None
+
+        ordinais, valores, taxas, dias = ler_colunas(self._arquivo_binario(pool_id))
+        dados = ColetaStore.de_colunas(ordinais, valores, taxas, dias,
+                                       array('q', itertools.islice(self._ids, len(ordinais))))
+        # Coletas retroativas acrescentadas ao final voltam para o lugar certo
+        if not all(map(operator.le, ordinais, itertools.islice(ordinais, 1, None))):
+            dados.ordenar()
+        return dados
+
+    def carregar_coletas(self, pool_id: str) -> List[RegistroColeta]:
+        dados = self.carregar_dados(pool_id)
+        if dados is None:
+            return super().carregar_coletas(pool_id)
+        return [(coleta.data, coleta.coleta_usd, coleta.taxa_percentual, coleta.dias, coleta.coleta_id)
+                for coleta in dados]
+
+    def ler_conteudo_coletas(self, pool_id: str) -> Optional[ConteudoColetas]:
+        # O carregamento paralelo usa carregar_dados
+        return None
+
+    def arquivos_coletas(self, pool_id: str) -> List[str]:
+        # Sem interpretação de texto, o cache de inicialização não traria ganho
+        return []
+
+    def salvar_coletas(self, pool_id: str, dados: ColetaStore) -> None:
+        escrever_colunas(self._arquivo_binario(pool_id),
+                         dados.ordinais, dados.valores, dados.taxas, dados.dias)
+
+    def aplicar_alteracoes(self, pool_id: str, dados: ColetaStore,
+                           anexadas: Iterable[Coleta] = (),
+                           alteradas: Iterable[Coleta] = (),
+                           removidas: Iterable[int] = ()) -> None:
+        anexadas = list(anexadas)
+
+        # Coletas novas são acrescentadas ao arquivo; qualquer outra mudança o reescreve
+        if list(alteradas) or list(removidas) or not self.possui_binario(pool_id):
+            self.salvar_coletas(pool_id, dados)
+        elif anexadas:
+            anexar_coletas(self._arquivo_binario(pool_id), anexadas)
+
+    def limpar_coletas(self, pool_id: str) -> None:
+        super().limpar_coletas(pool_id)
+        if self.possui_binario(pool_id):
+            os.remove(self._arquivo_binario(pool_id))
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """Armazenamento em banco SQLite (modo WAL) com índice por pool e data."""
+
+    def __init__(self, caminho: Optional[str] = None):
+        self.caminho = caminho or get_data_file_path('collect_fee_pools.db')
+
+        # A conexão é compartilhada com a thread de gravação em segundo plano
+        self.conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._em_transacao = False
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.execute('PRAGMA synchronous=NORMAL')
+        self._criar_tabelas()
+
+        ultimo_id = self.conexao.execute('SELECT COALESCE(MAX(id), 0) FROM coletas').fetchone()[0]
+        self._ids = itertools.count(ultimo_id + 1)
+
+    def _criar_tabelas(self) -> None:
+        with self._lock, self.conexao:
+            self.conexao.executescript("""
+                CREATE TABLE IF NOT EXISTS pools (
+                    pool_id TEXT PRIMARY KEY,
+                    nome TEXT NOT NULL,
+                    data_abertura TEXT NOT NULL,
+                    valor_inicial REAL NOT NULL,
+                    tipo_moeda TEXT NOT NULL,
+                    ordem INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS coletas (
+                    id INTEGER PRIMARY KEY,
+                    pool_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    data_ordinal INTEGER NOT NULL,
+                    coleta_usd REAL NOT NULL,
+                    taxa_percentual REAL NOT NULL,
+                    dias INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_coletas_pool_data
+                    ON coletas (pool_id, data_ordinal);
+                CREATE TABLE IF NOT EXISTS resumo_pools (
+                    pool_id TEXT PRIMARY KEY,
+                    total_coletas INTEGER NOT NULL,
+                    total_usd REAL NOT NULL,
+                    total_taxa REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    chave TEXT PRIMARY KEY,
+                    valor TEXT NOT NULL
+                );
+            """)
+
+    @contextmanager
+    def transacao(self):
+        # Reentrante: só a transação mais externa faz commit (ou rollback)
+        with self._lock:
+            if self._em_transacao:
+                yield
+                return
+            self._em_transacao = True
+            try:
+                with self.conexao:
+                    yield
+            finally:
+                self._em_transacao = False
+
+    def existe(self) -> bool:
+        # O arquivo é criado ao conectar; o banco só conta como existente depois de
+        # inicializado (migração concluída) ou, em bancos anteriores à marcação, se tiver pools
+        with self._lock:
+            marcado = self.conexao.execute(
+                "SELECT 1 FROM meta WHERE chave = 'inicializado'"
+            ).fetchone()
+            return bool(marcado or self.conexao.execute('SELECT 1 FROM pools LIMIT 1').fetchone())
+
+    def marcar_inicializado(self) -> None:
+        """Registra que o banco está pronto (migração dos CSV concluída ou desnecessária)."""
+        with self.transacao():
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO meta (chave, valor) VALUES ('inicializado', '1')"
+            )
+
+    def carregar_pools(self) -> List[PoolConfig]:
+        with self._lock:
+            cursor = self.conexao.execute(
+                'SELECT pool_id, nome, data_abertura, valor_inicial, tipo_moeda FROM pools ORDER BY ordem'
+            )
+            return [PoolConfig(*row) for row in cursor]
+
+    def salvar_pools(self, pools: List[PoolConfig], alteradas: Optional[Iterable[str]] = None) -> None:
+        selecionadas = pools if alteradas is None else [p for p in pools if p.pool_id in set(alteradas)]
+        with self.transacao():
+            for pool in selecionadas:
+                self.conexao.execute("""
+                    INSERT INTO pools (pool_id, nome, data_abertura, valor_inicial, tipo_moeda, ordem)
+                    VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(ordem), 0) + 1 FROM pools))
+                    ON CONFLICT(pool_id) DO UPDATE SET
+                        nome = excluded.nome,
+                        data_abertura = excluded.data_abertura,
+                        valor_inicial = excluded.valor_inicial,
+                        tipo_moeda = excluded.tipo_moeda
+                """, (pool.pool_id, pool.nome, pool.data_abertura, pool.valor_inicial, pool.tipo_moeda))
+
+            if alteradas is None:
+                ids = [pool.pool_id for pool in pools]
+                marcadores = ', '.join('?' * len(ids))
+                self.conexao.execute(f'DELETE FROM pools WHERE pool_id NOT IN ({marcadores})', ids)
+
+    def excluir_pool(self, pool_id: str) -> None:
+        with self.transacao():
+            self.conexao.execute('DELETE FROM coletas WHERE pool_id = ?', (pool_id,))
+            self.conexao.execute('DELETE FROM resumo_pools WHERE pool_id = ?', (pool_id,))
+            self.conexao.execute('DELETE FROM pools WHERE pool_id = ?', (pool_id,))
+
+    def novo_id_coleta(self) -> int:
+        return next(self._ids)
+
+    def carregar_resumo(self) -> List[ResumoPool]:
+        with self._lock:
+            cursor = self.conexao.execute(
+                'SELECT pool_id, total_coletas, total_usd, total_taxa FROM resumo_pools'
+            )
+            return [ResumoPool(*row) for row in cursor]
+
+    def salvar_resumo(self, resumos: List[ResumoPool]) -> None:
+        with self.transacao():
+            self.conexao.execute('DELETE FROM resumo_pools')
+            self.conexao.executemany(
+                'INSERT INTO resumo_pools VALUES (?, ?, ?, ?)',
+                [(r.pool_id, r.total_coletas, r.total_usd, r.total_taxa) for r in resumos]
+            )
+
+    def carregar_coletas(self, pool_id: str) -> List[RegistroColeta]:
+        with self._lock:
+            cursor = self.conexao.execute("""
+                SELECT data, coleta_usd, taxa_percentual, dias, id FROM coletas
+                WHERE pool_id = ? ORDER BY data_ordinal, id
+            """, (pool_id,))
+            return cursor.fetchall()
+
+    def _linha(self, pool_id: str, coleta: Coleta) -> tuple:
+        return (coleta.coleta_id, pool_id, coleta.data, coleta.data_ordinal,
+                coleta.coleta_usd, coleta.taxa_percentual, coleta.dias)
+
+    def salvar_coletas(self, pool_id: str, dados: ColetaStore) -> None:
+        with self.transacao():
+            self.conexao.execute('DELETE FROM coletas WHERE pool_id = ?', (pool_id,))
+            self.conexao.executemany(
+                'INSERT INTO coletas VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [self._linha(pool_id, coleta) for coleta in dados]
+            )
+
+    def aplicar_alteracoes(self, pool_id: str, dados: ColetaStore,
+                           anexadas: Iterable[Coleta] = (),
+                           alteradas: Iterable[Coleta] = (),
+                           removidas: Iterable[int] = ()) -> None:
+        with self.transacao():
+            self.conexao.executemany(
+                'DELETE FROM coletas WHERE id = ?',
+                [(coleta_id,) for coleta_id in removidas]
+            )
+            self.conexao.executemany(
+                'INSERT OR REPLACE INTO coletas VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [self._linha(pool_id, coleta) for coleta in itertools.chain(anexadas, alteradas)]
+            )
+
+    def limpar_coletas(self, pool_id: str) -> None:
+        with self.transacao():
+            self.conexao.execute('DELETE FROM coletas WHERE pool_id = ?', (pool_id,))
+
+    def fechar(self) -> None:
+        with self._lock:
+            self.conexao.close()
+
+
+def migrar_csv_para_sqlite(destino: ArmazenamentoSQLite) -> int:
+    """Copia pools e coletas do formato CSV para o SQLite. Retorna o nº de pools."""
+    # Import local: o monitor depende deste módulo
+    from core.monitor import MonitorLiquidez
+
+    origem = MonitorLiquidez(ArmazenamentoCSV())
+    pools = origem.get_lista_pools()
+
+    with destino.transacao():
+        destino.salvar_pools(pools)
+        for pool in pools:
+            dados = origem.get_dados_pool(pool.pool_id)
+            for indice in range(len(dados)):
+                dados.ids[indice] = destino.novo_id_coleta()
+            destino.salvar_coletas(pool.pool_id, dados)
+        destino.salvar_resumo(list(origem.resumo_pools.values()))
+        # Na mesma transação: uma migração que falha é tentada de novo na próxima execução
+        destino.marcar_inicializado()
+
+    return len(pools)
+
+
+def migrar_csv_para_binario(destino: ArmazenamentoBinario) -> int:
+    """Converte para o formato binário as coletas das pools que ainda estão só em CSV.
+
+    Retorna o nº de pools convertidas; os CSV originais são mantidos.
+    """
+    pendentes = [pool.pool_id for pool in destino.carregar_pools() if not destino.possui_binario(pool.pool_id)]
+    if not pendentes:
+        return 0
+
+    # Import local: o monitor depende deste módulo
+    from core.monitor import MonitorLiquidez
+
+    origem = MonitorLiquidez(ArmazenamentoCSV(), usar_cache=False)
+    for pool_id in pendentes:
+        destino.salvar_coletas(pool_id, origem.get_dados_pool(pool_id))
+    return len(pendentes)
+
+
+def criar_armazenamento(tipo: Optional[str] = None) -> Armazenamento:
+    """Cria o armazenamento escolhido ('csv', 'binario' ou 'sqlite').
+
+    Sem tipo explícito, usa a variável COLLECT_FEE_POOLS_ARMAZENAMENTO (padrão 'csv').
+    Ao abrir um SQLite novo com dados CSV existentes, os dados são migrados uma vez.
+    """
+    tipo = (tipo or os.environ.get(VARIAVEL_ARMAZENAMENTO, 'csv')).lower()
+
+    if tipo == 'csv':
+        return ArmazenamentoCSV()
+
+    if tipo == 'binario':
+        armazenamento = ArmazenamentoBinario()
+        try:
+            total = migrar_csv_para_binario(armazenamento)
+            if total:
+                print(f"{total} pool(s) convertida(s) para o formato binário!")
+        except Exception as e:
+            print(f"Erro ao converter dados para o formato binário: {e}")
+        return armazenamento
+
+    if tipo == 'sqlite':
+        armazenamento = ArmazenamentoSQLite()
+        if not armazenamento.existe():
+            if ArmazenamentoCSV().existe():
+                try:
+                    total = migrar_csv_para_sqlite(armazenamento)
+                    print(f"{total} pool(s) migrada(s) do CSV para o SQLite!")
+                except Exception as e:
+                    print(f"Erro ao migrar dados para o SQLite (nova tentativa na próxima execução): {e}")
+            else:
+                armazenamento.marcar_inicializado()
+        return armazenamento
+
+    raise ValueError(f"Armazenamento desconhecido: {tipo}")
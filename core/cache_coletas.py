@@ -0,0 +1,197 @@
+"""Cache das coletas já interpretadas, para acelerar a inicialização.
+
+Guarda, no diretório de dados do usuário, um arquivo por pool com as
+coletas já montadas (ordinais, valores, taxas, dias e somas acumuladas)
+precedidas de um cabeçalho com a impressão digital (mtime, tamanho e hash)
+dos arquivos de onde vieram. Uma pool só é lida e interpretada de novo se
+algum desses arquivos mudou.
+
+Nada é lido na inicialização: o cabeçalho de uma pool só é aberto quando
+ela é carregada, e as coletas só são desserializadas se ele confere. Ao
+gravar, apenas as pools cuja impressão mudou são regravadas.
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from models.coleta_store import ColetaStore
+from models.pool_config import PoolConfig
+from utils.paths import get_user_data_directory
+
+DIRETORIO_CACHE = 'cache_coletas'
+EXTENSAO_CACHE = '.pickle'
+
+# Arquivo único das versões anteriores (removido ao carregar)
+ARQUIVO_CACHE_ANTIGO = 'cache_coletas.pickle'
+
+# Alterar quando o formato das entradas (ou do ColetaStore) mudar
+VERSAO_CACHE = 2
+
+# (mtime em ns, tamanho em bytes, hash do conteúdo); None = arquivo inexistente
+Impressao = Optional[Tuple[int, int, str]]
+
+
+class CabecalhoCache(NamedTuple):
+    """Origem das coletas guardadas de uma pool (lido sem desserializar as coletas)."""
+
+    impressoes: Tuple[Impressao, ...]
+    # Configuração usada ao montar as coletas (taxa e dias de dados antigos)
+    configuracao: Tuple[str, float]
+    linhas_journal: int
+
+
+class EntradaCache(NamedTuple):
+    """Coletas de uma pool e a origem de onde foram lidas."""
+
+    impressoes: Tuple[Impressao, ...]
+    configuracao: Tuple[str, float]
+    dados: ColetaStore
+    linhas_journal: int
+
+
+def _hash_arquivo(caminho: str) -> str:
+    resumo = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as file:
+        for bloco in iter(lambda: file.read(1024 * 1024), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def impressao_arquivo(caminho: str, anterior: Impressao = None) -> Impressao:
+    """Impressão digital de um arquivo.
+
+    O hash só é recalculado quando mtime ou tamanho diferem de `anterior`.
+    """
+    try:
+        estado = os.stat(caminho)
+    except FileNotFoundError:
+        return None
+    if anterior is not None and anterior[:2] == (estado.st_mtime_ns, estado.st_size):
+        return anterior
+    return estado.st_mtime_ns, estado.st_size, _hash_arquivo(caminho)
+
+
+def arquivo_inalterado(caminho: str, impressao: Impressao) -> bool:
+    """Indica se o arquivo ainda corresponde à impressão guardada.
+
+    Mesmo mtime e tamanho bastam; com mtime diferente (arquivo regravado
+    ou copiado), o conteúdo é comparado pelo hash.
+    """
+    try:
+        estado = os.stat(caminho)
+    except FileNotFoundError:
+        return impressao is None
+    if impressao is None or estado.st_size != impressao[1]:
+        return False
+    return estado.st_mtime_ns == impressao[0] or _hash_arquivo(caminho) == impressao[2]
+
+
+def _configuracao(pool_config: PoolConfig) -> Tuple[str, float]:
+    return pool_config.data_abertura, pool_config.valor_inicial
+
+
+class CacheColetas:
+    """Coletas montadas de cada pool, persistidas entre as execuções (um arquivo por pool)."""
+
+    def __init__(self, caminho: Optional[str] = None):
+        self.caminho = caminho or os.path.join(get_user_data_directory(), DIRETORIO_CACHE)
+        # Cabeçalhos já lidos ou atualizados nesta execução (None = pool sem entrada)
+        self._cabecalhos: Dict[str, Optional[CabecalhoCache]] = {}
+        # Entradas atualizadas, ainda não gravadas
+        self._alteradas: Dict[str, EntradaCache] = {}
+
+    def carregar(self) -> None:
+        """Prepara o diretório do cache; as entradas são lidas sob demanda, em `obter`."""
+        os.makedirs(self.caminho, exist_ok=True)
+        antigo = os.path.join(os.path.dirname(self.caminho), ARQUIVO_CACHE_ANTIGO)
+        if os.path.exists(antigo):
+            os.remove(antigo)
+
+    def _arquivo(self, pool_id: str) -> str:
+        return os.path.join(self.caminho, f'{pool_id}{EXTENSAO_CACHE}')
+
+    def pools(self) -> List[str]:
+        """IDs das pools com entrada gravada."""
+        if not os.path.isdir(self.caminho):
+            return []
+        return [nome[:-len(EXTENSAO_CACHE)] for nome in os.listdir(self.caminho) if nome.endswith(EXTENSAO_CACHE)]
+
+    def _ler(self, pool_id: str, com_dados: bool):
+        """Cabeçalho (e, com `com_dados`, as coletas) da entrada gravada; None se ausente ou inválida."""
+        caminho = self._arquivo(pool_id)
+        if not os.path.exists(caminho):
+            return None
+        try:
+            with open(caminho, 'rb') as file:
+                versao, cabecalho = pickle.load(file)
+                if versao != VERSAO_CACHE:
+                    return None
+                cabecalho = CabecalhoCache(*cabecalho)
+                return (cabecalho, pickle.load(file)) if com_dados else cabecalho
+        except Exception as e:
+            print(f"Cache de coletas da pool {pool_id} ignorado: {e}")
+            return None
+
+    def _cabecalho(self, pool_id: str) -> Optional[CabecalhoCache]:
+        if pool_id not in self._cabecalhos:
+            self._cabecalhos[pool_id] = self._ler(pool_id, com_dados=False)
+        return self._cabecalhos[pool_id]
+
+    def obter(self, pool_config: PoolConfig, arquivos: List[str]) -> Optional[EntradaCache]:
+        """Entrada da pool, se os arquivos e a configuração não mudaram desde a gravação."""
+        pool_id = pool_config.pool_id
+        cabecalho = self._cabecalho(pool_id)
+        if (cabecalho is None
+                or cabecalho.configuracao != _configuracao(pool_config)
+                or len(cabecalho.impressoes) != len(arquivos)
+                or not all(map(arquivo_inalterado, arquivos, cabecalho.impressoes))):
+            return None
+
+        if pool_id in self._alteradas:
+            return self._alteradas[pool_id]
+        lido = self._ler(pool_id, com_dados=True)
+        if lido is None or lido[0] != cabecalho:
+            return None
+        return EntradaCache(cabecalho.impressoes, cabecalho.configuracao, lido[1], cabecalho.linhas_journal)
+
+    def atualizar(self, pool_config: PoolConfig, arquivos: List[str],
+                  dados: ColetaStore, linhas_journal: int) -> None:
+        """Registra as coletas de uma pool, idênticas ao conteúdo atual dos arquivos.
+
+        Se a impressão dos arquivos não mudou, a entrada gravada continua válida
+        e não é regravada.
+        """
+        pool_id = pool_config.pool_id
+        anterior = self._cabecalho(pool_id)
+        impressoes_anteriores = (anterior.impressoes if anterior and len(anterior.impressoes) == len(arquivos)
+                                 else (None,) * len(arquivos))
+        cabecalho = CabecalhoCache(tuple(map(impressao_arquivo, arquivos, impressoes_anteriores)),
+                                   _configuracao(pool_config), linhas_journal)
+        if cabecalho == anterior:
+            return
+        self._cabecalhos[pool_id] = cabecalho
+        self._alteradas[pool_id] = EntradaCache(cabecalho.impressoes, cabecalho.configuracao,
+                                                dados, linhas_journal)
+
+    def descartar(self, pool_id: str) -> None:
+        """Remove a entrada de uma pool."""
+        self._cabecalhos[pool_id] = None
+        self._alteradas.pop(pool_id, None)
+        caminho = self._arquivo(pool_id)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+    def salvar(self) -> None:
+        """Grava, cada uma de forma atômica, só as entradas atualizadas."""
+        os.makedirs(self.caminho, exist_ok=True)
+        for pool_id, entrada in list(self._alteradas.items()):
+            caminho = self._arquivo(pool_id)
+            temporario = f'{caminho}.tmp'
+            cabecalho = tuple(CabecalhoCache(entrada.impressoes, entrada.configuracao, entrada.linhas_journal))
+            with open(temporario, 'wb') as file:
+                pickle.dump((VERSAO_CACHE, cabecalho), file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(entrada.dados, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, caminho)
+            del self._alteradas[pool_id]
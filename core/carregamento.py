@@ -0,0 +1,157 @@
+"""Carregamento das coletas de várias pools em paralelo.
+
+A leitura dos arquivos roda em um pool de threads (I/O) e a interpretação
+(CSV, datas, taxas e dias) das pools grandes em um pool de processos, livre
+do GIL. Os resultados são entregues na ordem das pools pedidas, não na
+ordem em que terminam, para que o estado montado seja sempre o mesmo.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, List, NamedTuple, Optional
+
+from core.armazenamento import Armazenamento, RegistroColeta, interpretar_conteudo_coletas
+from models.coleta_store import ColetaStore
+from models.pool_config import PoolConfig
+from utils.datas import data_para_ordinal
+
+# Variável de ambiente com o nº de processos do carregamento paralelo
+# (inteiro ou 'auto' = nº de núcleos); ausente, 0 ou 1 mantém o carregamento sequencial
+VARIAVEL_PROCESSOS = 'COLLECT_FEE_POOLS_PROCESSOS_CARREGAMENTO'
+
+# Pools menores que isso (em caracteres) são interpretadas na própria thread de leitura:
+# enviar o conteúdo a outro processo custaria mais do que interpretá-lo
+LIMITE_PROCESSO = 256 * 1024
+
+# Threads de leitura simultâneas
+MAXIMO_THREADS = 16
+
+
+class CargaPool(NamedTuple):
+    """Coletas de uma pool montadas pelo carregamento paralelo."""
+
+    pool_id: str
+    dados: ColetaStore
+    linhas_journal: int
+    # Dados antigos (sem taxa ou dias) precisam ser regravados
+    reescrever: bool
+
+
+def processos_configurados() -> int:
+    """Nº de processos pedido em COLLECT_FEE_POOLS_PROCESSOS_CARREGAMENTO (0 = sequencial)."""
+    valor = os.environ.get(VARIAVEL_PROCESSOS, '').strip().lower()
+    if valor == 'auto':
+        return os.cpu_count() or 1
+    try:
+        return max(int(valor), 0) if valor else 0
+    except ValueError:
+        print(f"Valor inválido em {VARIAVEL_PROCESSOS}: {valor!r}")
+        return 0
+
+
+def montar_coletas(pool_id: str, pool_config: Optional[PoolConfig],
+                   registros: List[RegistroColeta]) -> ColetaStore:
+    """Monta o armazenamento colunar a partir dos registros, recalculando taxa e dias ausentes."""
+    coletas = ColetaStore()
+
+    for data, coleta_usd, taxa, dias, coleta_id in registros:
+        try:
+            data_ordinal = data_para_ordinal(data)
+        except ValueError as e:
+            print(f"Coleta ignorada na pool {pool_id}: {e}")
+            continue
+
+        # Calcular taxa se temos configuração da pool
+        if taxa is None:
+            taxa = (coleta_usd / pool_config.valor_inicial) * 100 if pool_config else 0.0
+
+        # Recalcular dias para dados antigos
+        if dias is None:
+            dias = 0
+            if pool_config:
+                if coletas:
+                    dias = data_ordinal - coletas.ordinais[-1]
+                elif pool_config.data_abertura_ordinal is not None:
+                    dias = data_ordinal - pool_config.data_abertura_ordinal
+                else:
+                    print(f"Data de abertura inválida na pool {pool_config.nome}: {pool_config.data_abertura}")
+
+        coletas.adicionar(data_ordinal, coleta_usd, taxa, dias, coleta_id)
+
+    # Coletas retroativas do journal entram no lugar certo
+    coletas.ordenar()
+
+    duplicadas = coletas.contar_duplicadas()
+    if duplicadas:
+        print(f"Pool {pool_id}: {duplicadas} coleta(s) com data e valor repetidos")
+    return coletas
+
+
+def registros_precisam_reescrita(registros: List[RegistroColeta]) -> bool:
+    """Indica se há registros antigos (sem taxa ou dias) a regravar já completos."""
+    return any(taxa is None or dias is None for _, _, taxa, dias, _ in registros)
+
+
+def _interpretar(pool_config: PoolConfig, conteudo) -> CargaPool:
+    """Interpreta o conteúdo bruto de uma pool (roda em thread ou em outro processo)."""
+    registros, linhas_journal = interpretar_conteudo_coletas(conteudo)
+    return CargaPool(pool_config.pool_id, montar_coletas(pool_config.pool_id, pool_config, registros),
+                     linhas_journal, registros_precisam_reescrita(registros))
+
+
+def carregar_em_paralelo(armazenamento: Armazenamento, pools: List[PoolConfig],
+                         processos: int) -> Iterator[CargaPool]:
+    """Lê e monta as coletas das pools em paralelo, entregando-as na ordem de `pools`.
+
+    Cada pool é lida em uma thread; as grandes são interpretadas em um dos
+    `processos`, as pequenas na própria thread. Erros de uma pool são
+    informados e ela é entregue vazia, como no carregamento sequencial.
+    """
+    if not pools:
+        return
+
+    lock = threading.Lock()
+    interpretadores: List[ProcessPoolExecutor] = []
+
+    def interpretar_em_processo(pool: PoolConfig, conteudo) -> CargaPool:
+        with lock:
+            if not interpretadores:
+                # 'spawn' em todas as plataformas: criar processos por fork
+                # com threads (gravação, Qt) em andamento não é seguro
+                interpretadores.append(ProcessPoolExecutor(
+                    max_workers=processos, mp_context=multiprocessing.get_context('spawn')
+                ))
+        return interpretadores[0].submit(_interpretar, pool, conteudo).result()
+
+    def carregar(pool: PoolConfig) -> CargaPool:
+        dados = armazenamento.carregar_dados(pool.pool_id)
+        if dados is not None:
+            return CargaPool(pool.pool_id, dados, 0, False)
+
+        conteudo = armazenamento.ler_conteudo_coletas(pool.pool_id)
+        if conteudo is None:
+            registros = armazenamento.carregar_coletas(pool.pool_id)
+            return CargaPool(pool.pool_id, montar_coletas(pool.pool_id, pool, registros),
+                             0, registros_precisam_reescrita(registros))
+        if processos > 1 and sum(map(len, conteudo)) >= LIMITE_PROCESSO:
+            return interpretar_em_processo(pool, conteudo)
+        return _interpretar(pool, conteudo)
+
+    leitores = ThreadPoolExecutor(max_workers=min(MAXIMO_THREADS, len(pools)))
+    try:
+        futuros = [leitores.submit(carregar, pool) for pool in pools]
+        for pool, futuro in zip(pools, futuros):
+            try:
+                carga = futuro.result()
+            except Exception as e:
+                print(f"Erro ao carregar dados da pool {pool.pool_id}: {e}")
+                carga = CargaPool(pool.pool_id, ColetaStore(), 0, False)
+            yield carga
+    finally:
+        # Interrompido antes do fim (cancelamento): descarta o que ainda não começou
+        leitores.shutdown(wait=False, cancel_futures=True)
+        with lock:
+            for executor in interpretadores:
+                executor.shutdown(cancel_futures=True)
@@ -0,0 +1,158 @@
+"""Exportação em fluxo das coletas de uma ou várias pools para CSV.
+
+As linhas são geradas sob demanda (`linhas_pool`, `linhas_combinadas`) e
+gravadas à medida que são produzidas, sem montar o arquivo na memória. Cada
+pool é copiada (colunas compactas) no momento em que é exportada, para que a
+interface possa continuar alterando as pools durante a gravação.
+
+Todos os arquivos são gravados em temporários e só substituem os destinos
+no final: uma exportação cancelada ou com erro não altera nenhum arquivo.
+"""
+
+import os
+import re
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from models.coleta_store import ColetaStore
+from models.pool_config import PoolConfig
+from utils.arquivos import gravar_csv_temporario
+from utils.datas import ordinal_para_data
+
+# A cada quantas linhas o progresso é informado e o cancelamento verificado
+INTERVALO_PROGRESSO = 5000
+
+CABECALHO_COLETAS = ['Data', 'Dias', 'Valor (USD)', 'Taxa (%)', 'Acumulado (USD)']
+CABECALHO_COMBINADO = ['Pool', 'Tipo de Moeda'] + CABECALHO_COLETAS
+
+# Caracteres não aceitos em nomes de arquivo (Windows é o mais restritivo)
+_CARACTERES_INVALIDOS = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+class ExportacaoCancelada(Exception):
+    """Exportação interrompida antes do fim; nenhum arquivo de destino é alterado."""
+
+
+class ResultadoExportacao:
+    """Arquivos gravados e nº de coletas exportadas."""
+
+    def __init__(self):
+        self.arquivos: List[str] = []
+        self.coletas = 0
+
+    def __str__(self) -> str:
+        return f"{self.coletas} coleta(s) exportada(s) em {len(self.arquivos)} arquivo(s)"
+
+
+def nome_arquivo_pool(pool_config: PoolConfig) -> str:
+    """Nome sugerido para o CSV de uma pool."""
+    nome = _CARACTERES_INVALIDOS.sub('_', pool_config.nome).strip('_.') or pool_config.pool_id[:8]
+    return f"coletas_{nome}.csv"
+
+
+def _linhas_coletas(dados: ColetaStore, prefixo: list = ()) -> Iterator[list]:
+    for ordinal, dias, valor, taxa, acumulado in zip(dados.ordinais, dados.dias, dados.valores,
+                                                      dados.taxas, dados.acumulado):
+        yield [*prefixo, ordinal_para_data(ordinal), dias, f"{valor:.2f}", f"{taxa:.4f}", f"{acumulado:.2f}"]
+
+
+def linhas_pool(pool_config: PoolConfig, dados: ColetaStore) -> Iterator[list]:
+    """Linhas do CSV de uma pool: bloco de configuração seguido das coletas."""
+    yield ['# Configuração da Pool']
+    yield ['Nome', pool_config.nome]
+    yield ['Tipo de Moeda', pool_config.tipo_moeda]
+    yield ['Data de Abertura', pool_config.data_abertura]
+    yield ['Valor Inicial', pool_config.valor_inicial]
+    yield []
+    yield CABECALHO_COLETAS
+    yield from _linhas_coletas(dados)
+
+
+def linhas_combinadas(pools: Iterable[PoolConfig], dados: Callable[[PoolConfig], ColetaStore]) -> Iterator[list]:
+    """Linhas de um CSV com as coletas de várias pools, identificadas nas primeiras colunas.
+
+    `dados(pool)` só é chamado quando a pool anterior já foi toda gravada.
+    """
+    yield CABECALHO_COMBINADO
+    for pool_config in pools:
+        yield from _linhas_coletas(dados(pool_config), [pool_config.nome, pool_config.tipo_moeda])
+
+
+def exportar_coletas(monitor, pool_ids: Iterable[str], destino: str, combinado: bool = False,
+                     progresso: Optional[Callable[[int, int], None]] = None,
+                     cancelado: Optional[Callable[[], bool]] = None) -> ResultadoExportacao:
+    """Exporta as coletas das pools indicadas para CSV.
+
+    Com `combinado`, `destino` é o arquivo que recebe todas as pools;
+    senão, é o diretório (já existente, ou ValueError) onde cada pool ganha seu
+    próprio arquivo (`nome_arquivo_pool`) ou, para uma única pool, o próprio
+    arquivo `.csv`. `progresso(gravadas, total)` recebe o nº de
+    linhas já gravadas e o de coletas esperadas, e `cancelado()` é consultado periodicamente;
+    se retornar True, `ExportacaoCancelada` é levantada e nenhum destino muda.
+    """
+    pools = [monitor.pools[pool_id] for pool_id in pool_ids if pool_id in monitor.pools]
+    if not pools:
+        raise ValueError("Nenhuma pool para exportar")
+
+    # Total estimado pelo resumo, sem carregar as coletas de antemão
+    total = sum(monitor.resumo_pools[pool.pool_id].total_coletas
+                for pool in pools if pool.pool_id in monitor.resumo_pools)
+    resultado = ResultadoExportacao()
+
+    def copiar(pool_config: PoolConfig) -> ColetaStore:
+        dados = monitor.copiar_dados_pool(pool_config.pool_id)
+        resultado.coletas += len(dados)
+        return dados
+
+    gravadas = 0
+
+    def acompanhar(linhas: Iterable[list]) -> Iterator[list]:
+        # Conta as linhas gravadas (cabeçalhos incluídos, o que basta para o progresso)
+        nonlocal gravadas
+        for gravadas, linha in enumerate(linhas, gravadas + 1):
+            if gravadas % INTERVALO_PROGRESSO == 0:
+                if cancelado and cancelado():
+                    raise ExportacaoCancelada("Exportação cancelada")
+                if progresso:
+                    progresso(min(gravadas, total), total)
+            yield linha
+
+    if combinado:
+        arquivos = [(destino, lambda: linhas_combinadas(pools, copiar))]
+    elif len(pools) == 1 and destino.lower().endswith('.csv'):
+        arquivos = [(destino, lambda: linhas_pool(pools[0], copiar(pools[0])))]
+    else:
+        if not os.path.isdir(destino):
+            raise ValueError(f"Destino não é um diretório existente: {destino}. Para gravar em um único "
+                             f"arquivo, use a exportação combinada (ou um destino .csv, com uma só pool)")
+        nomes = set()
+        arquivos = []
+        for pool_config in pools:
+            nome = nome_arquivo_pool(pool_config)
+            if nome in nomes:
+                # Pools com o mesmo nome não sobrescrevem uma à outra
+                nome = f"{nome[:-4]}_{pool_config.pool_id[:8]}.csv"
+            nomes.add(nome)
+            arquivos.append((os.path.join(destino, nome),
+                             lambda pool_config=pool_config: linhas_pool(pool_config, copiar(pool_config))))
+
+    temporarios = []
+    try:
+        for caminho, linhas in arquivos:
+            temporarios.append(f'{caminho}.tmp')
+            gravar_csv_temporario(caminho, acompanhar(linhas()))
+
+        if cancelado and cancelado():
+            raise ExportacaoCancelada("Exportação cancelada")
+
+        # Só substitui os destinos depois que todos foram gravados por completo
+        for (caminho, _), temporario in zip(arquivos, temporarios):
+            os.replace(temporario, caminho)
+            resultado.arquivos.append(caminho)
+    finally:
+        for temporario in temporarios:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+    if progresso:
+        progresso(resultado.coletas, resultado.coletas)
+    return resultado
@@ -0,0 +1,303 @@
+"""Exportação e importação de todas as pools em um único arquivo colunar.
+
+Com o pyarrow instalado, o arquivo é Parquet, com colunas tipadas:
+
+    pool_id (dictionary<string>) | pool_nome (dictionary<string>) | data (date32)
+    coleta_usd (double) | taxa_percentual (double) | dias (int32) | total_acumulado (double)
+
+e a configuração de cada pool (nome, abertura, valor inicial, moeda) em
+JSON nos metadados do schema, na chave `collect_fee_pools`.
+
+Sem o pyarrow, usa-se o formato colunar próprio `.cfpz`: um ZIP (sem
+compressão) com `metadados.json` (pools, nº de linhas e tipo de cada
+coluna) e uma entrada `colunas/<nome>.bin` por coluna, com os valores
+little-endian contíguos (legível com `numpy.frombuffer` ou `array.array`).
+Nele a coluna `pool` é o índice da pool na lista de `metadados.json` e
+`data` é o ordinal do calendário.
+
+A importação cria as pools ausentes (com o mesmo id) e acrescenta as
+coletas, ignorando as já registradas: reimportar um arquivo não duplica dados.
+"""
+
+import itertools
+import json
+import os
+import sys
+import zipfile
+from array import array
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from models.pool_config import PoolConfig
+from utils.datas import ordinal_para_data
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+VERSAO_EXPORTACAO = 1
+
+FORMATO_PARQUET = 'parquet'
+FORMATO_COLUNAR = 'colunar'
+EXTENSOES = {FORMATO_PARQUET: '.parquet', FORMATO_COLUNAR: '.cfpz'}
+
+CHAVE_METADADOS = b'collect_fee_pools'
+
+# Colunas numéricas comuns aos dois formatos e seus tipos (array.array)
+COLUNAS = (
+    ('pool', 'i'),
+    ('data', 'i'),
+    ('coleta_usd', 'd'),
+    ('taxa_percentual', 'd'),
+    ('dias', 'i'),
+    ('total_acumulado', 'd'),
+)
+
+# Ordinal de 01/01/1970 (date32 do Arrow conta dias a partir dessa data)
+_EPOCA = date(1970, 1, 1).toordinal()
+
+Colunas = Dict[str, array]
+
+
+class ResultadoImportacaoPools:
+    """Contagem de uma importação de pools."""
+
+    def __init__(self):
+        self.pools_criadas = 0
+        self.importadas = 0
+        self.duplicadas = 0
+
+    def __str__(self) -> str:
+        return (f"{self.pools_criadas} pool(s) criada(s), {self.importadas} coleta(s) importada(s) "
+                f"e {self.duplicadas} já existente(s) ignorada(s)")
+
+
+def formato_padrao() -> str:
+    """Parquet quando o pyarrow está instalado; senão, o formato colunar próprio."""
+    return FORMATO_PARQUET if pa is not None else FORMATO_COLUNAR
+
+
+def _formato_do_arquivo(caminho: str, formato: Optional[str], leitura: bool) -> str:
+    if formato is None:
+        if leitura and os.path.exists(caminho):
+            with open(caminho, 'rb') as file:
+                assinatura = file.read(4)
+            formato = FORMATO_PARQUET if assinatura == b'PAR1' else FORMATO_COLUNAR
+        else:
+            extensao = os.path.splitext(caminho)[1].lower()
+            formatos = {ext: nome for nome, ext in EXTENSOES.items()}
+            formato = formatos.get(extensao, formato_padrao())
+
+    if formato not in EXTENSOES:
+        raise ValueError(f"Formato desconhecido: {formato}")
+    if formato == FORMATO_PARQUET and pa is None:
+        raise ValueError(f"Parquet requer o pyarrow (pip install pyarrow); "
+                         f"use o formato '{FORMATO_COLUNAR}' ({EXTENSOES[FORMATO_COLUNAR]})")
+    return formato
+
+
+# --- Exportação -------------------------------------------------------------
+
+def montar_colunas(monitor) -> Tuple[List[PoolConfig], Colunas]:
+    """Reúne as coletas de todas as pools do monitor em colunas contíguas."""
+    monitor.carregar_dados_pools()
+    with monitor._lock:
+        pools = [PoolConfig.from_dict(pool.to_dict()) for pool in monitor.get_lista_pools()]
+        colunas = {nome: array(tipo) for nome, tipo in COLUNAS}
+        for indice, pool in enumerate(pools):
+            dados = monitor.get_dados_pool(pool.pool_id)
+            colunas['pool'].extend(itertools.repeat(indice, len(dados)))
+            colunas['data'].extend(dados.ordinais)
+            colunas['coleta_usd'].extend(dados.valores)
+            colunas['taxa_percentual'].extend(dados.taxas)
+            colunas['dias'].extend(dados.dias)
+            colunas['total_acumulado'].extend(dados.acumulado)
+    return pools, colunas
+
+
+def _metadados(pools: List[PoolConfig]) -> dict:
+    return {'versao': VERSAO_EXPORTACAO, 'pools': [pool.to_dict() for pool in pools]}
+
+
+def _arrow(coluna: array, tipo) -> 'pa.Array':
+    """Array do Arrow sobre o mesmo buffer do array.array (sem cópia)."""
+    return pa.Array.from_buffers(tipo, len(coluna), [None, pa.py_buffer(coluna)])
+
+
+def _escrever_parquet(caminho: str, pools: List[PoolConfig], colunas: Colunas) -> None:
+    indices = _arrow(colunas['pool'], pa.int32())
+    datas = array('i', (ordinal - _EPOCA for ordinal in colunas['data']))
+    tabela = pa.table({
+        'pool_id': pa.DictionaryArray.from_arrays(indices, pa.array([p.pool_id for p in pools], pa.string())),
+        'pool_nome': pa.DictionaryArray.from_arrays(indices, pa.array([p.nome for p in pools], pa.string())),
+        'data': _arrow(datas, pa.date32()),
+        'coleta_usd': _arrow(colunas['coleta_usd'], pa.float64()),
+        'taxa_percentual': _arrow(colunas['taxa_percentual'], pa.float64()),
+        'dias': _arrow(colunas['dias'], pa.int32()),
+        'total_acumulado': _arrow(colunas['total_acumulado'], pa.float64()),
+    })
+    metadados = json.dumps(_metadados(pools), ensure_ascii=False).encode('utf-8')
+    tabela = tabela.replace_schema_metadata({CHAVE_METADADOS: metadados})
+    pq.write_table(tabela, caminho)
+
+
+def _escrever_colunar(caminho: str, pools: List[PoolConfig], colunas: Colunas) -> None:
+    metadados = _metadados(pools)
+    metadados['linhas'] = len(colunas['pool'])
+    metadados['colunas'] = {nome: tipo for nome, tipo in COLUNAS}
+
+    with zipfile.ZipFile(caminho, 'w', zipfile.ZIP_STORED) as arquivo:
+        arquivo.writestr('metadados.json', json.dumps(metadados, ensure_ascii=False, indent=1))
+        for nome, _ in COLUNAS:
+            coluna = colunas[nome]
+            if sys.byteorder == 'big':
+                coluna = coluna[:]
+                coluna.byteswap()
+            arquivo.writestr(f'colunas/{nome}.bin', coluna.tobytes())
+
+
+def exportar_pools(monitor, caminho: str, formato: Optional[str] = None) -> int:
+    """Exporta todas as pools e suas coletas para um único arquivo. Retorna o nº de coletas.
+
+    Sem `formato`, ele vem da extensão (.parquet ou .cfpz) ou de `formato_padrao()`.
+    O arquivo é gravado em um temporário e substituído de forma atômica.
+    """
+    formato = _formato_do_arquivo(caminho, formato, leitura=False)
+    pools, colunas = montar_colunas(monitor)
+
+    temporario = f'{caminho}.tmp'
+    try:
+        if formato == FORMATO_PARQUET:
+            _escrever_parquet(temporario, pools, colunas)
+        else:
+            _escrever_colunar(temporario, pools, colunas)
+        os.replace(temporario, caminho)
+    except Exception as e:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise Exception(f"Erro ao exportar pools: {e}")
+    return len(colunas['pool'])
+
+
+# --- Importação -------------------------------------------------------------
+
+def _validar_metadados(metadados: dict) -> List[PoolConfig]:
+    if metadados.get('versao') != VERSAO_EXPORTACAO:
+        raise ValueError(f"Versão de exportação não suportada: {metadados.get('versao')}")
+    try:
+        return [PoolConfig.from_dict(pool) for pool in metadados['pools']]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Metadados das pools inválidos: {e}")
+
+
+def _array_de_arrow(coluna, tipo, typecode: str) -> array:
+    """Copia uma coluna do Arrow (sem nulos) para um array.array do tipo indicado."""
+    if isinstance(coluna, pa.ChunkedArray):
+        coluna = coluna.combine_chunks()
+    if coluna.null_count:
+        raise ValueError("Coluna com valores vazios")
+    coluna = coluna.cast(tipo)
+    valores = array(typecode)
+    tamanho = valores.itemsize
+    with memoryview(coluna.buffers()[1]) as buffer:
+        valores.frombytes(buffer[coluna.offset * tamanho:(coluna.offset + len(coluna)) * tamanho])
+    return valores
+
+
+def _ler_parquet(caminho: str) -> Tuple[List[PoolConfig], Colunas]:
+    tabela = pq.read_table(caminho)
+    metadados = (tabela.schema.metadata or {}).get(CHAVE_METADADOS)
+    if metadados is None:
+        raise ValueError("Arquivo Parquet sem os metadados das pools")
+    pools = _validar_metadados(json.loads(metadados))
+
+    # A pool é identificada pelo id (não pela posição), caso o arquivo tenha sido reescrito
+    pool_ids = tabela.column('pool_id').combine_chunks()
+    if not pa.types.is_dictionary(pool_ids.type):
+        pool_ids = pool_ids.dictionary_encode()
+    posicoes = {pool.pool_id: indice for indice, pool in enumerate(pools)}
+    try:
+        traducao = [posicoes[pool_id] for pool_id in pool_ids.dictionary.to_pylist()]
+    except KeyError as e:
+        raise ValueError(f"Pool sem configuração nos metadados: {e}")
+
+    colunas = {
+        'pool': array('i', map(traducao.__getitem__, _array_de_arrow(pool_ids.indices, pa.int32(), 'i'))),
+        'data': array('i', (dias + _EPOCA for dias in _array_de_arrow(
+            tabela.column('data').cast(pa.date32()).cast(pa.int32()), pa.int32(), 'i'))),
+    }
+    for nome, tipo in COLUNAS[2:]:
+        colunas[nome] = _array_de_arrow(tabela.column(nome), pa.float64() if tipo == 'd' else pa.int32(), tipo)
+    return pools, colunas
+
+
+def _ler_colunar(caminho: str) -> Tuple[List[PoolConfig], Colunas]:
+    try:
+        with zipfile.ZipFile(caminho) as arquivo:
+            metadados = json.loads(arquivo.read('metadados.json'))
+            pools = _validar_metadados(metadados)
+            colunas = {}
+            for nome, tipo in COLUNAS:
+                coluna = array(metadados['colunas'][nome])
+                coluna.frombytes(arquivo.read(f'colunas/{nome}.bin'))
+                if sys.byteorder == 'big':
+                    coluna.byteswap()
+                if len(coluna) != metadados['linhas']:
+                    raise ValueError(f"Coluna {nome} incompleta")
+                colunas[nome] = coluna if coluna.typecode == tipo else array(tipo, coluna)
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise ValueError(f"Arquivo colunar inválido: {e}")
+    return pools, colunas
+
+
+def ler_pools(caminho: str, formato: Optional[str] = None) -> Tuple[List[PoolConfig], Colunas]:
+    """Lê um arquivo exportado: as pools e as colunas de suas coletas."""
+    if not os.path.isfile(caminho):
+        raise ValueError(f"Arquivo não encontrado: {caminho}")
+    formato = _formato_do_arquivo(caminho, formato, leitura=True)
+    if formato == FORMATO_PARQUET:
+        return _ler_parquet(caminho)
+    return _ler_colunar(caminho)
+
+
+def importar_pools(monitor, caminho: str, formato: Optional[str] = None) -> ResultadoImportacaoPools:
+    """Importa um arquivo exportado por `exportar_pools`.
+
+    Pools ausentes são criadas com o mesmo id e configuração; nas existentes
+    (mesmo id), só as coletas novas são acrescentadas. Tudo é aplicado em
+    uma única transação: um erro no meio não deixa a importação pela metade.
+    """
+    pools, colunas = ler_pools(caminho, formato)
+    resultado = ResultadoImportacaoPools()
+
+    existentes = [pool.pool_id for pool in pools if pool.pool_id in monitor.pools]
+    monitor.carregar_dados_pools(existentes)
+
+    with monitor.transacao(pools=existentes):
+        # Pools criadas aqui recebem as coletas como estão, inclusive repetições legítimas
+        criadas = set()
+        for pool in pools:
+            if pool.pool_id not in monitor.pools:
+                monitor.criar_nova_pool(pool.nome, pool.data_abertura, pool.valor_inicial,
+                                        pool.tipo_moeda, pool_id=pool.pool_id)
+                criadas.add(pool.pool_id)
+                resultado.pools_criadas += 1
+
+        # As coletas de cada pool são contíguas no arquivo exportado; trechos
+        # intercalados (arquivo reescrito por outra ferramenta) viram lotes separados
+        inicio = 0
+        for indice, trecho in itertools.groupby(colunas['pool']):
+            quantidade = sum(1 for _ in trecho)
+            fim = inicio + quantidade
+            importadas = monitor.registrar_coletas_em_lote(
+                pools[indice].pool_id,
+                zip(map(ordinal_para_data, colunas['data'][inicio:fim]), colunas['coleta_usd'][inicio:fim]),
+                ignorar_duplicadas=pools[indice].pool_id not in criadas
+            )
+            resultado.importadas += importadas
+            resultado.duplicadas += quantidade - importadas
+            inicio = fim
+
+    return resultado
@@ -0,0 +1,134 @@
+"""Formato binário de largura fixa para as coletas de uma pool.
+
+O arquivo tem um cabeçalho de 16 bytes (assinatura, versão e tamanho do
+registro) seguido de registros little-endian empacotados:
+
+    int32 data (ordinal) | float64 coleta_usd | float64 taxa | int32 dias
+
+A quantidade de coletas vem do tamanho do arquivo, então novas coletas
+são simplesmente acrescentadas ao final; um registro incompleto (gravação
+interrompida) é ignorado na leitura e descartado no próximo acréscimo.
+
+Na leitura o arquivo é mapeado com `mmap` e cada coluna é copiada uma única
+vez, direto de uma fatia de passo fixo do `memoryview` para o seu array, sem
+interpretar linha a linha nem cópias intermediárias do arquivo.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Tuple
+
+from models.coleta import Coleta
+
+ASSINATURA = b'CFPB'
+VERSAO_FORMATO = 1
+
+CABECALHO = struct.Struct('<4sHH8x')
+REGISTRO = struct.Struct('<iddi')
+
+# Posições das colunas no registro, em unidades do tipo de cada uma:
+# inteiros de 4 bytes a partir do início dos registros (data e dias) e
+# doubles a partir do 4º byte (valor e taxa), ambos com passo de 24 bytes
+_PASSO_INTEIROS = REGISTRO.size // 4
+_PASSO_DOUBLES = REGISTRO.size // 8
+_DESLOCAMENTO_DOUBLES = 4
+
+ColunasBinarias = Tuple[array, array, array, array]
+
+
+def _validar_cabecalho(caminho: str, cabecalho: bytes) -> None:
+    if len(cabecalho) < CABECALHO.size:
+        raise ValueError(f"Arquivo de coletas inválido: {caminho}")
+    assinatura, versao, tamanho = CABECALHO.unpack(cabecalho)
+    if assinatura != ASSINATURA or versao != VERSAO_FORMATO or tamanho != REGISTRO.size:
+        raise ValueError(f"Arquivo de coletas inválido: {caminho}")
+
+
+def ler_colunas(caminho: str) -> ColunasBinarias:
+    """Lê (ordinais, valores, taxas, dias) de um arquivo binário de coletas."""
+    with open(caminho, 'rb') as file:
+        _validar_cabecalho(caminho, file.read(CABECALHO.size))
+        tamanho = os.fstat(file.fileno()).st_size
+        quantidade = (tamanho - CABECALHO.size) // REGISTRO.size
+        if quantidade == 0:
+            return array('i'), array('d'), array('d'), array('i')
+
+        inicio = CABECALHO.size
+        fim = inicio + quantidade * REGISTRO.size
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapa, memoryview(mapa) as conteudo:
+            with conteudo[inicio:fim].cast('i') as inteiros, \
+                    conteudo[inicio + _DESLOCAMENTO_DOUBLES:fim - _DESLOCAMENTO_DOUBLES].cast('d') as doubles:
+                return (_coluna('i', inteiros[0::_PASSO_INTEIROS]),
+                        _coluna('d', doubles[0::_PASSO_DOUBLES]),
+                        _coluna('d', doubles[1::_PASSO_DOUBLES]),
+                        _coluna('i', inteiros[_PASSO_INTEIROS - 1::_PASSO_INTEIROS]))
+
+
+def _coluna(tipo: str, visao: memoryview) -> array:
+    """Copia uma coluna (vista de passo fixo sobre o arquivo mapeado) para um array."""
+    coluna = array(tipo, [0]) * len(visao)
+    with visao, memoryview(coluna) as destino:
+        destino[:] = visao
+    if sys.byteorder == 'big':
+        coluna.byteswap()
+    return coluna
+
+
+def _empacotar(ordinais: array, valores: array, taxas: array, dias: array) -> bytearray:
+    """Intercala as colunas nos registros do arquivo."""
+    quantidade = len(ordinais)
+    registros = bytearray(quantidade * REGISTRO.size)
+    if not quantidade:
+        return registros
+
+    with memoryview(registros) as conteudo:
+        inteiros = conteudo.cast('i')
+        inteiros[0::_PASSO_INTEIROS] = memoryview(array('i', ordinais))
+        inteiros[_PASSO_INTEIROS - 1::_PASSO_INTEIROS] = memoryview(array('i', dias))
+        doubles = conteudo[_DESLOCAMENTO_DOUBLES:len(registros) - _DESLOCAMENTO_DOUBLES].cast('d')
+        doubles[0::_PASSO_DOUBLES] = memoryview(array('d', valores))
+        doubles[1::_PASSO_DOUBLES] = memoryview(array('d', taxas))
+        doubles.release()
+        inteiros.release()
+
+    if sys.byteorder == 'big':
+        # Troca a ordem dos bytes de cada campo do registro
+        return bytearray(b''.join(
+            REGISTRO.pack(*struct.unpack_from('=iddi', registros, posicao))
+            for posicao in range(0, len(registros), REGISTRO.size)
+        ))
+    return registros
+
+
+def escrever_colunas(caminho: str, ordinais: array, valores: array, taxas: array, dias: array) -> None:
+    """Grava todas as coletas em um arquivo temporário e o substitui de forma atômica."""
+    temporario = f'{caminho}.tmp'
+    with open(temporario, 'wb') as file:
+        file.write(CABECALHO.pack(ASSINATURA, VERSAO_FORMATO, REGISTRO.size))
+        file.write(_empacotar(ordinais, valores, taxas, dias))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporario, caminho)
+
+
+def anexar_coletas(caminho: str, coletas: Iterable[Coleta]) -> None:
+    """Acrescenta coletas ao final do arquivo, sem reescrevê-lo."""
+    with open(caminho, 'r+b') as file:
+        _validar_cabecalho(caminho, file.read(CABECALHO.size))
+        tamanho = file.seek(0, os.SEEK_END)
+
+        # Descarta um registro incompleto deixado por uma gravação interrompida
+        excedente = (tamanho - CABECALHO.size) % REGISTRO.size
+        if excedente:
+            file.truncate(tamanho - excedente)
+            file.seek(tamanho - excedente)
+
+        file.write(b''.join(
+            REGISTRO.pack(coleta.data_ordinal, coleta.coleta_usd, coleta.taxa_percentual, coleta.dias)
+            for coleta in coletas
+        ))
+        file.flush()
+        os.fsync(file.fileno())
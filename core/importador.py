@@ -0,0 +1,407 @@
+"""Importação em fluxo de históricos de coletas (exportações CSV/JSON de exchanges e DEXs).
+
+As linhas passam por um pipeline de geradores (leitura → conversão →
+remoção de duplicadas), de modo que o arquivo nunca é carregado inteiro na
+memória: só as coletas válidas e novas são guardadas, em colunas compactas,
+e registradas na pool de uma vez ao final (`registrar_coletas_em_lote`).
+"""
+
+import csv
+import io
+import itertools
+import json
+import os
+from array import array
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Set, Tuple, Union
+
+from models.coleta_store import ColetaStore
+from utils.datas import FORMATO_DATA, ordinal_para_data
+
+# Nomes de coluna reconhecidos quando o mapeamento não é informado
+COLUNAS_DATA = ('data', 'date', 'datetime', 'time', 'timestamp', 'dia', 'day')
+COLUNAS_VALOR = ('valor', 'value', 'usd', 'valor_usd', 'amount_usd', 'fees_usd', 'amount', 'fee', 'fees')
+
+# Formatos de data tentados em ordem: 'iso' aceita datas ISO 8601 (com ou sem hora
+# e fuso) e 'unix' timestamps em segundos ou milissegundos
+FORMATOS_DATA = (FORMATO_DATA, 'iso', 'unix')
+
+# Bloco lido por vez dos arquivos JSON
+TAMANHO_BLOCO_JSON = 64 * 1024
+
+# A cada quantas linhas o progresso é informado e o cancelamento verificado
+INTERVALO_PROGRESSO = 5000
+
+# Linha lida do arquivo: (número da linha/objeto, data bruta, valor bruto)
+LinhaBruta = Tuple[int, Any, Any]
+
+
+class ImportacaoCancelada(Exception):
+    """Importação interrompida antes do fim; nenhuma coleta é registrada."""
+
+
+class ConfiguracaoImportacao:
+    """Mapeamento de colunas e regras de validação de uma importação.
+
+    `coluna_data` e `coluna_valor` aceitam o nome da coluna/chave (chaves
+    aninhadas do JSON com ponto, ex.: 'fees.usd') ou a posição no CSV;
+    sem eles, as colunas são reconhecidas pelo cabeçalho.
+    """
+
+    def __init__(self, formato: str = 'auto',
+                 coluna_data: Union[str, int, None] = None,
+                 coluna_valor: Union[str, int, None] = None,
+                 formatos_data: Sequence[str] = FORMATOS_DATA,
+                 delimitador: Optional[str] = None,
+                 ignorar_duplicadas: bool = True,
+                 ignorar_invalidas: bool = False,
+                 encoding: str = 'utf-8-sig'):
+        self.formato = formato
+        self.coluna_data = coluna_data
+        self.coluna_valor = coluna_valor
+        self.formatos_data = tuple(formatos_data)
+        self.delimitador = delimitador
+        self.ignorar_duplicadas = ignorar_duplicadas
+        self.ignorar_invalidas = ignorar_invalidas
+        self.encoding = encoding
+
+
+class ResultadoImportacao:
+    """Contagem das linhas processadas por uma importação."""
+
+    def __init__(self):
+        self.lidas = 0
+        self.importadas = 0
+        self.duplicadas = 0
+        self.invalidas = 0
+
+    def __str__(self) -> str:
+        return (f"{self.importadas} coleta(s) importada(s), {self.duplicadas} duplicada(s) "
+                f"e {self.invalidas} inválida(s) ignorada(s) de {self.lidas} linha(s)")
+
+
+# --- Conversão de valores ---------------------------------------------------
+
+def converter_data(texto: Any, formatos: Tuple[str, ...] = FORMATOS_DATA) -> int:
+    """Converte a data de uma linha no ordinal do calendário (ValueError se nenhum formato servir)."""
+    if isinstance(texto, (int, float)) and not isinstance(texto, bool):
+        if 'unix' in formatos:
+            try:
+                return _timestamp_para_ordinal(texto)
+            except (ValueError, OverflowError, OSError):
+                raise ValueError(f"Data inválida: {texto!r}")
+        texto = str(texto)
+    elif not isinstance(texto, str):
+        # Objetos, listas e booleanos do JSON (que nem poderiam ir ao cache)
+        raise ValueError(f"Data inválida: {texto!r}")
+    return _converter_texto_data(texto, formatos)
+
+
+@lru_cache(maxsize=4096)
+def _converter_texto_data(texto: str, formatos: Tuple[str, ...]) -> int:
+    texto = texto.strip()
+    for formato in formatos:
+        try:
+            if formato == 'iso':
+                return datetime.fromisoformat(texto.replace(' UTC', '')).date().toordinal()
+            if formato == 'unix':
+                return _timestamp_para_ordinal(float(texto))
+            return datetime.strptime(texto, formato).date().toordinal()
+        except (ValueError, OverflowError, OSError):
+            continue
+    raise ValueError(f"Data inválida: {texto!r}")
+
+
+def _timestamp_para_ordinal(timestamp: float) -> int:
+    """Data (UTC) de um timestamp unix em segundos ou milissegundos."""
+    if timestamp > 1e11:
+        timestamp /= 1000
+    return datetime.fromtimestamp(timestamp, timezone.utc).date().toordinal()
+
+
+def converter_valor(texto: Any) -> float:
+    """Converte um valor em USD aceitando '$', separador de milhar e vírgula decimal."""
+    try:
+        # Caso comum: número simples ("12.5" ou já numérico)
+        valor = float(texto)
+    except (TypeError, ValueError):
+        limpo = str(texto).replace('$', '').replace('USD', '').replace(' ', '').strip()
+        # O último separador é o decimal: "1.234,56" e "1,234.56"
+        if ',' in limpo and limpo.rfind(',') > limpo.rfind('.'):
+            limpo = limpo.replace('.', '').replace(',', '.')
+        else:
+            limpo = limpo.replace(',', '')
+        try:
+            valor = float(limpo)
+        except ValueError:
+            raise ValueError(f"Valor inválido: {texto!r}")
+
+    if not valor > 0 or valor == float('inf'):
+        raise ValueError(f"Valor deve ser maior que zero: {texto!r}")
+    return valor
+
+
+# --- Leitura em fluxo -------------------------------------------------------
+
+def _escolher_coluna(nomes: Sequence[str], coluna: Union[str, int, None], reconhecidas: Sequence[str]) -> Optional[int]:
+    """Posição da coluna configurada (ou reconhecida pelo nome) no cabeçalho."""
+    normalizados = [nome.strip().lower() for nome in nomes]
+    if isinstance(coluna, int):
+        return coluna
+    if coluna is not None:
+        return normalizados.index(coluna.strip().lower()) if coluna.strip().lower() in normalizados else None
+    for candidato in reconhecidas:
+        if candidato in normalizados:
+            return normalizados.index(candidato)
+    return None
+
+
+def ler_csv(arquivo, config: ConfiguracaoImportacao) -> Iterator[LinhaBruta]:
+    """Lê as linhas de um CSV, uma por vez, como (número, data, valor)."""
+    primeira = arquivo.readline()
+    if not primeira:
+        return
+    delimitador = config.delimitador or max(';,\t', key=primeira.count)
+    leitor = csv.reader(itertools.chain([primeira], arquivo), delimiter=delimitador)
+    cabecalho = next(leitor)
+
+    indice_data = _escolher_coluna(cabecalho, config.coluna_data, COLUNAS_DATA)
+    indice_valor = _escolher_coluna(cabecalho, config.coluna_valor, COLUNAS_VALOR)
+    encontradas = indice_data is not None and indice_valor is not None
+    if not encontradas:
+        # Sem cabeçalho reconhecível: colunas (data, valor) nas duas primeiras posições
+        indice_data, indice_valor = 0, 1
+
+    # Se a primeira linha já tem uma data, o arquivo não tem cabeçalho
+    try:
+        converter_data(cabecalho[indice_data], config.formatos_data)
+        tem_cabecalho = False
+    except (ValueError, IndexError):
+        if not encontradas:
+            raise ValueError(f"Colunas de data e valor não encontradas no cabeçalho: {cabecalho}")
+        tem_cabecalho = True
+
+    ultima = max(indice_data, indice_valor)
+    linhas = leitor if tem_cabecalho else itertools.chain([cabecalho], leitor)
+    for numero, linha in enumerate(linhas, 2 if tem_cabecalho else 1):
+        if not linha or (len(linha) == 1 and not linha[0].strip()) or linha[0].startswith('#'):
+            continue
+        if len(linha) <= ultima:
+            yield numero, None, None
+        else:
+            yield numero, linha[indice_data], linha[indice_valor]
+
+
+def _objetos_json(arquivo) -> Iterator[Any]:
+    """Objetos de um array JSON (`[{...}, ...]`) ou de JSON Lines, lidos em blocos."""
+    decodificador = json.JSONDecoder()
+    buffer, inicio, esgotado = '', 0, False
+    em_array = None
+
+    while True:
+        # Pular espaços e vírgulas entre objetos, lendo mais quando o bloco acaba
+        while True:
+            while inicio < len(buffer) and buffer[inicio] in ' \t\r\n,':
+                inicio += 1
+            if inicio < len(buffer) or esgotado:
+                break
+            buffer, inicio = arquivo.read(TAMANHO_BLOCO_JSON), 0
+            esgotado = not buffer
+        if inicio >= len(buffer):
+            return
+
+        if em_array is None:
+            em_array = buffer[inicio] == '['
+            if em_array:
+                inicio += 1
+                continue
+        if em_array and buffer[inicio] == ']':
+            return
+
+        try:
+            objeto, inicio = decodificador.raw_decode(buffer, inicio)
+        except json.JSONDecodeError:
+            if esgotado:
+                raise
+            # Objeto incompleto: juntar o próximo bloco e tentar de novo
+            bloco = arquivo.read(TAMANHO_BLOCO_JSON)
+            esgotado = not bloco
+            buffer, inicio = buffer[inicio:] + bloco, 0
+            continue
+        yield objeto
+
+
+def _obter(objeto: Any, caminho: str) -> Any:
+    """Valor de uma chave (aninhada com ponto) de um objeto JSON."""
+    for chave in caminho.split('.'):
+        if not isinstance(objeto, dict):
+            return None
+        objeto = objeto.get(chave)
+    return objeto
+
+
+def ler_json(arquivo, config: ConfiguracaoImportacao) -> Iterator[LinhaBruta]:
+    """Lê os objetos de um JSON, um por vez, como (número, data, valor)."""
+    chave_data, chave_valor = config.coluna_data, config.coluna_valor
+
+    for numero, objeto in enumerate(_objetos_json(arquivo), 1):
+        if not isinstance(objeto, dict):
+            yield numero, None, None
+            continue
+        if chave_data is None or chave_valor is None:
+            # Chaves reconhecidas pelo primeiro objeto
+            nomes = list(objeto)
+            if chave_data is None:
+                indice = _escolher_coluna(nomes, None, COLUNAS_DATA)
+                chave_data = nomes[indice] if indice is not None else None
+            if chave_valor is None:
+                indice = _escolher_coluna(nomes, None, COLUNAS_VALOR)
+                chave_valor = nomes[indice] if indice is not None else None
+            if chave_data is None or chave_valor is None:
+                raise ValueError(f"Chaves de data e valor não encontradas: {nomes}")
+        yield numero, _obter(objeto, str(chave_data)), _obter(objeto, str(chave_valor))
+
+
+def converter_linhas(linhas: Iterable[LinhaBruta], config: ConfiguracaoImportacao,
+                     resultado: ResultadoImportacao) -> Iterator[Tuple[int, float]]:
+    """Converte e valida as linhas em (ordinal, valor); inválidas interrompem ou são contadas."""
+    for numero, data, valor in linhas:
+        resultado.lidas += 1
+        try:
+            if data is None or valor is None:
+                raise ValueError("data ou valor ausente")
+            yield converter_data(data, config.formatos_data), converter_valor(valor)
+        except ValueError as e:
+            if not config.ignorar_invalidas:
+                raise ValueError(f"Linha {numero}: {e}")
+            resultado.invalidas += 1
+
+
+def _acompanhar(linhas: Iterable[LinhaBruta], posicao: Callable[[], int], total: int,
+                progresso: Optional[Callable[[int, int], None]],
+                cancelado: Optional[Callable[[], bool]]) -> Iterator[LinhaBruta]:
+    """Repassa as linhas informando o progresso e verificando o cancelamento periodicamente."""
+    for contador, linha in enumerate(linhas, 1):
+        if contador % INTERVALO_PROGRESSO == 0:
+            if cancelado and cancelado():
+                raise ImportacaoCancelada("Importação cancelada")
+            if progresso:
+                progresso(posicao(), total)
+        yield linha
+
+
+def remover_duplicadas(coletas: Iterable[Tuple[int, float]], dados: ColetaStore,
+                       resultado: ResultadoImportacao) -> Iterator[Tuple[int, float]]:
+    """Descarta coletas já existentes na pool (índice de duplicidade) ou repetidas no arquivo."""
+    vistas: Set[int] = set()
+    for data_ordinal, valor in coletas:
+        chave = ColetaStore.chave(data_ordinal, valor)
+        if chave in vistas or dados.contem_chave(chave):
+            resultado.duplicadas += 1
+            continue
+        vistas.add(chave)
+        yield data_ordinal, valor
+
+
+# --- Importação -------------------------------------------------------------
+
+def _detectar_formato(caminho: str, arquivo) -> str:
+    """'json' pela extensão ou pelo primeiro caractere; caso contrário 'csv'."""
+    if os.path.splitext(caminho)[1].lower() in ('.json', '.jsonl', '.ndjson'):
+        return 'json'
+    inicio = arquivo.buffer.peek(64)[:64].lstrip(b'\xef\xbb\xbf \t\r\n') if hasattr(arquivo, 'buffer') else b''
+    return 'json' if inicio[:1] in (b'[', b'{') else 'csv'
+
+
+class LoteImportacao:
+    """Coletas lidas de um arquivo, ainda não registradas na pool."""
+
+    def __init__(self, pool_id: str, config: ConfiguracaoImportacao, resultado: ResultadoImportacao):
+        self.pool_id = pool_id
+        self.config = config
+        self.resultado = resultado
+        # Colunas compactas com as coletas aceitas (memória proporcional às válidas)
+        self.ordinais = array('i')
+        self.valores = array('d')
+
+
+def ler_arquivo(monitor, pool_id: str, origem: Union[str, io.TextIOBase],
+                config: Optional[ConfiguracaoImportacao] = None,
+                progresso: Optional[Callable[[int, int], None]] = None,
+                cancelado: Optional[Callable[[], bool]] = None) -> LoteImportacao:
+    """Lê as coletas de um arquivo CSV/JSON (caminho ou arquivo aberto) sem alterar a pool.
+
+    `progresso(lidos, total)` recebe os bytes já lidos (0 de 0 para arquivos
+    sem tamanho conhecido, como a entrada padrão) e `cancelado()` é consultado
+    periodicamente. Pode rodar em outra thread: as duplicadas são conferidas
+    em uma cópia da pool, e o lote é registrado depois com `registrar_lote`.
+    """
+    config = config or ConfiguracaoImportacao()
+    if pool_id not in monitor.pools:
+        raise Exception(f"Pool não encontrada: {pool_id}")
+
+    lote = LoteImportacao(pool_id, config, ResultadoImportacao())
+    # Cópia: a interface pode alterar a pool (e seu índice) enquanto o arquivo é lido
+    dados = monitor.copiar_dados_pool(pool_id)
+
+    if isinstance(origem, str):
+        bruto = open(origem, 'rb')
+        arquivo = io.TextIOWrapper(bruto, encoding=config.encoding, newline='')
+        total = os.path.getsize(origem)
+        caminho = origem
+    else:
+        bruto, arquivo, total = None, origem, 0
+        caminho = getattr(origem, 'name', '')
+
+    try:
+        formato = config.formato if config.formato != 'auto' else _detectar_formato(str(caminho), arquivo)
+        ler = ler_json if formato == 'json' else ler_csv
+
+        # Pipeline: leitura → progresso/cancelamento → conversão → duplicadas
+        linhas = _acompanhar(ler(arquivo, config), bruto.tell if bruto else lambda: 0,
+                             total, progresso, cancelado)
+        coletas = converter_linhas(linhas, config, lote.resultado)
+        if config.ignorar_duplicadas:
+            coletas = remover_duplicadas(coletas, dados, lote.resultado)
+
+        for data_ordinal, valor in coletas:
+            lote.ordinais.append(data_ordinal)
+            lote.valores.append(valor)
+    finally:
+        if bruto:
+            arquivo.close()
+
+    if cancelado and cancelado():
+        raise ImportacaoCancelada("Importação cancelada")
+    if progresso:
+        progresso(total, total)
+    return lote
+
+
+def registrar_lote(monitor, lote: LoteImportacao) -> ResultadoImportacao:
+    """Registra na pool, de uma vez, as coletas lidas por `ler_arquivo`.
+
+    Na interface, deve rodar na thread principal: a tabela lê as colunas da
+    pool ativa sem o lock.
+    """
+    resultado = lote.resultado
+    # A pool pode ter recebido coletas durante a leitura: o lote confere de novo
+    resultado.importadas = monitor.registrar_coletas_em_lote(
+        lote.pool_id, zip(map(ordinal_para_data, lote.ordinais), lote.valores), lote.config.ignorar_duplicadas
+    )
+    resultado.duplicadas += len(lote.ordinais) - resultado.importadas
+    return resultado
+
+
+def importar_arquivo(monitor, pool_id: str, origem: Union[str, io.TextIOBase],
+                     config: Optional[ConfiguracaoImportacao] = None,
+                     progresso: Optional[Callable[[int, int], None]] = None,
+                     cancelado: Optional[Callable[[], bool]] = None) -> ResultadoImportacao:
+    """Importa as coletas de um arquivo CSV/JSON (caminho ou arquivo aberto) para uma pool.
+
+    Equivale a `ler_arquivo` seguido de `registrar_lote`: a pool só é
+    alterada ao final, em um único lote, e nada muda se houver erro ou
+    cancelamento.
+    """
+    return registrar_lote(monitor, ler_arquivo(monitor, pool_id, origem, config, progresso, cancelado))
@@ -1,62 +1,134 @@
 import csv
+import functools
+import math
 import os
-import shutil
+import threading
 import uuid
-from typing import List, Optional, Dict
-from utils.paths import get_data_file_path, get_legacy_file_path
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional, Dict, Set, Tuple
+from utils.paths import get_legacy_file_path
 
+from core.armazenamento import Armazenamento, ArmazenamentoCSV, RegistroColeta, criar_armazenamento
+from core.cache_coletas import CacheColetas
+from core.carregamento import (carregar_em_paralelo, montar_coletas, processos_configurados,
+                               registros_precisam_reescrita)
+from core.exportacao import linhas_pool
+from core.persistencia import AlteracoesPool, GravadorSegundoPlano
 from models.coleta import Coleta
+from models.coleta_store import ColetaStore
 from models.pool_config import PoolConfig
-from datetime import datetime
+from models.resumo_pool import ResumoPool
+from utils.arquivos import escrever_csv_atomico
+from utils.datas import data_para_ordinal
+
+
+class ColetaDuplicada(ValueError):
+    """Já existe uma coleta com a mesma data e valor na pool."""
+
+
+def _sincronizado(metodo):
+    """Executa o método com o lock do monitor (a gravação roda em outra thread)."""
+    @functools.wraps(metodo)
+    def executar(self, *args, **kwargs):
+        with self._lock:
+            return metodo(self, *args, **kwargs)
+    return executar
+
 
 class MonitorLiquidez:
     """Gerencia múltiplas pools e suas coletas."""
 
-    def __init__(self):
-        # Arquivos principais
-        self.arquivo_pools = get_data_file_path('pools_config.csv')
+    def __init__(self, armazenamento: Optional[Armazenamento] = None, gravacao_assincrona: bool = False,
+                 carregar: bool = True, gravacao_manual: bool = False,
+                 processos_carregamento: Optional[int] = None, usar_cache: bool = True,
+                 ao_falhar_gravacao: Optional[Callable[[Exception], None]] = None,
+                 ao_desfazer_transacao: Optional[Callable[[], None]] = None):
+        # Armazenamento (CSV por padrão ou SQLite)
+        self.armazenamento = armazenamento or criar_armazenamento()
+        # Protege o estado em memória contra a thread de gravação
+        self._lock = threading.RLock()
+        # Serializa as gravações (thread de fundo e flush explícito)
+        self._lock_gravacao = threading.Lock()
         self.pools: Dict[str, PoolConfig] = {}
         self.pool_ativa_id: Optional[str] = None
-        self.dados_pools: Dict[str, List[Coleta]] = {}
+        # Coletas das pools já carregadas (carregamento sob demanda)
+        self.dados_pools: Dict[str, ColetaStore] = {}
+        # Totais persistidos de cada pool, usados sem carregar o histórico
+        self.resumo_pools: Dict[str, ResumoPool] = {}
+        # Totais de todas as pools, mantidos incrementalmente junto com resumo_pools
+        self.resumo_geral = ResumoPool('')
+        # Alterações em memória ainda não gravadas (pools "sujas")
+        self.pendencias: Dict[str, AlteracoesPool] = {}
+        self._pools_alteradas: Set[str] = set()
+        self._pools_excluidas: Set[str] = set()
+        self._config_pendente = False
+        self._resumo_pendente = False
+        self.gravador: Optional[GravadorSegundoPlano] = None
+        # Com gravação manual, as alterações só são gravadas em flush() ou fechar()
+        # (processamento em lote, ex.: a linha de comando)
+        self.gravacao_manual = gravacao_manual
+        # Profundidade de transacao() em andamento (gravações adiadas até o fim)
+        self._transacoes = 0
+        # Avisado quando uma transação é desfeita: as coletas voltam como novos
+        # ColetaStore, e quem guardou referências (ex.: a tabela) precisa relê-las
+        self.ao_desfazer_transacao = ao_desfazer_transacao
+        # Processos usados por carregar_dados_pools (0 ou 1 = sequencial);
+        # sem valor explícito, vem de COLLECT_FEE_POOLS_PROCESSOS_CARREGAMENTO
+        self.processos_carregamento = (processos_configurados() if processos_carregamento is None
+                                       else processos_carregamento)
+        # Coletas já interpretadas na execução anterior (lido em carregar(), gravado em fechar())
+        self.usar_cache = usar_cache
+        self.cache: Optional[CacheColetas] = None
 
+        # Sem `carregar`, quem cria o monitor chama carregar() depois (ex.: em outra thread)
+        if carregar:
+            self.carregar()
+
+        # Com gravação assíncrona, as alterações retornam logo e são gravadas
+        # em segundo plano, agrupadas; `ao_falhar_gravacao` é avisado quando
+        # uma gravação falha (ela é repetida até dar certo)
+        if gravacao_assincrona:
+            self.gravador = GravadorSegundoPlano(self.salvar_pendentes, ao_falhar=ao_falhar_gravacao)
+
+    def carregar(self) -> None:
+        """Migra dados antigos e carrega as pools e seus totais.
+
+        As coletas de cada pool continuam sendo lidas sob demanda.
+        """
         # Migrar dados antigos se existirem
         self._migrar_dados_antigos()
+
+        if self.usar_cache and self.cache is None:
+            cache = CacheColetas()
+            cache.carregar()
+            self.cache = cache
         
         # Carregar pools existentes
         self.carregar_pools()
+        self.carregar_resumo()
         
-        # Definir pool ativa (primeira disponível)
-        if self.pools:
-            self.pool_ativa_id = list(self.pools.keys())[-1]
-            # Carregar dados de TODAS as pools
-            for pool_id in self.pools.keys():
-                self.carregar_dados_pool(pool_id)
+        # Definir pool ativa (primeira disponível); seus dados são lidos no primeiro acesso
+        with self._lock:
+            if self.pools and not self.pool_ativa_id:
+                self.pool_ativa_id = list(self.pools.keys())[-1]
 
     def _calcular_dias_entre_datas(self, data_inicial: str, data_final: str) -> int:
         """Calcula dias entre duas datas no formato dd/MM/yyyy."""
         try:
-            data_ini = datetime.strptime(data_inicial, "%d/%m/%Y")
-            data_fim = datetime.strptime(data_final, "%d/%m/%Y")
-            return (data_fim - data_ini).days
+            return data_para_ordinal(data_final) - data_para_ordinal(data_inicial)
         except ValueError as e:
             print(f"Erro ao calcular dias entre {data_inicial} e {data_final}: {e}")
             return 0
 
-    def _calcular_dias_coleta(self, pool_id: str, data_coleta: str) -> int:
-        """Calcula quantos dias desde a última coleta ou data base da pool."""
-        pool_config = self.pools.get(pool_id)
-        dados_pool = self.dados_pools.get(pool_id, [])
-        
-        if not pool_config:
+    def _dias_desde_abertura(self, pool_config: PoolConfig, data_ordinal: int) -> int:
+        """Dias entre a data de abertura da pool e a data (ordinal) informada."""
+        abertura = pool_config.data_abertura_ordinal
+        if abertura is None:
+            print(f"Data de abertura inválida na pool {pool_config.nome}: {pool_config.data_abertura}")
             return 0
-        
-        # Se é a primeira coleta, calcular desde a data de abertura da pool
-        if not dados_pool:
-            return self._calcular_dias_entre_datas(pool_config.data_abertura, data_coleta)
-        
-        # Se já existem coletas, calcular desde a última coleta
-        ultima_coleta = dados_pool[-1]
-        return self._calcular_dias_entre_datas(ultima_coleta.data, data_coleta)
+        return data_ordinal - abertura
 
     def _migrar_dados_antigos(self):
         """Migra dados do formato antigo (pool única) para o novo formato."""
@@ -64,7 +136,7 @@ class MonitorLiquidez:
         arquivo_antigo_coletas = get_legacy_file_path('coletas.csv')
         
         # Se existir configuração antiga, migrar
-        if os.path.exists(arquivo_antigo_config) and not os.path.exists(self.arquivo_pools):
+        if os.path.exists(arquivo_antigo_config) and not self.armazenamento.existe():
             try:
                 with open(arquivo_antigo_config, 'r', newline='', encoding='utf-8') as file:
                     reader = csv.DictReader(file)
@@ -80,14 +152,16 @@ class MonitorLiquidez:
                             tipo_moeda=config_data.get('tipo_moeda', '')
                         )
                         
-                        # Salvar nova estrutura
-                        self.pools[pool_id] = pool_config
-                        self.salvar_pools()
-                        
-                        # Migrar coletas se existirem
-                        if os.path.exists(arquivo_antigo_coletas):
-                            arquivo_coletas_novo = get_data_file_path(f'pool_{pool_id}_coletas.csv')
-                            shutil.copy2(arquivo_antigo_coletas, arquivo_coletas_novo)
+                        # Salvar nova estrutura (configuração e coletas juntas)
+                        with self.transacao(pools=()):
+                            self.pools[pool_id] = pool_config
+                            self.salvar_pools()
+
+                            # Migrar coletas se existirem
+                            if os.path.exists(arquivo_antigo_coletas):
+                                registros = ArmazenamentoCSV().ler_arquivo_coletas(arquivo_antigo_coletas)
+                                self.dados_pools[pool_id] = self._montar_coletas(pool_id, registros)
+                                self.salvar_dados_pool(pool_id)
                         
                         print(f"Dados migrados com sucesso para o novo formato!")
                         
@@ -95,57 +169,110 @@ class MonitorLiquidez:
                  
                 print(f"Erro ao migrar dados antigos: {e}")
 
+    @_sincronizado
     def carregar_pools(self) -> None:
         """Carrega todas as pools configuradas."""
-        if not os.path.exists(self.arquivo_pools):
-            return
-        
         try:
-            with open(self.arquivo_pools, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    pool_config = PoolConfig.from_dict(row)
-                    self.pools[pool_config.pool_id] = pool_config
+            for pool_config in self.armazenamento.carregar_pools():
+                self.pools[pool_config.pool_id] = pool_config
         except Exception as e:
             print(f"Erro ao carregar pools: {e}")
 
-    def salvar_pools(self) -> None:
-        """Salva todas as configurações de pools."""
+    @_sincronizado
+    def carregar_resumo(self) -> None:
+        """Carrega os totais das pools, calculando os que ainda não existem."""
         try:
-            with open(self.arquivo_pools, 'w', newline='', encoding='utf-8') as file:
-                fieldnames = ['pool_id', 'nome', 'data_abertura', 'valor_inicial', 'tipo_moeda']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                for pool in self.pools.values():
-                    writer.writerow(pool.to_dict())
+            for resumo in self.armazenamento.carregar_resumo():
+                if resumo.pool_id in self.pools:
+                    self.resumo_pools[resumo.pool_id] = resumo
         except Exception as e:
-            raise Exception(f"Erro ao salvar pools: {e}")
+            print(f"Erro ao carregar resumo das pools: {e}")
+
+        # Pools sem resumo (dados anteriores a esta versão) são carregadas uma vez;
+        # o resumo de cada uma é calculado ao incorporar as coletas
+        faltantes = [pool_id for pool_id in self.pools if pool_id not in self.resumo_pools]
+        self.carregar_dados_pools(faltantes)
 
-    def criar_nova_pool(self, nome: str, data_abertura: str, valor_inicial: float, tipo_moeda: str) -> str:
-        """Cria uma nova pool e retorna seu ID."""
-        pool_id = str(uuid.uuid4())
+        self._reconstruir_resumo_geral()
+
+    def _reconstruir_resumo_geral(self) -> None:
+        """Soma novamente os totais de todas as pools (apenas em recargas completas)."""
+        self.resumo_geral = ResumoPool('')
+        for resumo in self.resumo_pools.values():
+            self.resumo_geral.ajustar(resumo.total_coletas, resumo.total_usd, resumo.total_taxa)
+
+    def _recalcular_resumo(self, pool_id: str) -> None:
+        """Recalcula em memória o resumo de uma pool carregada (alterações em lote)."""
+        anterior = self.resumo_pools.pop(pool_id, None)
+        if anterior:
+            self.resumo_geral.ajustar(-anterior.total_coletas, -anterior.total_usd, -anterior.total_taxa)
+
+        if pool_id in self.pools:
+            dados = self.dados_pools.get(pool_id) or ColetaStore()
+            resumo = ResumoPool(pool_id, len(dados), dados.soma_valores(), dados.soma_taxas())
+            self.resumo_pools[pool_id] = resumo
+            self.resumo_geral.ajustar(resumo.total_coletas, resumo.total_usd, resumo.total_taxa)
+
+    def _ajustar_resumo(self, pool_id: str, coletas: int, usd: float, taxa: float) -> None:
+        """Aplica a variação de uma alteração ao resumo da pool e ao geral, em O(1)."""
+        resumo = self.resumo_pools.get(pool_id)
+        if resumo is None:
+            self._recalcular_resumo(pool_id)
+        else:
+            resumo.ajustar(coletas, usd, taxa)
+            self.resumo_geral.ajustar(coletas, usd, taxa)
+        self._salvar_resumo()
+
+    def _salvar_resumo(self) -> None:
+        """Agenda a gravação do resumo de todas as pools."""
+        self._resumo_pendente = True
+        self._agendar_gravacao()
+
+    @_sincronizado
+    def salvar_pools(self, alteradas: Optional[Iterable[str]] = None) -> None:
+        """Agenda a gravação das configurações de pools (apenas `alteradas`, se informado)."""
+        self._pools_alteradas.update(self.pools if alteradas is None else alteradas)
+        self._agendar_gravacao()
+
+    @_sincronizado
+    def criar_nova_pool(self, nome: str, data_abertura: str, valor_inicial: float, tipo_moeda: str,
+                        pool_id: Optional[str] = None) -> str:
+        """Cria uma nova pool e retorna seu ID (`pool_id` preserva o ID de uma pool importada)."""
+        if pool_id is None:
+            pool_id = str(uuid.uuid4())
+        elif pool_id in self.pools:
+            raise ValueError(f"Já existe uma pool com o ID {pool_id}")
         pool_config = PoolConfig(pool_id, nome, data_abertura, valor_inicial, tipo_moeda)
         
-        self.pools[pool_id] = pool_config
-        self.dados_pools[pool_id] = []
-        
-        self.salvar_pools()
-        self.salvar_dados_pool(pool_id)
+        # Configuração, coletas e resumo da nova pool gravados juntos
+        with self.transacao(pools=()):
+            self.pools[pool_id] = pool_config
+            self.dados_pools[pool_id] = ColetaStore()
+
+            self.salvar_pools([pool_id])
+            self.salvar_dados_pool(pool_id)
         
         return pool_id
 
+    @_sincronizado
     def excluir_pool(self, pool_id: str) -> None:
         """Exclui uma pool e seus dados."""
-        if pool_id in self.pools:
-            # Remover arquivos
-            arquivo_coletas = get_data_file_path(f'pool_{pool_id}_coletas.csv')
-            if os.path.exists(arquivo_coletas):
-                os.remove(arquivo_coletas)
+        if pool_id not in self.pools:
+            return
+
+        # Configuração, resumo e remoção das coletas gravados juntos
+        with self.transacao(pools=()):
+            # Remover coletas do armazenamento (na próxima gravação)
+            self._pools_excluidas.add(pool_id)
+            self._pools_alteradas.discard(pool_id)
             
             # Remover da memória
             del self.pools[pool_id]
             if pool_id in self.dados_pools:
                 del self.dados_pools[pool_id]
+            self.pendencias.pop(pool_id, None)
+            self._recalcular_resumo(pool_id)
+            self._salvar_resumo()
             
             # Se era a pool ativa, selecionar outra
             if self.pool_ativa_id == pool_id:
@@ -153,21 +280,26 @@ class MonitorLiquidez:
                 if self.pool_ativa_id:
                     self.carregar_dados_pool_ativa()
             
-            self.salvar_pools()
+            self.salvar_pools([])
 
+    @_sincronizado
     def atualizar_pool(self, pool_id: str, nome: str, data_abertura: str, valor_inicial: float, tipo_moeda: str) -> None:
         """Atualiza uma pool existente."""
-        if pool_id in self.pools:
+        if pool_id not in self.pools:
+            return
+
+        # Configuração e taxas recalculadas gravadas juntas
+        with self.transacao(pools=[pool_id]):
             self.pools[pool_id].nome = nome
             self.pools[pool_id].data_abertura = data_abertura
             self.pools[pool_id].valor_inicial = valor_inicial
             self.pools[pool_id].tipo_moeda = tipo_moeda
             
-            self.salvar_pools()
+            self.salvar_pools([pool_id])
             self.recalcular_taxas_pool(pool_id)
 
     def definir_pool_ativa(self, pool_id: str) -> None:
-        """Define qual pool está ativa."""
+        """Define qual pool está ativa, carregando seus dados se necessário."""
         if pool_id in self.pools:
             self.pool_ativa_id = pool_id
             self.carregar_dados_pool_ativa()
@@ -178,115 +310,359 @@ class MonitorLiquidez:
             return self.pools[self.pool_ativa_id]
         return None
 
-    def get_dados_pool_ativa(self) -> List[Coleta]:
+    def get_dados_pool_ativa(self) -> ColetaStore:
         """Retorna os dados da pool ativa."""
-        if self.pool_ativa_id and self.pool_ativa_id in self.dados_pools:
-            return self.dados_pools[self.pool_ativa_id]
-        return []
+        if self.pool_ativa_id and self.pool_ativa_id in self.pools:
+            return self.get_dados_pool(self.pool_ativa_id)
+        return ColetaStore()
+
+    def get_dados_pool(self, pool_id: str) -> ColetaStore:
+        """Retorna os dados de uma pool, carregando-os no primeiro acesso."""
+        if pool_id not in self.dados_pools:
+            self.carregar_dados_pool(pool_id)
+        return self.dados_pools.get(pool_id, ColetaStore())
+
+    def copiar_dados_pool(self, pool_id: str) -> ColetaStore:
+        """Cópia das coletas de uma pool, que não muda com as alterações seguintes.
+
+        A pool é carregada fora do lock (como em `carregar_dados_pool`); só a
+        cópia é feita com ele, para não travar a interface durante a leitura.
+        """
+        if pool_id not in self.dados_pools:
+            self.carregar_dados_pool(pool_id)
+        with self._lock:
+            return self.get_dados_pool(pool_id).copia()
 
     def carregar_dados_pool_ativa(self) -> None:
-        """Carrega dados da pool ativa."""
+        """Carrega dados da pool ativa (se ainda não carregados)."""
         if not self.pool_ativa_id:
             return
         
-        self.carregar_dados_pool(self.pool_ativa_id)
+        self.get_dados_pool(self.pool_ativa_id)
 
     def carregar_dados_pool(self, pool_id: str) -> None:
-        """Carrega dados de uma pool específica."""
-        arquivo_coletas = get_data_file_path(f'pool_{pool_id}_coletas.csv')
-        
-        if pool_id not in self.dados_pools:
-            self.dados_pools[pool_id] = []
-        
-        if not os.path.exists(arquivo_coletas):
+        """Carrega dados de uma pool específica.
+
+        A leitura ocorre fora do lock, para que o carregamento em segundo plano
+        não trave a interface; se outra thread carregar a pool antes, os dados
+        dela são mantidos.
+        """
+        if self._carregar_do_cache(pool_id):
             return
-        
-        try:
-            with open(arquivo_coletas, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                header = next(reader, None)
-                if header is None:
-                    return
 
-                self.dados_pools[pool_id].clear()
-                pool_config = self.pools.get(pool_id)
-                
-                for row in reader:
-                    if len(row) >= 2:
-                        try:
-                            data = row[0]
-                            coleta_usd = float(row[1])
-                            
-                            # Calcular taxa se temos configuração da pool
-                            taxa = 0.0
-                            if pool_config:
-                                if len(row) >= 3:
-                                    try:
-                                        taxa = float(row[2])
-                                    except (ValueError, IndexError):
-                                        taxa = (coleta_usd / pool_config.valor_inicial) * 100
-                                else:
-                                    taxa = (coleta_usd / pool_config.valor_inicial) * 100
-                            
-                            # Calcular ou ler dias
-                            dias = 0
-                            if len(row) >= 5:  # Se já tem dados de dias no CSV
-                                try:
-                                    dias = int(float(row[4]))  # 5ª coluna seria dias
-                                except (ValueError, IndexError):
-                                    # Se não conseguir ler, recalcular
-                                    if pool_config:
-                                        # Se é a primeira coleta desta sessão de carregamento
-                                        if not self.dados_pools[pool_id]:
-                                            dias = self._calcular_dias_entre_datas(pool_config.data_abertura, data)
-                                        else:
-                                            ultima_coleta = self.dados_pools[pool_id][-1]
-                                            dias = self._calcular_dias_entre_datas(ultima_coleta.data, data)
-                            else:
-                                # Recalcular dias para dados antigos
-                                if pool_config:
-                                    if not self.dados_pools[pool_id]:
-                                        dias = self._calcular_dias_entre_datas(pool_config.data_abertura, data)
-                                    else:
-                                        ultima_coleta = self.dados_pools[pool_id][-1]
-                                        dias = self._calcular_dias_entre_datas(ultima_coleta.data, data)
-                            
-                            self.dados_pools[pool_id].append(Coleta(data, coleta_usd, taxa, dias))
-                        except (ValueError, IndexError) as e:
-                            print(f'Erro ao ler a linha {row}. Erro: {e}')
-                            
-            # Após carregar, salvar novamente para incluir dias calculados
-            self.salvar_dados_pool(pool_id)
-            
+        dados: Optional[ColetaStore] = None
+        registros: List[RegistroColeta] = []
+        try:
+            # Formatos que já guardam as colunas dispensam a montagem a partir de registros
+            dados = self.armazenamento.carregar_dados(pool_id)
+            if dados is None:
+                registros = self.armazenamento.carregar_coletas(pool_id)
         except Exception as e:
             print(f"Erro ao carregar dados da pool {pool_id}: {e}")
 
-    def salvar_dados_pool(self, pool_id: str) -> None:
-        """Salva dados de uma pool específica."""
-        arquivo_coletas = get_data_file_path(f'pool_{pool_id}_coletas.csv')
-        dados = self.dados_pools.get(pool_id, [])
-        
+        with self._lock:
+            # Já carregada por outra thread, ou excluída durante a leitura
+            if pool_id in self.dados_pools or pool_id not in self.pools:
+                return
+            if dados is not None:
+                self._incorporar_coletas(pool_id, dados, False)
+                return
+            self._incorporar_coletas(pool_id, self._montar_coletas(pool_id, registros),
+                                     registros_precisam_reescrita(registros))
+
+    def carregar_dados_pools(self, pool_ids: Optional[Iterable[str]] = None,
+                             ao_carregar: Optional[Callable[[str], None]] = None,
+                             cancelado: Optional[Callable[[], bool]] = None) -> None:
+        """Carrega as coletas de várias pools (todas, se `pool_ids` for None).
+
+        Com `processos_carregamento` > 1, os arquivos são lidos em threads e
+        interpretados em processos separados; as pools entram em `dados_pools`
+        sempre na ordem pedida. `ao_carregar` recebe o id de cada pool pronta e
+        `cancelado` interrompe o carregamento entre uma pool e outra.
+        """
+        with self._lock:
+            pools = [self.pools[pool_id] for pool_id in (self.pools if pool_ids is None else pool_ids)
+                     if pool_id in self.pools]
+
+        # No modo paralelo, as pools ainda não lidas vêm todas de um mesmo carregamento,
+        # consumido na ordem pedida; as demais (ou todas, no sequencial) vêm de get_dados_pool
+        paralelo = self.processos_carregamento > 1
+        pendentes = {pool.pool_id for pool in pools if paralelo and pool.pool_id not in self.dados_pools
+                     and not self._carregar_do_cache(pool.pool_id)}
+        cargas = carregar_em_paralelo(self.armazenamento, [pool for pool in pools if pool.pool_id in pendentes],
+                                      self.processos_carregamento)
+        try:
+            for pool in pools:
+                if cancelado and cancelado():
+                    return
+                if pool.pool_id in pendentes:
+                    carga = next(cargas)
+                    with self._lock:
+                        # Já carregada por outra thread, ou excluída durante a leitura
+                        if pool.pool_id not in self.dados_pools and pool.pool_id in self.pools:
+                            self.armazenamento.concluir_carregamento(pool.pool_id, carga.dados,
+                                                                     carga.linhas_journal)
+                            self._incorporar_coletas(pool.pool_id, carga.dados, carga.reescrever)
+                else:
+                    self.get_dados_pool(pool.pool_id)
+                if ao_carregar:
+                    ao_carregar(pool.pool_id)
+        finally:
+            cargas.close()
+
+    def _carregar_do_cache(self, pool_id: str) -> bool:
+        """Usa as coletas do cache de inicialização, se os arquivos da pool não mudaram."""
+        pool_config = self.pools.get(pool_id)
+        if self.cache is None or pool_config is None:
+            return False
+        arquivos = self.armazenamento.arquivos_coletas(pool_id)
+        entrada = self.cache.obter(pool_config, arquivos) if arquivos else None
+        if entrada is None:
+            return False
+
+        with self._lock:
+            # Já carregada por outra thread, ou excluída durante a verificação
+            if pool_id not in self.dados_pools and pool_id in self.pools:
+                self.armazenamento.concluir_carregamento(pool_id, entrada.dados, entrada.linhas_journal)
+                self._incorporar_coletas(pool_id, entrada.dados, False)
+        return True
+
+    @_sincronizado
+    def _salvar_cache(self) -> None:
+        """Guarda no cache as pools carregadas, já gravadas e idênticas aos seus arquivos.
+
+        Só as pools cujos arquivos mudaram desde a última gravação do cache são regravadas.
+        """
+        if self.cache is None:
+            return
+
         try:
-            with open(arquivo_coletas, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                # Header atualizado com coluna Dias
-                writer.writerow(['Data', 'Coleta_USD', 'Taxa_Percentual', 'Total_Acumulado_USD', 'Dias'])
-                
-                total_acumulado = 0
-                for coleta in dados:
-                    total_acumulado += coleta.coleta_usd
-                    writer.writerow([
-                        coleta.data, 
-                        coleta.coleta_usd, 
-                        coleta.taxa_percentual, 
-                        total_acumulado,
-                        coleta.dias  # Nova coluna
-                    ])
+            for pool_id in self.cache.pools():
+                if pool_id not in self.pools:
+                    self.cache.descartar(pool_id)
+        except OSError as e:
+            print(f"Erro ao limpar o cache de coletas: {e}")
+
+        for pool_id, dados in self.dados_pools.items():
+            arquivos = self.armazenamento.arquivos_coletas(pool_id)
+            if not arquivos:
+                # Pool sem arquivos próprios (SQLite, formato binário): nada a guardar
+                continue
+            alteracoes = self.pendencias.get(pool_id)
+            if alteracoes is not None and not alteracoes.vazia():
+                self.cache.descartar(pool_id)
+                continue
+            self.cache.atualizar(self.pools[pool_id], arquivos, dados, self.armazenamento.linhas_journal(pool_id))
+
+        try:
+            self.cache.salvar()
         except Exception as e:
-            raise Exception(f"Erro ao salvar dados da pool {pool_id}: {e}")
+            print(f"Erro ao salvar o cache de coletas: {e}")
+
+    def _incorporar_coletas(self, pool_id: str, dados: ColetaStore, reescrever: bool) -> None:
+        """Guarda as coletas lidas de uma pool (chamado com o lock)."""
+        self.dados_pools[pool_id] = dados
+        self._conferir_resumo(pool_id, dados)
+
+        # Dados antigos (sem taxa ou dias) ficam marcados para regravação,
+        # feita depois e em lote por salvar_pendentes
+        if reescrever:
+            self._alteracoes(pool_id).marcar_reescrita()
 
-    def registrar_nova_coleta(self, data: str, valor: float) -> Optional[Coleta]:
-        """Registra uma nova coleta na pool ativa."""
+    def _conferir_resumo(self, pool_id: str, dados: ColetaStore) -> None:
+        """Corrige o resumo gravado de uma pool se ele não bate com as coletas carregadas.
+
+        O resumo pode divergir quando os arquivos são alterados ou removidos fora
+        do aplicativo; as coletas lidas prevalecem e o resumo corrigido é gravado.
+        """
+        resumo = self.resumo_pools.get(pool_id)
+        if (resumo is not None and resumo.total_coletas == len(dados)
+                and math.isclose(resumo.total_usd, dados.soma_valores(), rel_tol=1e-9, abs_tol=1e-6)
+                and math.isclose(resumo.total_taxa, dados.soma_taxas(), rel_tol=1e-9, abs_tol=1e-6)):
+            return
+        if resumo is not None:
+            print(f"Resumo da pool {pool_id} corrigido: {resumo.total_coletas} -> {len(dados)} coleta(s)")
+        self._recalcular_resumo(pool_id)
+        self._salvar_resumo()
+
+    def _montar_coletas(self, pool_id: str, registros: List[RegistroColeta]) -> ColetaStore:
+        """Monta o armazenamento colunar a partir dos registros, recalculando taxa e dias ausentes."""
+        return montar_coletas(pool_id, self.pools.get(pool_id), registros)
+
+    def _alteracoes(self, pool_id: str) -> AlteracoesPool:
+        """Retorna (criando se preciso) as alterações pendentes de uma pool."""
+        if pool_id not in self.pendencias:
+            self.pendencias[pool_id] = AlteracoesPool()
+        return self.pendencias[pool_id]
+
+    @_sincronizado
+    def salvar_dados_pool(self, pool_id: str) -> None:
+        """Agenda a gravação completa de uma pool específica."""
+        self._alteracoes(pool_id).marcar_reescrita()
+        self._recalcular_resumo(pool_id)
+        self._salvar_resumo()
+
+    def _agendar_gravacao(self) -> None:
+        """Grava as pendências em segundo plano ou, sem gravador, imediatamente."""
+        if self.gravacao_manual or self._transacoes:
+            return
+        if self.gravador:
+            self.gravador.agendar()
+        else:
+            self.salvar_pendentes()
+
+    @contextmanager
+    def transacao(self, pools: Optional[Iterable[str]] = None):
+        """Agrupa alterações: nada é gravado até o fim do bloco `with`.
+
+        Ao sair normalmente, tudo o que ficou pendente é gravado de uma vez (numa
+        única transação do armazenamento, quando ele permite). Se o bloco levantar
+        uma exceção, o estado em memória volta ao do início, nada é gravado e
+        `ao_desfazer_transacao` é avisado. `pools` restringe a cópia das coletas às pools que o bloco altera
+        (padrão: todas as carregadas). Transações aninhadas fazem parte da externa.
+        """
+        with self._lock:
+            if self._transacoes:
+                self._transacoes += 1
+                try:
+                    yield self
+                finally:
+                    self._transacoes -= 1
+                return
+
+            estado = self._capturar_estado(pools)
+            self._transacoes = 1
+            try:
+                yield self
+            except BaseException:
+                self._restaurar_estado(estado)
+                if self.ao_desfazer_transacao:
+                    self.ao_desfazer_transacao()
+                raise
+            finally:
+                self._transacoes = 0
+
+        self._agendar_gravacao()
+
+    def _capturar_estado(self, pools: Optional[Iterable[str]]) -> dict:
+        """Copia o estado em memória para desfazer uma transação."""
+        copiar = self.dados_pools.keys() if pools is None else set(pools)
+        dados_pools = dict(self.dados_pools)
+        for pool_id in copiar:
+            if pool_id in dados_pools:
+                dados_pools[pool_id] = dados_pools[pool_id].copia()
+
+        return {
+            'pools': {pool_id: PoolConfig.from_dict(pool.to_dict()) for pool_id, pool in self.pools.items()},
+            'pool_ativa_id': self.pool_ativa_id,
+            'dados_pools': dados_pools,
+            'resumo_pools': {pool_id: ResumoPool.from_dict(resumo.to_dict())
+                             for pool_id, resumo in self.resumo_pools.items()},
+            'resumo_geral': ResumoPool.from_dict(self.resumo_geral.to_dict()),
+            'pendencias': {pool_id: alteracoes.copia() for pool_id, alteracoes in self.pendencias.items()},
+            '_pools_alteradas': set(self._pools_alteradas),
+            '_pools_excluidas': set(self._pools_excluidas),
+            '_config_pendente': self._config_pendente,
+            '_resumo_pendente': self._resumo_pendente,
+        }
+
+    def _restaurar_estado(self, estado: dict) -> None:
+        """Volta ao estado capturado no início da transação."""
+        for atributo, valor in estado.items():
+            setattr(self, atributo, valor)
+
+    def flush(self) -> None:
+        """Grava imediatamente tudo o que estiver pendente."""
+        self.salvar_pendentes()
+
+    def fechar(self) -> None:
+        """Encerra a gravação em segundo plano, grava as pendências e fecha o armazenamento."""
+        if self.gravador:
+            self.gravador.parar()
+            self.gravador = None
+        self.salvar_pendentes()
+        self._salvar_cache()
+        self.armazenamento.fechar()
+
+    def salvar_pendentes(self) -> None:
+        """Grava em lote tudo o que estiver pendente (pools, coletas e resumo)."""
+        with self._lock_gravacao:
+            # Copiar o que está pendente sob o lock; a gravação ocorre sem bloquear alterações
+            with self._lock:
+                excluidas, self._pools_excluidas = list(self._pools_excluidas), set()
+                pools_alteradas, self._pools_alteradas = self._pools_alteradas, set()
+                # Exclusões também exigem regravar a configuração (no CSV)
+                config_pendente = self._config_pendente or bool(excluidas or pools_alteradas)
+                self._config_pendente = False
+                pools = [PoolConfig.from_dict(pool.to_dict()) for pool in self.pools.values()]
+
+                lotes = []
+                for pool_id, alteracoes in self.pendencias.items():
+                    if alteracoes.vazia() or pool_id not in self.pools:
+                        continue
+                    dados = (self.dados_pools.get(pool_id) or ColetaStore()).copia()
+                    lotes.append((pool_id, dados, alteracoes.copia()))
+                self.pendencias = {}
+
+                resumo_pendente, self._resumo_pendente = self._resumo_pendente, False
+                resumos = [ResumoPool.from_dict(resumo.to_dict()) for resumo in self.resumo_pools.values()]
+
+            # Configuração primeiro e exclusões por último: uma interrupção no meio
+            # deixa no máximo arquivos órfãos, nunca a configuração apontando para coletas apagadas
+            try:
+                with self.armazenamento.transacao():
+                    if config_pendente:
+                        try:
+                            self.armazenamento.salvar_pools(pools, pools_alteradas)
+                        except Exception as e:
+                            raise Exception(f"Erro ao salvar pools: {e}")
+
+                    for pool_id, dados, alteracoes in lotes:
+                        try:
+                            if alteracoes.reescrever:
+                                self.armazenamento.salvar_coletas(pool_id, dados)
+                            else:
+                                self.armazenamento.aplicar_alteracoes(
+                                    pool_id, dados,
+                                    alteracoes.anexadas.values(),
+                                    alteracoes.alteradas.values(),
+                                    alteracoes.removidas
+                                )
+                        except Exception as e:
+                            raise Exception(f"Erro ao salvar dados da pool {pool_id}: {e}")
+
+                    if resumo_pendente:
+                        try:
+                            self.armazenamento.salvar_resumo(resumos)
+                        except Exception as e:
+                            raise Exception(f"Erro ao salvar resumo das pools: {e}")
+
+                    for pool_id in excluidas:
+                        try:
+                            self.armazenamento.excluir_pool(pool_id)
+                        except Exception as e:
+                            raise Exception(f"Erro ao excluir pool {pool_id}: {e}")
+            except Exception:
+                # Nada é dado como gravado (no SQLite a transação foi desfeita);
+                # tudo volta a ficar pendente, com as pools regravadas por inteiro
+                with self._lock:
+                    self._pools_excluidas |= {p for p in excluidas if p not in self.pools}
+                    if config_pendente:
+                        self._config_pendente = True
+                        self._pools_alteradas |= {p for p in pools_alteradas if p in self.pools}
+                    for pool_id, _, _ in lotes:
+                        if pool_id in self.pools:
+                            self._alteracoes(pool_id).marcar_reescrita()
+                    self._resumo_pendente = self._resumo_pendente or resumo_pendente
+                raise
+
+    @_sincronizado
+    def registrar_nova_coleta(self, data: str, valor: float, permitir_duplicada: bool = True) -> Optional[Coleta]:
+        """Registra uma nova coleta na pool ativa.
+
+        Sem `permitir_duplicada`, uma coleta com a mesma data e valor de outra
+        já registrada levanta ColetaDuplicada.
+        """
         if not self.pool_ativa_id:
             return None
         
@@ -294,63 +670,169 @@ class MonitorLiquidez:
         if not pool_config:
             return None
         
+        # Converter a data uma única vez
+        data_ordinal = data_para_ordinal(data)
+
         # Calcular taxa
         taxa = (valor / pool_config.valor_inicial) * 100
         
-        # Calcular dias desde última coleta/data base
-        dias = self._calcular_dias_coleta(self.pool_ativa_id, data)
-        
-        # Criar nova coleta com dias calculados
-        nova_coleta = Coleta(data, valor, taxa, dias)
+        # Garantir que o histórico da pool está carregado
+        dados = self.get_dados_pool(self.pool_ativa_id)
+        if not permitir_duplicada and dados.contem(data_ordinal, valor):
+            raise ColetaDuplicada(f"Já existe uma coleta de ${valor:.2f} em {data}")
         
-        if self.pool_ativa_id not in self.dados_pools:
-            self.dados_pools[self.pool_ativa_id] = []
+        # Inserir na posição da data (coletas retroativas ficam no lugar certo)
+        indice = dados.inserir(data_ordinal, valor, taxa, 0, self.armazenamento.novo_id_coleta())
         
-        self.dados_pools[self.pool_ativa_id].append(nova_coleta)
-        self.salvar_dados_pool(self.pool_ativa_id)
+        # Calcular dias da nova coleta e da seguinte, desde a coleta anterior/data base
+        seguintes = self._reparar_dias(self.pool_ativa_id, (indice, indice + 1))
+        nova_coleta = dados[indice]
         
+        alteracoes = self._alteracoes(self.pool_ativa_id)
+        alteracoes.anexar(nova_coleta)
+        for coleta in seguintes:
+            if coleta.coleta_id != nova_coleta.coleta_id:
+                alteracoes.alterar(coleta)
+        self._ajustar_resumo(self.pool_ativa_id, 1, valor, taxa)
+
         return nova_coleta
 
+    @_sincronizado
+    def registrar_coletas_em_lote(self, pool_id: str, coletas: Iterable[Tuple[str, float]],
+                                  ignorar_duplicadas: bool = False) -> int:
+        """Registra várias coletas (data, valor) de uma vez em uma pool.
+
+        Todas as linhas são validadas antes de qualquer alteração. As coletas
+        são ordenadas e inseridas juntas, os dias são recalculados em uma só
+        passada e a gravação é agendada uma única vez. Com `ignorar_duplicadas`,
+        coletas com data e valor já existentes (na pool ou no próprio lote) são
+        puladas. Retorna quantas coletas foram registradas.
+        """
+        pool_config = self.pools.get(pool_id)
+        if not pool_config:
+            raise Exception(f"Pool não encontrada: {pool_id}")
+        dados = self.get_dados_pool(pool_id)
+
+        # Validar o lote inteiro antes de alterar a pool
+        novas = []
+        vistas = set()
+        for numero, (data, valor) in enumerate(coletas, 1):
+            try:
+                data_ordinal = data_para_ordinal(data)
+                valor = float(valor)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Coleta {numero}: {e}")
+            if valor <= 0:
+                raise ValueError(f"Coleta {numero}: valor deve ser maior que zero")
+            if ignorar_duplicadas:
+                chave = ColetaStore.chave(data_ordinal, valor)
+                if chave in vistas or dados.contem_chave(chave):
+                    continue
+                vistas.add(chave)
+            novas.append((data_ordinal, valor))
+
+        if not novas:
+            return 0
+        novas.sort(key=lambda coleta: coleta[0])
+
+        # Montar as colunas do lote e inseri-las de uma vez
+        ordinais = array('i', (data_ordinal for data_ordinal, _ in novas))
+        valores = array('d', (valor for _, valor in novas))
+        taxas = array('d', (valor / pool_config.valor_inicial * 100 for valor in valores))
+        ids = array('q', (self.armazenamento.novo_id_coleta() for _ in novas))
+        novos_ids = set(ids)
+        del novas
+
+        # Ordenar uma vez (coletas retroativas ficam no lugar certo);
+        # lotes posteriores à última coleta só são anexados
+        retroativas = bool(dados) and ordinais[0] < dados.ordinais[-1]
+        dados.estender(ordinais, valores, taxas, array('i', bytes(4 * len(ids))), ids)
+        if retroativas:
+            dados.ordenar()
+
+        # Lotes grandes regravam a pool inteira em vez de registrar cada coleta
+        alteracoes = self._alteracoes(pool_id)
+        reescrever = len(ids) > len(dados) // 2
+        if reescrever:
+            alteracoes.marcar_reescrita()
+
+        # Dias: uma passada a partir da coleta mais antiga do lote
+        for i in range(bisect_left(dados.ordinais, ordinais[0]), len(dados)):
+            if i == 0:
+                dias = self._dias_desde_abertura(pool_config, dados.ordinais[0])
+            else:
+                dias = dados.ordinais[i] - dados.ordinais[i - 1]
+            nova = dados.ids[i] in novos_ids
+            if dias == dados.dias[i] and not nova:
+                continue
+            dados.dias[i] = dias
+            if reescrever:
+                continue
+            if nova:
+                alteracoes.anexar(dados[i])
+            else:
+                alteracoes.alterar(dados[i])
+
+        self._ajustar_resumo(pool_id, len(ids), sum(valores), sum(taxas))
+        return len(ids)
+
+    @_sincronizado
     def recalcular_taxas_pool(self, pool_id: str) -> None:
         """Recalcula todas as taxas de uma pool."""
         pool_config = self.pools.get(pool_id)
-        dados = self.dados_pools.get(pool_id, [])
+        dados = self.get_dados_pool(pool_id) if pool_config else []
         
         if not pool_config or not dados:
             return
         
-        for coleta in dados:
-            coleta.taxa_percentual = (coleta.coleta_usd / pool_config.valor_inicial) * 100
-        
-        self.salvar_dados_pool(pool_id)
+        # Apenas coletas cuja taxa mudou ficam pendentes de gravação
+        alteracoes = self._alteracoes(pool_id)
+        variacao_taxa = 0.0
+        for indice, coleta_usd in enumerate(dados.valores):
+            taxa = (coleta_usd / pool_config.valor_inicial) * 100
+            if taxa != dados.taxas[indice]:
+                variacao_taxa += taxa - dados.taxas[indice]
+                dados.taxas[indice] = taxa
+                alteracoes.alterar(dados[indice])
+
+        self._ajustar_resumo(pool_id, 0, 0.0, variacao_taxa)
+
+    def _resumo_pool_ativa(self) -> ResumoPool:
+        """Resumo da pool ativa (vazio se não houver)."""
+        return self.resumo_pools.get(self.pool_ativa_id) or ResumoPool('')
+
+    def contar_coletas_pool_ativa(self) -> int:
+        """Conta as coletas da pool ativa (via resumo)."""
+        return self._resumo_pool_ativa().total_coletas
 
     def calcular_total_acumulado_pool_ativa(self) -> float:
-        """Calcula o total acumulado da pool ativa."""
-        dados = self.get_dados_pool_ativa()
-        return sum(coleta.coleta_usd for coleta in dados)
+        """Calcula o total acumulado da pool ativa (via resumo)."""
+        return self._resumo_pool_ativa().total_usd
         
     def calcular_taxa_acumulada_pool_ativa(self) -> float:
-        """Calcula a taxa percentual acumulada da pool ativa."""
+        """Calcula a taxa percentual acumulada da pool ativa (via resumo)."""
+        return self._resumo_pool_ativa().total_taxa
+
+    def filtrar_coletas_pool_ativa(self, data_inicial: str, data_final: str) -> List[Coleta]:
+        """Retorna as coletas da pool ativa entre duas datas (inclusive)."""
         dados = self.get_dados_pool_ativa()
-        return sum(coleta.taxa_percentual for coleta in dados)
+        inicio, fim = dados.intervalo(data_para_ordinal(data_inicial), data_para_ordinal(data_final))
+        return [dados[indice] for indice in range(inicio, fim)]
+
+    def calcular_acumulado_em(self, data: str) -> float:
+        """Total coletado na pool ativa até a data informada (inclusive)."""
+        return self.get_dados_pool_ativa().acumulado_em(data_para_ordinal(data))
     
     def contar_total_coletas_todas_pools(self) -> int:
-        """Conta o total de coletas de todas as pools combinadas"""
-        total = 0
-        for pool_id in self.dados_pools:
-            total += len(self.dados_pools[pool_id])
-        return total
+        """Conta o total de coletas de todas as pools combinadas (via resumo)"""
+        return self.resumo_geral.total_coletas
     
     def calcular_total_acumulado_todas_pools(self) -> float:
-        """Calcula o total acumulado (USD) de todas as pools combinadas"""
-        total = 0.0
-        for pool_id in self.dados_pools:
-            for coleta in self.dados_pools[pool_id]:
-                total += coleta.coleta_usd
-        return total
+        """Calcula o total acumulado (USD) de todas as pools combinadas (via resumo)"""
+        return self.resumo_geral.total_usd
 
     def exportar_dados_pool_ativa(self, nome_arquivo: str) -> None:
-        """Exporta dados da pool ativa para um arquivo CSV."""
+        """Exporta dados da pool ativa para um arquivo CSV (gravado de forma atômica)."""
         pool_config = self.get_pool_ativa()
         dados = self.get_dados_pool_ativa()
         
@@ -358,72 +840,55 @@ class MonitorLiquidez:
             raise Exception("Nenhuma pool ativa selecionada")
         
         try:
-            with open(nome_arquivo, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                
-                # Header com informações da pool
-                writer.writerow(['# Configuração da Pool'])
-                writer.writerow(['Nome', pool_config.nome])
-                writer.writerow(['Tipo de Moeda', pool_config.tipo_moeda])
-                writer.writerow(['Data de Abertura', pool_config.data_abertura])
-                writer.writerow(['Valor Inicial', pool_config.valor_inicial])
-                writer.writerow([])
-                
-                # Header da tabela - incluindo Dias
-                writer.writerow(['Data', 'Dias', 'Valor (USD)', 'Taxa (%)', 'Acumulado (USD)'])
-                
-                # Dados
-                total_acumulado = 0
-                for coleta in dados:
-                    total_acumulado += coleta.coleta_usd
-                    writer.writerow([
-                        coleta.data,
-                        coleta.dias,  # Nova coluna
-                        f"{coleta.coleta_usd:.2f}",
-                        f"{coleta.taxa_percentual:.4f}",
-                        f"{total_acumulado:.2f}"
-                    ])
+            # Linhas geradas sob demanda: bloco de configuração, cabeçalho (com Dias) e coletas
+            escrever_csv_atomico(nome_arquivo, linhas_pool(pool_config, dados))
         except Exception as e:
             raise Exception(f"Erro ao exportar dados: {e}")
 
+    @_sincronizado
     def limpar_dados_pool_ativa(self) -> None:
         """Remove todos os dados da pool ativa."""
         if not self.pool_ativa_id:
             return
         
-        self.dados_pools[self.pool_ativa_id] = []
-        arquivo_coletas = get_data_file_path(f'pool_{self.pool_ativa_id}_coletas.csv')
-        if os.path.exists(arquivo_coletas):
-            os.remove(arquivo_coletas)
+        # Regravar a pool vazia descarta as coletas e qualquer alteração pendente
+        self.dados_pools[self.pool_ativa_id] = ColetaStore()
+        self.salvar_dados_pool(self.pool_ativa_id)
 
     def get_lista_pools(self) -> List[PoolConfig]:
         """Retorna lista de todas as pools."""
         return list(self.pools.values())
     
+    @_sincronizado
     def excluir_coleta(self, linha_index: int) -> None:
         """Exclui uma coleta específica da pool ativa."""
-        if not self.pool_ativa_id or self.pool_ativa_id not in self.dados_pools:
+        if not self.pool_ativa_id or self.pool_ativa_id not in self.pools:
             raise Exception("Nenhuma pool ativa selecionada")
         
-        dados = self.dados_pools[self.pool_ativa_id]
+        dados = self.get_dados_pool(self.pool_ativa_id)
         if linha_index < 0 or linha_index >= len(dados):
             raise Exception("Índice de coleta inválido")
         
         # Remover a coleta
-        dados.pop(linha_index)
+        removida = dados.pop(linha_index)
         
-        # Recalcular dias para as coletas seguintes
-        self._recalcular_dias_pool(self.pool_ativa_id)
+        # Recalcular dias apenas da coleta seguinte (que ocupa o índice removido)
+        alteradas = self._reparar_dias(self.pool_ativa_id, (linha_index,))
         
         # Salvar as mudanças
-        self.salvar_dados_pool(self.pool_ativa_id)
+        alteracoes = self._alteracoes(self.pool_ativa_id)
+        alteracoes.remover(removida.coleta_id)
+        for coleta in alteradas:
+            alteracoes.alterar(coleta)
+        self._ajustar_resumo(self.pool_ativa_id, -1, -removida.coleta_usd, -removida.taxa_percentual)
 
-    def atualizar_coleta(self, linha_index: int, nova_data: str, novo_valor: float) -> None:
-        """Atualiza uma coleta específica da pool ativa."""
-        if not self.pool_ativa_id or self.pool_ativa_id not in self.dados_pools:
+    @_sincronizado
+    def atualizar_coleta(self, linha_index: int, nova_data: str, novo_valor: float) -> int:
+        """Atualiza uma coleta específica da pool ativa e retorna seu novo índice."""
+        if not self.pool_ativa_id or self.pool_ativa_id not in self.pools:
             raise Exception("Nenhuma pool ativa selecionada")
         
-        dados = self.dados_pools[self.pool_ativa_id]
+        dados = self.get_dados_pool(self.pool_ativa_id)
         if linha_index < 0 or linha_index >= len(dados):
             raise Exception("Índice de coleta inválido")
         
@@ -431,42 +896,54 @@ class MonitorLiquidez:
         if not pool_config:
             raise Exception("Configuração da pool não encontrada")
         
-        # Atualizar dados da coleta
-        coleta = dados[linha_index]
-        coleta.data = nova_data
-        coleta.coleta_usd = novo_valor
-        coleta.taxa_percentual = (novo_valor / pool_config.valor_inicial) * 100
+        try:
+            nova_data_ordinal = data_para_ordinal(nova_data)
+        except ValueError as e:
+            raise Exception(f"Erro ao atualizar coleta: {e}")
+
+        # Atualizar dados da coleta (movendo-a se a data sair da ordem)
+        nova_taxa = (novo_valor / pool_config.valor_inicial) * 100
+        variacao_usd = novo_valor - dados.valores[linha_index]
+        variacao_taxa = nova_taxa - dados.taxas[linha_index]
+        novo_index = dados.atualizar(linha_index, nova_data_ordinal, novo_valor, nova_taxa)
         
-        # Recalcular dias para todas as coletas (a ordem pode ter mudado)
-        self._recalcular_dias_pool(self.pool_ativa_id)
+        # Recalcular dias da coleta, da sua nova seguinte e da antiga seguinte
+        antiga_seguinte = linha_index if novo_index > linha_index else linha_index + 1
+        alteradas = self._reparar_dias(self.pool_ativa_id, (novo_index, novo_index + 1, antiga_seguinte))
         
         # Salvar as mudanças
-        self.salvar_dados_pool(self.pool_ativa_id)
+        alteracoes = self._alteracoes(self.pool_ativa_id)
+        alteracoes.alterar(dados[novo_index])
+        for coleta_alterada in alteradas:
+            alteracoes.alterar(coleta_alterada)
+        self._ajustar_resumo(self.pool_ativa_id, 0, variacao_usd, variacao_taxa)
+
+        return novo_index
 
-    def _recalcular_dias_pool(self, pool_id: str) -> None:
-        """Recalcula os dias de todas as coletas de uma pool."""
+    def _reparar_dias(self, pool_id: str, indices: Iterable[int]) -> List[Coleta]:
+        """Recalcula os dias apenas das linhas informadas (vizinhas de uma alteração).
+
+        Retorna as coletas cujo número de dias mudou.
+        """
         pool_config = self.pools.get(pool_id)
-        dados = self.dados_pools.get(pool_id, [])
+        dados = self.dados_pools.get(pool_id)
+        alteradas: List[Coleta] = []
         
         if not pool_config or not dados:
-            return
+            return alteradas
         
-        # Ordenar coletas por data para garantir ordem correta
-        try:
-            dados.sort(key=lambda x: datetime.strptime(x.data, "%d/%m/%Y"))
-        except ValueError:
-            print("Erro ao ordenar coletas por data")
-            return
-        
-        # Recalcular dias para cada coleta
-        for i, coleta in enumerate(dados):
+        for i in sorted(set(indices)):
+            if i < 0 or i >= len(dados):
+                continue
             if i == 0:
                 # Primeira coleta: dias desde data de abertura da pool
-                coleta.dias = self._calcular_dias_entre_datas(pool_config.data_abertura, coleta.data)
+                dias = self._dias_desde_abertura(pool_config, dados.ordinais[0])
             else:
                 # Demais coletas: dias desde a coleta anterior
-                coleta_anterior = dados[i-1]
-                coleta.dias = self._calcular_dias_entre_datas(coleta_anterior.data, coleta.data)
+                dias = dados.ordinais[i] - dados.ordinais[i-1]
+
+            if dias != dados.dias[i]:
+                dados.dias[i] = dias
+                alteradas.append(dados[i])
         
-        # Atualizar a lista ordenada
-        self.dados_pools[pool_id] = dados
\ No newline at end of file
+        return alteradas
@@ -0,0 +1,134 @@
+"""Controle das alterações pendentes de gravação no armazenamento."""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+from models.coleta import Coleta
+
+# Tempo (segundos) em que alterações consecutivas são agrupadas numa gravação
+JANELA_GRAVACAO = 0.5
+
+# Espera (segundos) antes de tentar de novo uma gravação que falhou; dobra a
+# cada falha seguida, até o máximo
+ESPERA_INICIAL_REPETICAO = 1.0
+ESPERA_MAXIMA_REPETICAO = 60.0
+
+
+class AlteracoesPool:
+    """Alterações de uma pool que ainda não foram gravadas."""
+
+    def __init__(self):
+        # Quando verdadeiro, a pool inteira é regravada
+        self.reescrever = False
+        self.anexadas: Dict[int, Coleta] = {}
+        self.alteradas: Dict[int, Coleta] = {}
+        self.removidas: Set[int] = set()
+
+    def anexar(self, coleta: Coleta) -> None:
+        """Registra uma coleta nova."""
+        self.anexadas[coleta.coleta_id] = coleta
+
+    def alterar(self, coleta: Coleta) -> None:
+        """Registra uma coleta alterada (coletas ainda não gravadas seguem como novas)."""
+        if coleta.coleta_id in self.anexadas:
+            self.anexadas[coleta.coleta_id] = coleta
+        else:
+            self.alteradas[coleta.coleta_id] = coleta
+
+    def remover(self, coleta_id: int) -> None:
+        """Registra a remoção de uma coleta."""
+        if self.anexadas.pop(coleta_id, None) is not None:
+            return
+        self.alteradas.pop(coleta_id, None)
+        self.removidas.add(coleta_id)
+
+    def marcar_reescrita(self) -> None:
+        """Exige que a pool inteira seja regravada."""
+        self.reescrever = True
+
+    def vazia(self) -> bool:
+        """Indica se não há nada a gravar."""
+        return not (self.reescrever or self.anexadas or self.alteradas or self.removidas)
+
+    def copia(self) -> 'AlteracoesPool':
+        """Cópia independente, para gravação fora do lock do monitor."""
+        copia = AlteracoesPool()
+        copia.reescrever = self.reescrever
+        copia.anexadas = {coleta_id: coleta.copia() for coleta_id, coleta in self.anexadas.items()}
+        copia.alteradas = {coleta_id: coleta.copia() for coleta_id, coleta in self.alteradas.items()}
+        copia.removidas = set(self.removidas)
+        return copia
+
+
+class GravadorSegundoPlano:
+    """Thread que grava as alterações pendentes de forma agrupada (write-behind).
+
+    Cada `agendar()` apenas acorda a thread; alterações feitas dentro da janela
+    de agrupamento resultam em uma única chamada de `gravar`. Uma gravação que
+    falha é repetida com espera crescente até dar certo; `ao_falhar(erro)` é
+    chamado (na thread de gravação) na primeira falha de cada sequência.
+    """
+
+    def __init__(self, gravar: Callable[[], None], janela: float = JANELA_GRAVACAO,
+                 ao_falhar: Optional[Callable[[Exception], None]] = None):
+        self._gravar = gravar
+        self._janela = janela
+        self._ao_falhar = ao_falhar
+        self._condicao = threading.Condition()
+        self._agendado = False
+        self._parar = False
+        self.ultimo_erro: Optional[Exception] = None
+
+        self._thread = threading.Thread(target=self._executar, name='GravadorSegundoPlano', daemon=True)
+        self._thread.start()
+
+    def agendar(self) -> None:
+        """Solicita uma gravação assim que a janela de agrupamento terminar."""
+        with self._condicao:
+            self._agendado = True
+            self._condicao.notify()
+
+    def _executar(self) -> None:
+        # Espera antes da próxima tentativa após falhas seguidas (0 = sem falha)
+        espera = 0.0
+        while True:
+            with self._condicao:
+                while not self._agendado and not self._parar:
+                    self._condicao.wait()
+                if self._parar:
+                    return
+
+                # Aguardar a janela para agrupar alterações em sequência
+                # (ou a espera da repetição, após uma falha)
+                atraso = max(self._janela, espera)
+                limite = time.monotonic() + atraso
+                restante = atraso
+                while restante > 0 and not self._parar:
+                    self._condicao.wait(restante)
+                    restante = limite - time.monotonic()
+                self._agendado = False
+                if self._parar:
+                    return
+
+            try:
+                self._gravar()
+                self.ultimo_erro = None
+                espera = 0.0
+            except Exception as e:
+                # As alterações continuam pendentes; a gravação é repetida mais tarde
+                primeira_falha = self.ultimo_erro is None
+                self.ultimo_erro = e
+                espera = min(espera * 2, ESPERA_MAXIMA_REPETICAO) if espera else ESPERA_INICIAL_REPETICAO
+                print(f"Erro na gravação em segundo plano (nova tentativa em {espera:g} s): {e}")
+                with self._condicao:
+                    self._agendado = True
+                if primeira_falha and self._ao_falhar:
+                    self._ao_falhar(e)
+
+    def parar(self) -> None:
+        """Encerra a thread (a gravação final fica a cargo de quem chama)."""
+        with self._condicao:
+            self._parar = True
+            self._condicao.notify()
+        self._thread.join()
@@ -1,5 +1,18 @@
 """Interface gráfica do Monitor de Liquidez."""
 
-from .main_window import MonitorColetasApp
-from .dialogs import PoolConfigDialog
-from .about_dialog import AboutDialog
\ No newline at end of file
+import importlib
+
+# Importados sob demanda: carregar a janela principal não carrega os diálogos
+_EXPORTS = {
+    'MonitorColetasApp': 'gui.main_window',
+    'PoolConfigDialog': 'gui.dialogs',
+    'AboutDialog': 'gui.about_dialog',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(nome):
+    if nome in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[nome]), nome)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
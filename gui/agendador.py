@@ -0,0 +1,49 @@
+import time
+from typing import Callable, Dict, Set
+
+from PySide6.QtCore import QObject, QTimer
+
+class AgendadorAtualizacao(QObject):
+    """Agrupa as atualizações da interface em uma única passada por volta do event loop.
+
+    Os handlers apenas marcam o que mudou (`marcar('tabela', 'cards')`); as
+    partes marcadas são atualizadas uma vez, na ordem em que foram
+    registradas, quando o event loop fica livre. Várias alterações seguidas
+    resultam em um só redesenho.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._partes: Dict[str, Callable[[], None]] = {}
+        self._pendentes: Set[str] = set()
+        # Estatísticas para medir o ganho do agrupamento
+        self.marcacoes = 0
+        self.execucoes = 0
+        self.ultimo_tempo_ms = 0.0
+
+    def registrar(self, nome: str, atualizar: Callable[[], None]) -> None:
+        """Registra uma parte da interface e a função que a atualiza."""
+        self._partes[nome] = atualizar
+
+    def marcar(self, *nomes: str) -> None:
+        """Marca partes como desatualizadas; a atualização ocorre depois, agrupada."""
+        if not self._pendentes:
+            QTimer.singleShot(0, self.executar)
+        self._pendentes.update(nomes)
+        self.marcacoes += 1
+
+    def executar(self) -> None:
+        """Atualiza imediatamente as partes marcadas."""
+        pendentes, self._pendentes = self._pendentes, set()
+        if not pendentes:
+            return
+
+        inicio = time.perf_counter()
+        for nome, atualizar in self._partes.items():
+            if nome in pendentes:
+                try:
+                    atualizar()
+                except Exception as e:
+                    print(f"Erro ao atualizar {nome}: {e}")
+        self.ultimo_tempo_ms = (time.perf_counter() - inicio) * 1000
+        self.execucoes += 1
@@ -0,0 +1,93 @@
+from typing import Optional
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from core.monitor import MonitorLiquidez
+from utils.datas import ordinal_para_data
+
+class ColetasTableModel(QAbstractTableModel):
+    """Modelo da tabela de coletas da pool ativa.
+
+    Lê diretamente das colunas do `ColetaStore` e formata as células sob
+    demanda, apenas para as linhas visíveis. As alterações são aplicadas no
+    monitor e depois avisadas ao modelo, que sinaliza só as linhas afetadas.
+    """
+
+    COLUNAS = ['Data', 'Dias', 'Valor (USD)', 'Taxa (%)', 'Acumulado (USD)']
+    COLUNA_DIAS = 1
+    COLUNA_ACUMULADO = 4
+
+    def __init__(self, monitor: MonitorLiquidez, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self._dados = monitor.get_dados_pool_ativa()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._dados)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUNAS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+
+        dados = self._dados
+        linha = index.row()
+        if linha >= len(dados):
+            return None
+
+        coluna = index.column()
+        if coluna == 0:
+            return ordinal_para_data(dados.ordinais[linha])
+        if coluna == 1:
+            return str(dados.dias[linha])
+        if coluna == 2:
+            return f"${dados.valores[linha]:.2f}"
+        if coluna == 3:
+            return f"{dados.taxas[linha]:.4f}%"
+        return f"${dados.acumulado_ate(linha):.2f}"
+
+    def headerData(self, secao, orientacao, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientacao == Qt.Horizontal:
+            return self.COLUNAS[secao]
+        return super().headerData(secao, orientacao, role)
+
+    def recarregar(self):
+        """Recarrega toda a tabela (troca de pool, limpeza ou exclusão de pool)."""
+        self.beginResetModel()
+        self._dados = self.monitor.get_dados_pool_ativa()
+        self.endResetModel()
+
+    def coleta_inserida(self, indice: int):
+        """Avisa que uma coleta foi inserida no índice informado."""
+        self.beginInsertRows(QModelIndex(), indice, indice)
+        self.endInsertRows()
+        # A coleta seguinte pode ter os dias alterados; o acumulado muda daí em diante
+        self._linhas_alteradas(indice + 1, indice + 1, self.COLUNA_DIAS)
+        self._acumulado_alterado(indice + 1)
+
+    def coleta_alterada(self, indice_antigo: int, indice_novo: int):
+        """Avisa que uma coleta foi alterada (e possivelmente movida)."""
+        inicio = min(indice_antigo, indice_novo)
+        fim = max(indice_antigo, indice_novo) + 1
+        self._linhas_alteradas(inicio, fim)
+        self._acumulado_alterado(inicio)
+
+    def coleta_removida(self, indice: int):
+        """Avisa que a coleta do índice informado foi removida."""
+        self.beginRemoveRows(QModelIndex(), indice, indice)
+        self.endRemoveRows()
+        self._linhas_alteradas(indice, indice, self.COLUNA_DIAS)
+        self._acumulado_alterado(indice)
+
+    def _linhas_alteradas(self, inicio: int, fim: int, coluna: Optional[int] = None):
+        fim = min(fim, self.rowCount() - 1)
+        if inicio > fim:
+            return
+        primeira = 0 if coluna is None else coluna
+        ultima = self.columnCount() - 1 if coluna is None else coluna
+        self.dataChanged.emit(self.index(inicio, primeira), self.index(fim, ultima), [Qt.DisplayRole])
+
+    def _acumulado_alterado(self, inicio: int):
+        self._linhas_alteradas(inicio, self.rowCount() - 1, self.COLUNA_ACUMULADO)
@@ -1,7 +1,8 @@
 # 3. gui/dialogs.py - Atualizado para múltiplas pools
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                                      QLineEdit, QDoubleSpinBox, QDateEdit, QPushButton,
-                                     QMessageBox, QLabel, QComboBox)
+                                     QMessageBox, QLabel, QComboBox, QPlainTextEdit,
+                                     QFileDialog, QListWidget, QListWidgetItem, QRadioButton)
 from PySide6.QtCore import QDate, Qt
 from PySide6.QtGui import QFont
 
@@ -374,4 +375,221 @@ class EditarColetaDialog(QDialog):
         return {
             'data': data_coleta,
             'valor': self.valor_coleta_edit.value()
-        }
\ No newline at end of file
+        }
+
+class ImportarColetasDialog(QDialog):
+    """Diálogo para registrar várias coletas de uma vez (colar ou abrir CSV)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.coletas = []
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configura a interface do diálogo."""
+        self.setWindowTitle("Importar Coletas")
+        self.setModal(True)
+        self.resize(420, 420)
+
+        # Layout principal
+        layout = QVBoxLayout(self)
+
+        # Título
+        titulo_label = QLabel("Importar Coletas em Lote")
+        titulo_font = QFont()
+        titulo_font.setPointSize(14)
+        titulo_font.setBold(True)
+        titulo_label.setFont(titulo_font)
+        titulo_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(titulo_label)
+
+        instrucoes_label = QLabel(
+            "Cole uma coleta por linha no formato data e valor\n"
+            "(ex.: 15/03/2025;12,50 ou 15/03/2025,12.50), ou abra um arquivo CSV."
+        )
+        instrucoes_label.setWordWrap(True)
+        layout.addWidget(instrucoes_label)
+
+        # Área para colar as coletas (aceita colunas copiadas de planilhas)
+        self.texto_edit = QPlainTextEdit()
+        self.texto_edit.setPlaceholderText("15/03/2025;12,50\n16/03/2025;9,80")
+        self.texto_edit.textChanged.connect(self.atualizar_contagem)
+        layout.addWidget(self.texto_edit)
+
+        self.contagem_label = QLabel("Nenhuma coleta")
+        layout.addWidget(self.contagem_label)
+
+        # Botões
+        botoes_layout = QHBoxLayout()
+
+        self.btn_abrir = QPushButton("Abrir CSV...")
+        self.btn_abrir.clicked.connect(self.abrir_arquivo)
+
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.clicked.connect(self.reject)
+
+        self.btn_confirmar = QPushButton("Importar Coletas")
+        self.btn_confirmar.clicked.connect(self.confirmar)
+        self.btn_confirmar.setDefault(True)
+
+        botoes_layout.addWidget(self.btn_abrir)
+        botoes_layout.addStretch()
+        botoes_layout.addWidget(self.btn_cancelar)
+        botoes_layout.addWidget(self.btn_confirmar)
+
+        layout.addLayout(botoes_layout)
+
+    def abrir_arquivo(self):
+        """Carrega o conteúdo de um arquivo CSV na área de texto."""
+        arquivo, _ = QFileDialog.getOpenFileName(
+            self,
+            "Abrir Coletas",
+            "",
+            "Arquivos CSV (*.csv *.txt)"
+        )
+        if arquivo:
+            try:
+                with open(arquivo, 'r', encoding='utf-8') as file:
+                    self.texto_edit.setPlainText(file.read())
+            except Exception as e:
+                QMessageBox.critical(self, "Erro", f"Erro ao abrir arquivo: {e}")
+
+    def atualizar_contagem(self):
+        """Mostra quantas linhas preenchidas serão importadas."""
+        linhas = [linha for linha in self.texto_edit.toPlainText().splitlines() if linha.strip()]
+        self.contagem_label.setText(f"{len(linhas)} linha(s)" if linhas else "Nenhuma coleta")
+
+    @staticmethod
+    def interpretar_linha(linha):
+        """Separa uma linha em (data, valor); aceita tabulação, ';' ou ','."""
+        for separador in ('\t', ';'):
+            if separador in linha:
+                data, valor = linha.split(separador, 1)
+                break
+        else:
+            if ',' not in linha:
+                raise ValueError("esperado data e valor")
+            data, valor = linha.split(',', 1)
+
+        valor = valor.strip().replace('$', '').replace('USD', '').strip()
+        return data.strip(), float(valor.replace(',', '.'))
+
+    def confirmar(self):
+        """Valida todas as linhas e confirma."""
+        coletas = []
+        for numero, linha in enumerate(self.texto_edit.toPlainText().splitlines(), 1):
+            if not linha.strip():
+                continue
+            # Cabeçalho (ex.: "data;valor") é ignorado
+            if not coletas and not linha.strip()[:1].isdigit():
+                continue
+            try:
+                data, valor = self.interpretar_linha(linha)
+            except ValueError:
+                QMessageBox.warning(self, "Erro", f"Linha {numero} inválida: {linha.strip()}")
+                return
+            if valor <= 0:
+                QMessageBox.warning(self, "Erro", f"Linha {numero}: valor da coleta deve ser maior que zero!")
+                return
+            coletas.append((data, valor))
+
+        if not coletas:
+            QMessageBox.warning(self, "Erro", "Nenhuma coleta para importar!")
+            return
+
+        self.coletas = coletas
+        self.accept()
+
+    def get_coletas(self):
+        """Retorna as coletas (data, valor) validadas."""
+        return self.coletas
+
+
+class ExportarColetasDialog(QDialog):
+    """Diálogo para escolher as pools exportadas e se vão em um arquivo cada ou em um único."""
+
+    def __init__(self, parent=None, pools=None, pool_ativa_id=None):
+        super().__init__(parent)
+        self.pools = pools or []
+        self.pool_ativa_id = pool_ativa_id
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configura a interface do diálogo."""
+        self.setWindowTitle("Exportar Coletas")
+        self.setModal(True)
+        self.resize(420, 380)
+
+        # Layout principal
+        layout = QVBoxLayout(self)
+
+        # Título
+        titulo_label = QLabel("Selecione as pools para exportar:")
+        titulo_font = QFont()
+        titulo_font.setPointSize(12)
+        titulo_font.setBold(True)
+        titulo_label.setFont(titulo_font)
+        layout.addWidget(titulo_label)
+
+        # Lista de pools com caixas de seleção (a pool ativa vem marcada)
+        self.lista_pools = QListWidget()
+        for pool in self.pools:
+            item = QListWidgetItem(pool.get_display_name())
+            item.setData(Qt.UserRole, pool.pool_id)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if pool.pool_id == self.pool_ativa_id else Qt.Unchecked)
+            self.lista_pools.addItem(item)
+        layout.addWidget(self.lista_pools)
+
+        selecao_layout = QHBoxLayout()
+        self.btn_todas = QPushButton("Todas")
+        self.btn_todas.clicked.connect(lambda: self.marcar_todas(Qt.Checked))
+        self.btn_nenhuma = QPushButton("Nenhuma")
+        self.btn_nenhuma.clicked.connect(lambda: self.marcar_todas(Qt.Unchecked))
+        selecao_layout.addWidget(self.btn_todas)
+        selecao_layout.addWidget(self.btn_nenhuma)
+        selecao_layout.addStretch()
+        layout.addLayout(selecao_layout)
+
+        # Modo: um arquivo por pool ou todas em um único CSV
+        self.radio_separados = QRadioButton("Um arquivo CSV por pool")
+        self.radio_separados.setChecked(True)
+        self.radio_combinado = QRadioButton("Um único CSV com todas as pools selecionadas")
+        layout.addWidget(self.radio_separados)
+        layout.addWidget(self.radio_combinado)
+
+        # Botões
+        botoes_layout = QHBoxLayout()
+
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.clicked.connect(self.reject)
+
+        self.btn_confirmar = QPushButton("Exportar")
+        self.btn_confirmar.clicked.connect(self.confirmar)
+        self.btn_confirmar.setDefault(True)
+
+        botoes_layout.addWidget(self.btn_cancelar)
+        botoes_layout.addWidget(self.btn_confirmar)
+
+        layout.addLayout(botoes_layout)
+
+    def marcar_todas(self, estado):
+        """Marca ou desmarca todas as pools."""
+        for indice in range(self.lista_pools.count()):
+            self.lista_pools.item(indice).setCheckState(estado)
+
+    def confirmar(self):
+        """Exige ao menos uma pool selecionada."""
+        if not self.get_pools_selecionadas():
+            QMessageBox.warning(self, "Erro", "Selecione ao menos uma pool para exportar!")
+            return
+        self.accept()
+
+    def get_pools_selecionadas(self):
+        """Retorna os IDs das pools marcadas, na ordem da lista."""
+        itens = (self.lista_pools.item(indice) for indice in range(self.lista_pools.count()))
+        return [item.data(Qt.UserRole) for item in itens if item.checkState() == Qt.Checked]
+
+    def get_combinado(self):
+        """Indica se as pools vão em um único arquivo."""
+        return self.radio_combinado.isChecked()
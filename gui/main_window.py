@@ -1,15 +1,18 @@
+import os
 import sys
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                               QPushButton, QTableWidget, QTableWidgetItem, QLabel,
+                               QPushButton, QTableView, QAbstractItemView, QLabel,
                                QMessageBox, QFileDialog, QComboBox, QFrame, QDialog,
-                               QMenuBar, QMenu, QGridLayout, QSizePolicy)
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QSize
+                               QMenuBar, QMenu, QGridLayout, QSizePolicy, QProgressDialog)
+from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QSize, QThreadPool, Signal
 from PySide6.QtGui import QFont, QIcon, QPalette, QAction
 
-from core.monitor import MonitorLiquidez
-from gui.dialogs import PoolConfigDialog, NovaColetaDialog, SelecionarPoolDialog, EditarColetaDialog
-from gui.about_dialog import AboutDialog
+from core.monitor import ColetaDuplicada, MonitorLiquidez
+from gui.coletas_model import ColetasTableModel
+from gui.agendador import AgendadorAtualizacao
+from gui.tarefas import CarregadorPools
 from utils.icons import get_icon
+from utils.perfil import perfil_inicializacao
 
 # Importar estilos (precisa criar o arquivo utils/styles.py)
 try:
@@ -36,12 +39,78 @@ except ImportError:
 class MonitorColetasApp(QMainWindow):
     """Janela principal da aplicação."""
     
+    # Emitido pela thread de gravação quando uma gravação falha (entregue na thread da interface)
+    erro_gravacao = Signal(str)
+    # Emitido quando uma transação do monitor é desfeita (a pool ativa pode ter voltado atrás)
+    transacao_desfeita = Signal()
+
     def __init__(self):
         super().__init__()
-        self.monitor = MonitorLiquidez()
-        self.setup_ui()
-        self.criar_menu()
+        # Alterações retornam logo; a gravação é feita em segundo plano.
+        # Os dados são carregados depois, em segundo plano (ver iniciar_carregamento)
+        self.erro_gravacao.connect(self.gravacao_falhou)
+        self.transacao_desfeita.connect(self.estado_restaurado)
+        with perfil_inicializacao.medir('MonitorLiquidez()'):
+            self.monitor = MonitorLiquidez(
+                gravacao_assincrona=True, carregar=False,
+                ao_falhar_gravacao=lambda e: self.erro_gravacao.emit(str(e)),
+                ao_desfazer_transacao=self.transacao_desfeita.emit
+            )
+        self.pools_prontas = False
+        with perfil_inicializacao.medir('setup_ui()'):
+            self.setup_ui()
+            self.criar_menu()
+
+        # Partes da interface atualizadas de forma agrupada, uma vez por volta do event loop
+        self.agendador = AgendadorAtualizacao(self)
+        self.agendador.registrar('combo', self.atualizar_combo_pools)
+        self.agendador.registrar('tabela', self.atualizar_tabela)
+        self.agendador.registrar('cards', self.atualizar_cards_estatisticas)
+        self.agendador.registrar('botoes', self.atualizar_botoes)
         self.atualizar_interface()
+        self.iniciar_carregamento()
+
+    def iniciar_carregamento(self):
+        """Carrega pools e coletas em segundo plano; a interface é preenchida aos poucos."""
+        self.pool_tarefas = QThreadPool(self)
+        self.importador = None
+        self.exportador = None
+        self.carregador = CarregadorPools(self.monitor)
+        self.carregador.setAutoDelete(False)
+        self.carregador.sinais.pools_carregadas.connect(self.pools_carregadas)
+        self.carregador.sinais.pool_carregada.connect(self.pool_carregada)
+        self.carregador.sinais.erro.connect(self.erro_carregamento)
+        self.pool_tarefas.start(self.carregador)
+
+    def pools_carregadas(self):
+        """Configuração e totais lidos: combo, cards e botões já podem ser exibidos."""
+        self.pools_prontas = True
+        self.agendador.marcar('combo', 'cards', 'botoes')
+
+    def pool_carregada(self, pool_id):
+        """Coletas de uma pool lidas; atualiza a tabela se for a pool ativa.
+
+        Os cards são sempre atualizados: o resumo da pool pode ter sido corrigido ao carregá-la.
+        """
+        if pool_id == self.monitor.pool_ativa_id:
+            self.agendador.marcar('tabela')
+        self.agendador.marcar('cards')
+
+    def estado_restaurado(self):
+        """Transação desfeita: a tabela relê as coletas restauradas, e o restante é atualizado."""
+        self.agendador.marcar('combo', 'tabela', 'cards', 'botoes')
+
+    def gravacao_falhou(self, mensagem: str):
+        """Avisa que as alterações não puderam ser gravadas (elas seguem pendentes)."""
+        QMessageBox.warning(
+            self, "Erro ao Salvar",
+            f"Não foi possível gravar as alterações: {mensagem}\n\n"
+            "Elas continuam guardadas e a gravação será tentada novamente automaticamente."
+        )
+
+    def erro_carregamento(self, mensagem):
+        """Exibe erros do carregamento em segundo plano."""
+        QMessageBox.critical(self, "Erro", f"Erro ao carregar dados: {mensagem}")
     
     def criar_menu(self):
         """Cria a barra de menu."""
@@ -64,15 +133,42 @@ class MonitorColetasApp(QMainWindow):
         acao_nova_coleta.triggered.connect(self.nova_coleta)
         menu_arquivo.addAction(acao_nova_coleta)
         
+        # Ação Importar Coletas
+        acao_importar = QAction("Importar Coletas", self)
+        acao_importar.setShortcut("Ctrl+I")
+        acao_importar.setStatusTip("Registrar várias coletas de uma vez na pool ativa")
+        acao_importar.triggered.connect(self.importar_coletas)
+        menu_arquivo.addAction(acao_importar)
+
+        # Ação Importar Histórico (arquivo CSV/JSON de exchanges e DEXs)
+        acao_importar_arquivo = QAction("Importar Histórico...", self)
+        acao_importar_arquivo.setShortcut("Ctrl+Shift+I")
+        acao_importar_arquivo.setStatusTip("Importar um histórico CSV/JSON para a pool ativa")
+        acao_importar_arquivo.triggered.connect(self.importar_historico)
+        menu_arquivo.addAction(acao_importar_arquivo)
+
         menu_arquivo.addSeparator()
         
         # Ação Exportar
         acao_exportar = QAction("Exportar CSV", self)
         acao_exportar.setShortcut("Ctrl+E")
-        acao_exportar.setStatusTip("Exportar dados da pool ativa")
+        acao_exportar.setStatusTip("Exportar coletas de uma ou mais pools para CSV")
         acao_exportar.triggered.connect(self.exportar_dados)
         menu_arquivo.addAction(acao_exportar)
         
+        # Ação Exportar Todas as Pools (arquivo colunar: Parquet ou .cfpz)
+        acao_exportar_pools = QAction("Exportar Todas as Pools...", self)
+        acao_exportar_pools.setShortcut("Ctrl+Shift+E")
+        acao_exportar_pools.setStatusTip("Exportar todas as pools e coletas para um único arquivo Parquet/colunar")
+        acao_exportar_pools.triggered.connect(self.exportar_todas_pools)
+        menu_arquivo.addAction(acao_exportar_pools)
+
+        # Ação Importar Pools (arquivo gerado por Exportar Todas as Pools)
+        acao_importar_pools = QAction("Importar Pools...", self)
+        acao_importar_pools.setStatusTip("Importar pools e coletas de um arquivo Parquet/colunar")
+        acao_importar_pools.triggered.connect(self.importar_pools)
+        menu_arquivo.addAction(acao_importar_pools)
+
         menu_arquivo.addSeparator()
         
         # Ação Sair
@@ -121,6 +217,8 @@ class MonitorColetasApp(QMainWindow):
     
     def mostrar_sobre(self):
         """Mostra o diálogo sobre a aplicação."""
+        # Diálogos são importados no primeiro uso, fora da inicialização
+        from gui.about_dialog import AboutDialog
         dialog = AboutDialog(self)
         dialog.exec()
     
@@ -131,7 +229,10 @@ class MonitorColetasApp(QMainWindow):
         <table style="border-collapse: collapse; width: 100%;">
         <tr><td style="padding: 5px; font-weight: bold;">Ctrl+N</td><td style="padding: 5px;">Nova Pool</td></tr>
         <tr><td style="padding: 5px; font-weight: bold;">Ctrl+R</td><td style="padding: 5px;">Nova Coleta</td></tr>
+        <tr><td style="padding: 5px; font-weight: bold;">Ctrl+I</td><td style="padding: 5px;">Importar Coletas</td></tr>
+        <tr><td style="padding: 5px; font-weight: bold;">Ctrl+Shift+I</td><td style="padding: 5px;">Importar Histórico</td></tr>
         <tr><td style="padding: 5px; font-weight: bold;">Ctrl+E</td><td style="padding: 5px;">Exportar CSV</td></tr>
+        <tr><td style="padding: 5px; font-weight: bold;">Ctrl+Shift+E</td><td style="padding: 5px;">Exportar Todas as Pools</td></tr>
         <tr><td style="padding: 5px; font-weight: bold;">Ctrl+Alt+E</td><td style="padding: 5px;">Editar Pool Ativa</td></tr>
         <tr><td style="padding: 5px; font-weight: bold;">Ctrl+Alt+D</td><td style="padding: 5px;">Excluir Pool</td></tr>
         <tr><td style="padding: 5px; font-weight: bold;">F1</td><td style="padding: 5px;">Sobre</td></tr>
@@ -398,6 +499,26 @@ class MonitorColetasApp(QMainWindow):
         """)
         acoes_layout.addWidget(self.btn_nova_coleta)
         
+        self.btn_importar = QPushButton("Importar")
+        self.btn_importar.setIcon(get_icon("plus"))
+        self.btn_importar.setIconSize(QSize(18, 18))
+        self.btn_importar.clicked.connect(self.importar_coletas)
+        self.btn_importar.setStyleSheet("""
+            QPushButton {
+                background-color: #0EA5E9;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                padding: 10px 16px;
+                font-weight: 600;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #0284C7;
+            }
+        """)
+        acoes_layout.addWidget(self.btn_importar)
+
         acoes_layout.addStretch()
         
         self.btn_exportar = QPushButton("Exportar CSV")
@@ -771,29 +892,6 @@ class MonitorColetasApp(QMainWindow):
         
         layout.addWidget(stats_frame)
 
-    def forcar_atualizacao_visual(self):
-        """Força atualização visual dos cards."""
-        if hasattr(self, 'card_total_coletas'):
-            self.card_total_coletas.repaint()
-            self.card_total_coletas.update()
-            
-        if hasattr(self, 'card_total_acumulado'):
-            self.card_total_acumulado.repaint()
-            self.card_total_acumulado.update()
-            
-        if hasattr(self, 'card_taxa_acumulada'):
-            self.card_taxa_acumulada.repaint() 
-            self.card_taxa_acumulada.update()
-            
-        if hasattr(self, 'card_media_coleta'):
-            self.card_media_coleta.repaint()
-            self.card_media_coleta.update()
-
-        if hasattr(self, 'card_total_geral'):
-            self.card_total_geral.repaint()
-            self.card_total_geral.update()
-
-
     def criar_secao_pools(self, layout):
         """Cria a seção de controle de pools em card."""
         pools_card = QFrame()
@@ -887,6 +985,13 @@ class MonitorColetasApp(QMainWindow):
         self.btn_nova_coleta.setStyleSheet(ModernStyles.get_button_style('success', 'large'))
         acoes_layout.addWidget(self.btn_nova_coleta)
 
+        self.btn_importar = QPushButton("Importar")
+        self.btn_importar.setIcon(get_icon("plus"))
+        self.btn_importar.setIconSize(QSize(18, 18))
+        self.btn_importar.clicked.connect(self.importar_coletas)
+        self.btn_importar.setStyleSheet(ModernStyles.get_button_style('secondary', 'large'))
+        acoes_layout.addWidget(self.btn_importar)
+
         acoes_layout.addStretch()
 
         self.btn_exportar = QPushButton("Exportar CSV")
@@ -922,9 +1027,10 @@ class MonitorColetasApp(QMainWindow):
         table_layout = QVBoxLayout(table_card)
         table_layout.setContentsMargins(0, 0, 0, 0)
         
-        self.tabela = QTableWidget()
-        self.tabela.setColumnCount(5)
-        self.tabela.setHorizontalHeaderLabels(['Data', 'Dias', 'Valor (USD)', 'Taxa (%)', 'Acumulado (USD)'])
+        # Tabela virtualizada: as células são formatadas sob demanda pelo modelo
+        self.modelo_coletas = ColetasTableModel(self.monitor, self)
+        self.tabela = QTableView()
+        self.tabela.setModel(self.modelo_coletas)
         
         # Configurar largura das colunas
         header = self.tabela.horizontalHeader()
@@ -935,7 +1041,7 @@ class MonitorColetasApp(QMainWindow):
         self.tabela.setColumnWidth(3, 100)
         
         # Habilitar seleção de linhas inteiras
-        self.tabela.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabela.setSelectionBehavior(QAbstractItemView.SelectRows)
         
         # Habilitar menu contextual
         self.tabela.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -952,6 +1058,12 @@ class MonitorColetasApp(QMainWindow):
         self.combo_pools.clear()
         self.combo_pools.blockSignals(True)
 
+        if not self.pools_prontas:
+            self.combo_pools.addItem("Carregando pools...")
+            self.combo_pools.setEnabled(False)
+            self.combo_pools.blockSignals(False)
+            return
+
         pools = self.monitor.get_lista_pools()
         if not pools:
             self.combo_pools.addItem("Nenhuma pool configurada")
@@ -976,49 +1088,42 @@ class MonitorColetasApp(QMainWindow):
         """Chamado quando a pool selecionada muda."""
         if self.combo_pools.currentData():
             self.monitor.definir_pool_ativa(self.combo_pools.currentData())
-            self.atualizar_tabela()
-            self.atualizar_cards_estatisticas()
+            self.agendador.marcar('tabela', 'cards')
     
     def atualizar_interface(self):
-        """Atualiza toda a interface."""
-        self.atualizar_combo_pools()
-        self.atualizar_tabela()
-        self.atualizar_cards_estatisticas()
-        self.atualizar_botoes()
+        """Marca toda a interface para atualização."""
+        self.agendador.marcar('combo', 'tabela', 'cards', 'botoes')
     
     def atualizar_botoes(self):
         """Atualiza o estado dos botões."""
         tem_pools = len(self.monitor.pools) > 0
         tem_pool_ativa = self.monitor.get_pool_ativa() is not None
         
+        self.btn_nova_pool.setEnabled(self.pools_prontas)
         self.btn_editar_pool.setEnabled(tem_pool_ativa)
         self.btn_excluir_pool.setEnabled(tem_pools)
         self.btn_nova_coleta.setEnabled(tem_pool_ativa)
+        self.btn_importar.setEnabled(tem_pool_ativa)
         self.btn_exportar.setEnabled(tem_pool_ativa)
         self.btn_limpar.setEnabled(tem_pool_ativa)
     
     def atualizar_tabela(self):
-        """Atualiza a tabela com os dados da pool ativa."""
-        dados = self.monitor.get_dados_pool_ativa()
-        
-        self.tabela.setRowCount(len(dados))
-        
-        total_acumulado = 0
-        for i, coleta in enumerate(dados):
-            total_acumulado += coleta.coleta_usd
-            
-            self.tabela.setItem(i, 0, QTableWidgetItem(coleta.data))
-            self.tabela.setItem(i, 1, QTableWidgetItem(str(coleta.dias)))
-            self.tabela.setItem(i, 2, QTableWidgetItem(f"${coleta.coleta_usd:.2f}"))
-            self.tabela.setItem(i, 3, QTableWidgetItem(f"{coleta.taxa_percentual:.4f}%"))
-            self.tabela.setItem(i, 4, QTableWidgetItem(f"${total_acumulado:.2f}"))
+        """Recarrega a tabela com os dados da pool ativa."""
+        self.modelo_coletas.recarregar()
     
     def atualizar_cards_estatisticas(self):
-        """Atualiza os cards de estatísticas com força de repaint."""
+        """Atualiza os textos dos cards de estatísticas (o Qt redesenha ao voltar ao event loop)."""
+
+        if not self.pools_prontas:
+            # Marcadores enquanto os dados são carregados
+            for card in ('card_total_coletas', 'card_total_acumulado', 'card_taxa_acumulada',
+                         'card_media_coleta', 'card_total_geral'):
+                if hasattr(self, card) and hasattr(getattr(self, card), 'valor_label'):
+                    getattr(self, card).valor_label.setText("...")
+            return
         
         try:
-            dados = self.monitor.get_dados_pool_ativa()
-            total_coletas = len(dados)
+            total_coletas = self.monitor.contar_coletas_pool_ativa()
             total_acumulado = self.monitor.calcular_total_acumulado_pool_ativa()
             taxa_acumulada = self.monitor.calcular_taxa_acumulada_pool_ativa()
             
@@ -1031,28 +1136,19 @@ class MonitorColetasApp(QMainWindow):
             # Atualizar cards
             if hasattr(self, 'card_total_coletas') and hasattr(self.card_total_coletas, 'valor_label'):
                 self.card_total_coletas.valor_label.setText(str(total_coletas))
-                self.card_total_coletas.valor_label.repaint()  # ← FORÇAR REPAINT
                 
             if hasattr(self, 'card_total_acumulado') and hasattr(self.card_total_acumulado, 'valor_label'):
                 self.card_total_acumulado.valor_label.setText(f"${total_acumulado:.2f}")
-                self.card_total_acumulado.valor_label.repaint()  # ← FORÇAR REPAINT
                 
             if hasattr(self, 'card_taxa_acumulada') and hasattr(self.card_taxa_acumulada, 'valor_label'):
                 self.card_taxa_acumulada.valor_label.setText(f"{taxa_acumulada:.2f}%")
-                self.card_taxa_acumulada.valor_label.repaint()  # ← FORÇAR REPAINT
                 
             if hasattr(self, 'card_media_coleta') and hasattr(self.card_media_coleta, 'valor_label'):
                 self.card_media_coleta.valor_label.setText(f"${media_coleta:.2f}")
-                self.card_media_coleta.valor_label.repaint()  # ← FORÇAR REPAINT
 
             if hasattr(self, 'card_total_geral') and hasattr(self.card_total_geral, 'valor_label'):
                 self.card_total_geral.valor_label.setText(f"${total_geral:.2f}")
-                self.card_total_geral.valor_label.repaint()
 
-            # Forçar atualização visual geral
-            self.forcar_atualizacao_visual()
-            
-            
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -1061,6 +1157,7 @@ class MonitorColetasApp(QMainWindow):
     
     def nova_pool(self):
         """Abre diálogo para criar nova pool."""
+        from gui.dialogs import PoolConfigDialog
         dialog = PoolConfigDialog(self, modo="criar")
         if dialog.exec() == QDialog.Accepted:
             dados = dialog.get_dados()
@@ -1084,6 +1181,7 @@ class MonitorColetasApp(QMainWindow):
             QMessageBox.warning(self, "Aviso", "Nenhuma pool selecionada!")
             return
         
+        from gui.dialogs import PoolConfigDialog
         dialog = PoolConfigDialog(self, pool_config, modo="editar")
         if dialog.exec() == QDialog.Accepted:
             dados = dialog.get_dados()
@@ -1107,6 +1205,7 @@ class MonitorColetasApp(QMainWindow):
             QMessageBox.warning(self, "Aviso", "Nenhuma pool disponível para exclusão!")
             return
         
+        from gui.dialogs import SelecionarPoolDialog
         dialog = SelecionarPoolDialog(self, pools)
         if dialog.exec() == QDialog.Accepted:
             pool_id = dialog.get_pool_selecionada()
@@ -1124,39 +1223,226 @@ class MonitorColetasApp(QMainWindow):
             QMessageBox.warning(self, "Aviso", "Configure uma pool antes de registrar coletas!")
             return
         
+        from gui.dialogs import NovaColetaDialog
         dialog = NovaColetaDialog(self)
         if dialog.exec() == QDialog.Accepted:
             dados = dialog.get_dados()
             try:
-                self.monitor.registrar_nova_coleta(dados['data'], dados['valor'])
-                self.atualizar_tabela()
-                self.atualizar_cards_estatisticas()
+                try:
+                    coleta = self.monitor.registrar_nova_coleta(dados['data'], dados['valor'], permitir_duplicada=False)
+                except ColetaDuplicada as e:
+                    resposta = QMessageBox.question(
+                        self,
+                        "Coleta Duplicada",
+                        f"{e}.\n\nDeseja registrá-la mesmo assim?",
+                        QMessageBox.Yes | QMessageBox.No,
+                        QMessageBox.No
+                    )
+                    if resposta != QMessageBox.Yes:
+                        return
+                    coleta = self.monitor.registrar_nova_coleta(dados['data'], dados['valor'])
+                if coleta:
+                    indice = self.monitor.get_dados_pool_ativa().localizar(coleta.data_ordinal, coleta.coleta_id)
+                    self.modelo_coletas.coleta_inserida(indice)
+                self.agendador.marcar('cards')
                 QMessageBox.information(self, "Sucesso", "Coleta registrada com sucesso!")
             except Exception as e:
                 QMessageBox.critical(self, "Erro", f"Erro ao registrar coleta: {e}")
     
-    def exportar_dados(self):
-        """Exporta dados para CSV."""
-        if not self.monitor.get_pool_ativa():
-            QMessageBox.warning(self, "Aviso", "Nenhuma pool ativa para exportar!")
+    def importar_coletas(self):
+        """Abre diálogo para registrar várias coletas de uma vez."""
+        pool_config = self.monitor.get_pool_ativa()
+        if not pool_config:
+            QMessageBox.warning(self, "Aviso", "Configure uma pool antes de registrar coletas!")
             return
         
+        from gui.dialogs import ImportarColetasDialog
+        dialog = ImportarColetasDialog(self)
+        if dialog.exec() == QDialog.Accepted:
+            try:
+                # Uma única inserção, recálculo de dias e gravação para todo o lote
+                coletas = dialog.get_coletas()
+                total = self.monitor.registrar_coletas_em_lote(pool_config.pool_id, coletas, ignorar_duplicadas=True)
+                self.agendador.marcar('tabela', 'cards')
+                mensagem = f"{total} coleta(s) importada(s) com sucesso!"
+                if total < len(coletas):
+                    mensagem += f"\n{len(coletas) - total} coleta(s) já existente(s) ignorada(s)."
+                QMessageBox.information(self, "Sucesso", mensagem)
+            except Exception as e:
+                QMessageBox.critical(self, "Erro", f"Erro ao importar coletas: {e}")
+
+    def importar_historico(self):
+        """Importa um histórico CSV/JSON em segundo plano, com progresso e cancelamento."""
         pool_config = self.monitor.get_pool_ativa()
-        nome_sugerido = f"coletas_{pool_config.nome.replace(' ', '_')}.csv"
+        if not pool_config:
+            QMessageBox.warning(self, "Aviso", "Configure uma pool antes de registrar coletas!")
+            return
+
+        arquivo, _ = QFileDialog.getOpenFileName(
+            self,
+            "Importar Histórico",
+            "",
+            "Históricos (*.csv *.json *.jsonl *.txt);;Todos os arquivos (*)"
+        )
+        if not arquivo:
+            return
+
+        from gui.tarefas import ImportadorArquivo
+        self.progresso_importacao = QProgressDialog("Importando coletas...", "Cancelar", 0, 100, self)
+        self.progresso_importacao.setWindowTitle("Importar Histórico")
+        self.progresso_importacao.setWindowModality(Qt.WindowModal)
+        self.progresso_importacao.setMinimumDuration(300)
+
+        self.importador = ImportadorArquivo(self.monitor, pool_config.pool_id, arquivo)
+        self.importador.setAutoDelete(False)
+        self.importador.sinais.progresso.connect(self.progresso_importacao.setValue)
+        self.importador.sinais.concluido.connect(self.importacao_concluida)
+        self.importador.sinais.cancelado.connect(self.importacao_encerrada)
+        self.importador.sinais.erro.connect(self.importacao_falhou)
+        self.progresso_importacao.canceled.connect(self.importador.cancelar)
+        self.pool_tarefas.start(self.importador)
+
+    def importacao_encerrada(self):
+        """Fecha o progresso da importação (concluída, cancelada ou com erro)."""
+        self.progresso_importacao.canceled.disconnect()
+        self.progresso_importacao.close()
+        self.importador = None
+
+    def importacao_concluida(self, lote):
+        """Arquivo lido: registra as coletas (na thread da interface) e atualiza a tabela e os cards."""
+        self.importacao_encerrada()
+        from core.importador import registrar_lote
+        try:
+            resultado = registrar_lote(self.monitor, lote)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao importar histórico: {e}")
+            return
+        self.agendador.marcar('tabela', 'cards')
+        QMessageBox.information(self, "Sucesso", f"Importação concluída: {resultado}")
+
+    def importacao_falhou(self, mensagem: str):
+        """Mostra o erro da importação (a pool não foi alterada)."""
+        self.importacao_encerrada()
+        QMessageBox.critical(self, "Erro", f"Erro ao importar histórico: {mensagem}")
+
+    def exportar_dados(self):
+        """Exporta as coletas das pools escolhidas para CSV em segundo plano, com progresso e cancelamento."""
+        pools = self.monitor.get_lista_pools()
+        if not pools:
+            QMessageBox.warning(self, "Aviso", "Nenhuma pool para exportar!")
+            return
+
+        from gui.dialogs import ExportarColetasDialog
+        dialog = ExportarColetasDialog(self, pools, self.monitor.pool_ativa_id)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        pool_ids = dialog.get_pools_selecionadas()
+        combinado = dialog.get_combinado()
+
+        if combinado or len(pool_ids) == 1:
+            if combinado:
+                nome_sugerido = "coletas_pools.csv"
+            else:
+                from core.exportacao import nome_arquivo_pool
+                nome_sugerido = nome_arquivo_pool(self.monitor.pools[pool_ids[0]])
+            destino, _ = QFileDialog.getSaveFileName(
+                self,
+                "Exportar Dados",
+                nome_sugerido,
+                "Arquivos CSV (*.csv)"
+            )
+        else:
+            # Um arquivo por pool, todos no diretório escolhido
+            destino = QFileDialog.getExistingDirectory(self, "Exportar Dados - Escolha o diretório")
+        if not destino:
+            return
+
+        try:
+            # Garantir que o disco reflete o que será exportado
+            self.monitor.flush()
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao exportar dados: {e}")
+            return
         
+        from gui.tarefas import ExportadorColetas
+        self.progresso_exportacao = QProgressDialog("Exportando coletas...", "Cancelar", 0, 100, self)
+        self.progresso_exportacao.setWindowTitle("Exportar Dados")
+        self.progresso_exportacao.setWindowModality(Qt.WindowModal)
+        self.progresso_exportacao.setMinimumDuration(300)
+
+        self.exportador = ExportadorColetas(self.monitor, pool_ids, destino, combinado)
+        self.exportador.setAutoDelete(False)
+        self.exportador.sinais.progresso.connect(self.progresso_exportacao.setValue)
+        self.exportador.sinais.concluido.connect(self.exportacao_concluida)
+        self.exportador.sinais.cancelado.connect(self.exportacao_encerrada)
+        self.exportador.sinais.erro.connect(self.exportacao_falhou)
+        self.progresso_exportacao.canceled.connect(self.exportador.cancelar)
+        self.pool_tarefas.start(self.exportador)
+
+    def exportacao_encerrada(self):
+        """Fecha o progresso da exportação (concluída, cancelada ou com erro)."""
+        self.progresso_exportacao.canceled.disconnect()
+        self.progresso_exportacao.close()
+        self.exportador = None
+
+    def exportacao_concluida(self, resultado):
+        """Arquivos gravados: informa onde ficaram."""
+        self.exportacao_encerrada()
+        destino = resultado.arquivos[0] if len(resultado.arquivos) == 1 else os.path.dirname(resultado.arquivos[0])
+        QMessageBox.information(self, "Sucesso", f"Exportação concluída: {resultado}\n{destino}")
+
+    def exportacao_falhou(self, mensagem: str):
+        """Mostra o erro da exportação (nenhum arquivo existente foi alterado)."""
+        self.exportacao_encerrada()
+        QMessageBox.critical(self, "Erro", f"Erro ao exportar dados: {mensagem}")
+
+    def _filtro_arquivos_colunares(self) -> str:
+        from core.exportacao_colunar import pa
+        filtro = "Arquivos colunares (*.cfpz)"
+        if pa is not None:
+            filtro = f"Arquivos Parquet (*.parquet);;{filtro}"
+        return filtro
+
+    def exportar_todas_pools(self):
+        """Exporta todas as pools para um único arquivo Parquet (ou .cfpz sem o pyarrow)."""
+        if not self.monitor.get_lista_pools():
+            QMessageBox.warning(self, "Aviso", "Nenhuma pool para exportar!")
+            return
+
+        from core.exportacao_colunar import EXTENSOES, exportar_pools, formato_padrao
         arquivo, _ = QFileDialog.getSaveFileName(
             self,
-            "Exportar Dados",
-            nome_sugerido,
-            "Arquivos CSV (*.csv)"
+            "Exportar Todas as Pools",
+            f"pools{EXTENSOES[formato_padrao()]}",
+            self._filtro_arquivos_colunares()
+        )
+
+        if arquivo:
+            try:
+                total = exportar_pools(self.monitor, arquivo)
+                QMessageBox.information(self, "Sucesso", f"{total} coleta(s) exportada(s) para: {arquivo}")
+            except Exception as e:
+                QMessageBox.critical(self, "Erro", f"Erro ao exportar pools: {e}")
+
+    def importar_pools(self):
+        """Importa pools e coletas de um arquivo gerado por Exportar Todas as Pools."""
+        arquivo, _ = QFileDialog.getOpenFileName(
+            self,
+            "Importar Pools",
+            "",
+            f"{self._filtro_arquivos_colunares()};;Todos os arquivos (*)"
         )
         
         if arquivo:
+            from core.exportacao_colunar import importar_pools
             try:
-                self.monitor.exportar_dados_pool_ativa(arquivo)
-                QMessageBox.information(self, "Sucesso", f"Dados exportados para: {arquivo}")
+                resultado = importar_pools(self.monitor, arquivo)
+                if not self.monitor.get_pool_ativa() and self.monitor.get_lista_pools():
+                    self.monitor.definir_pool_ativa(self.monitor.get_lista_pools()[0].pool_id)
+                self.atualizar_interface()
+                QMessageBox.information(self, "Sucesso", f"Importação concluída: {resultado}")
             except Exception as e:
-                QMessageBox.critical(self, "Erro", f"Erro ao exportar dados: {e}")
+                QMessageBox.critical(self, "Erro", f"Erro ao importar pools: {e}")
     
     def limpar_dados(self):
         """Limpa todos os dados da pool ativa."""
@@ -1176,15 +1462,14 @@ class MonitorColetasApp(QMainWindow):
         if resposta == QMessageBox.Yes:
             try:
                 self.monitor.limpar_dados_pool_ativa()
-                self.atualizar_tabela()
-                self.atualizar_cards_estatisticas()
+                self.agendador.marcar('tabela', 'cards')
                 QMessageBox.information(self, "Sucesso", "Dados limpos com sucesso!")
             except Exception as e:
                 QMessageBox.critical(self, "Erro", f"Erro ao limpar dados: {e}")
     
     def mostrar_menu_contextual(self, position):
         """Mostra menu contextual ao clicar com botão direito na tabela."""
-        if not self.tabela.itemAt(position):
+        if not self.tabela.indexAt(position).isValid():
             return
         
         linha_selecionada = self.tabela.rowAt(position.y())
@@ -1221,14 +1506,15 @@ class MonitorColetasApp(QMainWindow):
         coleta = dados[linha_index]
         
         # Usar o mesmo diálogo de nova coleta, mas preenchido
+        from gui.dialogs import EditarColetaDialog
         dialog = EditarColetaDialog(self, coleta)
         if dialog.exec() == QDialog.Accepted:
             novos_dados = dialog.get_dados()
             try:
                 # Atualizar a coleta
-                self.monitor.atualizar_coleta(linha_index, novos_dados['data'], novos_dados['valor'])
-                self.atualizar_tabela()
-                self.atualizar_cards_estatisticas()
+                novo_index = self.monitor.atualizar_coleta(linha_index, novos_dados['data'], novos_dados['valor'])
+                self.modelo_coletas.coleta_alterada(linha_index, novo_index)
+                self.agendador.marcar('cards')
                 QMessageBox.information(self, "Sucesso", "Coleta atualizada com sucesso!")
             except Exception as e:
                 QMessageBox.critical(self, "Erro", f"Erro ao atualizar coleta: {e}")
@@ -1253,8 +1539,8 @@ class MonitorColetasApp(QMainWindow):
         if resposta == QMessageBox.Yes:
             try:
                 self.monitor.excluir_coleta(linha_index)
-                self.atualizar_tabela()
-                self.atualizar_cards_estatisticas()
+                self.modelo_coletas.coleta_removida(linha_index)
+                self.agendador.marcar('cards')
                 QMessageBox.information(self, "Sucesso", "Coleta excluída com sucesso!")
             except Exception as e:
                 QMessageBox.critical(self, "Erro", f"Erro ao excluir coleta: {e}")
@@ -1298,6 +1584,40 @@ class MonitorColetasApp(QMainWindow):
 
     def closeEvent(self, event):
         """Chamado quando a janela vai fechar."""
+        # Interromper o carregamento em segundo plano antes de gravar
+        self.carregador.cancelar()
+        if self.importador:
+            self.importador.cancelar()
+        if self.exportador:
+            self.exportador.cancelar()
+        self.pool_tarefas.waitForDone()
+
+        # Gravar alterações pendentes; se falhar, o usuário decide antes de perder dados
+        while True:
+            try:
+                self.monitor.flush()
+                break
+            except Exception as e:
+                resposta = QMessageBox.critical(
+                    self, "Erro ao Salvar",
+                    f"Não foi possível gravar as alterações pendentes: {e}\n\n"
+                    "Sair agora descarta essas alterações.",
+                    QMessageBox.Retry | QMessageBox.Discard | QMessageBox.Cancel,
+                    QMessageBox.Retry
+                )
+                if resposta == QMessageBox.Cancel:
+                    # A janela continua aberta; a gravação em segundo plano segue tentando
+                    event.ignore()
+                    return
+                if resposta == QMessageBox.Discard:
+                    break
+
+        # Encerrar a gravação em segundo plano e fechar o armazenamento
+        try:
+            self.monitor.fechar()
+        except Exception as e:
+            print(f"Erro ao salvar dados pendentes: {e}")
+
         # Salvar estado da janela antes de fechar (descomente para ativar)
         # self.save_window_state()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,152 @@
+from typing import List, Optional
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from core.exportacao import ExportacaoCancelada, exportar_coletas
+from core.importador import ConfiguracaoImportacao, ImportacaoCancelada, ler_arquivo
+from core.monitor import MonitorLiquidez
+
+class SinaisCarregamento(QObject):
+    """Sinais emitidos pelo carregamento em segundo plano (entregues na thread da interface)."""
+
+    pools_carregadas = Signal()
+    pool_carregada = Signal(str)
+    concluido = Signal()
+    erro = Signal(str)
+
+
+class CarregadorPools(QRunnable):
+    """Carrega as pools em uma thread do QThreadPool.
+
+    Primeiro lê a configuração e os totais (suficientes para o combo e os
+    cards), depois as coletas da pool ativa e, por fim, as das demais pools,
+    emitindo um sinal a cada etapa para a interface ser preenchida aos poucos.
+    """
+
+    def __init__(self, monitor: MonitorLiquidez):
+        super().__init__()
+        self.monitor = monitor
+        self.sinais = SinaisCarregamento()
+        self._cancelado = False
+
+    def cancelar(self) -> None:
+        """Interrompe o carregamento antes da próxima pool."""
+        self._cancelado = True
+
+    def run(self):
+        try:
+            self.monitor.carregar()
+            self.sinais.pools_carregadas.emit()
+
+            # A pool ativa vem primeiro; as demais ficam prontas para a troca de pool
+            ativa = self.monitor.pool_ativa_id
+            pools = [pool.pool_id for pool in self.monitor.get_lista_pools()]
+            if ativa in pools:
+                pools.remove(ativa)
+                pools.insert(0, ativa)
+
+            # Com carregamento paralelo configurado, as pools são lidas simultaneamente
+            # e entregues nesta mesma ordem
+            self.monitor.carregar_dados_pools(
+                pools,
+                ao_carregar=self.sinais.pool_carregada.emit,
+                cancelado=lambda: self._cancelado
+            )
+        except Exception as e:
+            self.sinais.erro.emit(str(e))
+        finally:
+            self.sinais.concluido.emit()
+
+
+class SinaisImportacao(QObject):
+    """Sinais emitidos pela importação de um arquivo em segundo plano."""
+
+    progresso = Signal(int)  # percentual do arquivo já lido
+    concluido = Signal(object)
+    cancelado = Signal()
+    erro = Signal(str)
+
+
+class ImportadorArquivo(QRunnable):
+    """Lê um histórico CSV/JSON para uma pool em uma thread do QThreadPool.
+
+    A leitura do arquivo não bloqueia a interface e não altera a pool:
+    `concluido` entrega o lote lido, que a janela registra na thread
+    principal (`registrar_lote`); nada muda se a importação for cancelada.
+    """
+
+    def __init__(self, monitor: MonitorLiquidez, pool_id: str, caminho: str,
+                 config: Optional[ConfiguracaoImportacao] = None):
+        super().__init__()
+        self.monitor = monitor
+        self.pool_id = pool_id
+        self.caminho = caminho
+        self.config = config
+        self.sinais = SinaisImportacao()
+        self._cancelado = False
+
+    def cancelar(self) -> None:
+        """Interrompe a importação no próximo ponto de verificação."""
+        self._cancelado = True
+
+    def _informar_progresso(self, lidos: int, total: int) -> None:
+        self.sinais.progresso.emit(lidos * 100 // total if total else 0)
+
+    def run(self):
+        try:
+            lote = ler_arquivo(
+                self.monitor, self.pool_id, self.caminho, self.config,
+                progresso=self._informar_progresso,
+                cancelado=lambda: self._cancelado
+            )
+            self.sinais.concluido.emit(lote)
+        except ImportacaoCancelada:
+            self.sinais.cancelado.emit()
+        except Exception as e:
+            self.sinais.erro.emit(str(e))
+
+
+class SinaisExportacao(QObject):
+    """Sinais emitidos pela exportação de coletas em segundo plano."""
+
+    progresso = Signal(int)  # percentual das coletas já gravadas
+    concluido = Signal(object)
+    cancelado = Signal()
+    erro = Signal(str)
+
+
+class ExportadorColetas(QRunnable):
+    """Exporta as coletas de várias pools para CSV em uma thread do QThreadPool.
+
+    As linhas são gravadas em fluxo em arquivos temporários, que só
+    substituem os destinos ao final; cancelada, a exportação não altera nada.
+    """
+
+    def __init__(self, monitor: MonitorLiquidez, pool_ids: List[str], destino: str, combinado: bool):
+        super().__init__()
+        self.monitor = monitor
+        self.pool_ids = pool_ids
+        self.destino = destino
+        self.combinado = combinado
+        self.sinais = SinaisExportacao()
+        self._cancelado = False
+
+    def cancelar(self) -> None:
+        """Interrompe a exportação no próximo ponto de verificação."""
+        self._cancelado = True
+
+    def _informar_progresso(self, gravadas: int, total: int) -> None:
+        self.sinais.progresso.emit(gravadas * 100 // total if total else 0)
+
+    def run(self):
+        try:
+            resultado = exportar_coletas(
+                self.monitor, self.pool_ids, self.destino, self.combinado,
+                progresso=self._informar_progresso,
+                cancelado=lambda: self._cancelado
+            )
+            self.sinais.concluido.emit(resultado)
+        except ExportacaoCancelada:
+            self.sinais.cancelado.emit()
+        except Exception as e:
+            self.sinais.erro.emit(str(e))
@@ -1,6 +1,8 @@
+import multiprocessing
 import sys
 import os
-from time import sleep
+
+from utils.perfil import perfil_inicializacao
 
 def configurar_macos():
     """Configuração específica para macOS"""
@@ -35,17 +37,24 @@ def configurar_macos():
 def main():
     """Função principal - baseada exatamente no que funcionou no debug"""
     
+    # --startup-profile imprime o tempo de cada etapa da inicialização
+    if '--startup-profile' in sys.argv:
+        sys.argv.remove('--startup-profile')
+        perfil_inicializacao.ativar()
+
     try:
         # Configuração macOS
         configurar_macos()
         
         # Imports Qt
-        from PySide6.QtWidgets import QApplication, QSplashScreen
-        from PySide6.QtCore import Qt
-        from PySide6.QtGui import QPixmap, QColor, QIcon
+        with perfil_inicializacao.medir('import PySide6'):
+            from PySide6.QtWidgets import QApplication, QSplashScreen
+            from PySide6.QtCore import Qt
+            from PySide6.QtGui import QPixmap, QColor, QIcon
         
         # Criar aplicação
-        app = QApplication(sys.argv)
+        with perfil_inicializacao.medir('QApplication'):
+            app = QApplication(sys.argv)
         app.setApplicationName("Collect Fee Pools")
         app.setApplicationDisplayName("Collect Fee Pools")
         app.setApplicationVersion("2.0.0")
@@ -85,19 +94,19 @@ def main():
         splash.show()
         app.processEvents()
         
-        sleep(1.5)
+        # Importar e criar aplicação principal (o splash acompanha o progresso real)
+        with perfil_inicializacao.medir('import gui.main_window'):
+            from gui.main_window import MonitorColetasApp
         
-        # Importar e criar aplicação principal
         splash.showMessage(
             "Collect Fee Pools v2.0\n\nInicializando interface...",
             Qt.AlignCenter,
             QColor(255, 255, 255)
         )
         app.processEvents()
-        sleep(1.5)
         
-        from gui.main_window import MonitorColetasApp
-        main_window = MonitorColetasApp()
+        with perfil_inicializacao.medir('MonitorColetasApp()'):
+            main_window = MonitorColetasApp()
         
         # Configurar janela
         main_window.setWindowTitle("Collect Fee Pools")
@@ -108,18 +117,10 @@ def main():
                 main_window.setWindowIcon(QIcon(icon_path))
                 break
         
-        # Finalizar splash
-        splash.showMessage(
-            "Collect Fee Pools v2.0\n\nPronto para usar!",
-            Qt.AlignCenter,
-            QColor(255, 255, 255)
-        )
-        app.processEvents()
-        sleep(1)
-        
-        # Mostrar aplicação
+        # Mostrar aplicação assim que estiver pronta
         splash.finish(main_window)
-        main_window.show()
+        with perfil_inicializacao.medir('show()'):
+            main_window.show()
         
         # Ativação macOS
         if sys.platform == "darwin":
@@ -127,6 +128,8 @@ def main():
             main_window.activateWindow()
             app.processEvents()
         
+        perfil_inicializacao.imprimir()
+
         # Executar
         return app.exec()
         
@@ -137,4 +140,6 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    # Processos do carregamento paralelo também funcionam no executável gerado
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
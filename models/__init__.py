@@ -2,6 +2,8 @@
 """Modelos de dados para o Monitor de Coletas."""
 
 from .coleta import Coleta
+from .coleta_store import ColetaStore
 from .pool_config import PoolConfig
+from .resumo_pool import ResumoPool
 
-__all__ = ['Coleta', 'PoolConfig']
+__all__ = ['Coleta', 'ColetaStore', 'PoolConfig', 'ResumoPool']
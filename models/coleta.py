@@ -1,11 +1,25 @@
+from typing import Optional
+
+from utils.datas import data_para_ordinal
+
 class Coleta:
     """Representa uma única coleta de taxas."""
 
-    def __init__(self, data: str, coleta_usd: float, taxa_percentual: float = 0.0, dias: int = 0):
+    def __init__(self, data: str, coleta_usd: float, taxa_percentual: float = 0.0, dias: int = 0,
+                 coleta_id: Optional[int] = None, data_ordinal: Optional[int] = None):
         self.data = data
+        # Data já convertida em ordinal (dias, ordenação e filtros usam inteiros)
+        self.data_ordinal = data_para_ordinal(data) if data_ordinal is None else data_ordinal
         self.coleta_usd = coleta_usd
         self.taxa_percentual = taxa_percentual
         self.dias = dias
+        # Identificador atribuído pelo armazenamento
+        self.coleta_id = coleta_id
+
+    def copia(self) -> 'Coleta':
+        """Retorna uma cópia independente da coleta."""
+        return Coleta(self.data, self.coleta_usd, self.taxa_percentual, self.dias, self.coleta_id,
+                      self.data_ordinal)
 
     def __str__(self):
         return f'Coleta({self.data}, ${self.coleta_usd:.2f}, {self.taxa_percentual:.4f}%, {self.dias} dias)'
@@ -0,0 +1,271 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, Iterator, Optional, Tuple
+
+from models.coleta import Coleta
+from utils.datas import ordinal_para_data
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Combina data e centavos numa chave inteira (valores até US$ 100 bilhões)
+FATOR_CHAVE = 10 ** 13
+
+class ColetaStore:
+    """Coletas de uma pool armazenadas em colunas (arrays tipados).
+
+    Datas ficam como ordinais inteiros; valores, taxas, dias e ids em arrays
+    contíguos. O acesso por índice ou iteração devolve objetos `Coleta`
+    (cópias), mantendo a compatibilidade com a interface gráfica.
+
+    `acumulado` é um índice de somas prefixadas dos valores: `acumulado[i]`
+    é o total coletado até a linha i, mantido a cada alteração.
+
+    Há também um índice de duplicidade (data, valor em centavos) → quantidade,
+    montado na primeira consulta e mantido a cada inserção, edição e remoção.
+    """
+
+    COLUNAS = ('ordinais', 'valores', 'taxas', 'dias', 'ids')
+
+    def __init__(self):
+        self.ordinais = array('i')
+        self.valores = array('d')
+        self.taxas = array('d')
+        self.dias = array('i')
+        self.ids = array('q')
+        self.acumulado = array('d')
+        self._indice_duplicidade: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def de_colunas(cls, ordinais: array, valores: array, taxas: array, dias: array,
+                   ids: array) -> 'ColetaStore':
+        """Usa colunas já prontas (do mesmo tamanho, sem copiá-las) e calcula as somas acumuladas."""
+        coletas = cls()
+        coletas.ordinais, coletas.valores, coletas.taxas, coletas.dias, coletas.ids = (
+            ordinais, valores, taxas, dias, ids
+        )
+        coletas.acumulado = array('d', accumulate(valores))
+        return coletas
+
+    def __len__(self) -> int:
+        return len(self.valores)
+
+    def __getitem__(self, indice: int) -> Coleta:
+        data_ordinal = self.ordinais[indice]
+        return Coleta(
+            ordinal_para_data(data_ordinal),
+            self.valores[indice],
+            self.taxas[indice],
+            self.dias[indice],
+            self.ids[indice],
+            data_ordinal
+        )
+
+    def __iter__(self) -> Iterator[Coleta]:
+        for indice in range(len(self)):
+            yield self[indice]
+
+    def __repr__(self) -> str:
+        return f"ColetaStore({list(self)})"
+
+    def __getstate__(self) -> dict:
+        # Ao copiar entre processos, o índice de duplicidade é remontado no destino sob demanda
+        estado = self.__dict__.copy()
+        estado['_indice_duplicidade'] = None
+        return estado
+
+    def adicionar(self, data_ordinal: int, coleta_usd: float, taxa_percentual: float,
+                  dias: int, coleta_id: int) -> None:
+        """Acrescenta uma coleta ao final."""
+        self.ordinais.append(data_ordinal)
+        self.valores.append(coleta_usd)
+        self.taxas.append(taxa_percentual)
+        self.dias.append(dias)
+        self.ids.append(coleta_id)
+        self.acumulado.append(self.acumulado_ate(len(self.acumulado) - 1) + coleta_usd)
+        self._indexar(data_ordinal, coleta_usd, 1)
+
+    def estender(self, ordinais: array, valores: array, taxas: array, dias: array, ids: array) -> None:
+        """Acrescenta várias coletas ao final de uma vez (colunas do mesmo tamanho)."""
+        inicio = len(self)
+        for nome, coluna in zip(self.COLUNAS, (ordinais, valores, taxas, dias, ids)):
+            getattr(self, nome).extend(coluna)
+        indice = self._indice_duplicidade
+        if indice is not None:
+            for chave in map(self.chave, ordinais, valores):
+                indice[chave] = indice.get(chave, 0) + 1
+        self.acumulado.extend(array('d', bytes(8 * (len(self) - inicio))))
+        self._reparar_acumulado(inicio)
+
+    def append(self, coleta: Coleta) -> None:
+        """Acrescenta uma `Coleta` ao final."""
+        self.adicionar(coleta.data_ordinal, coleta.coleta_usd,
+                       coleta.taxa_percentual, coleta.dias, coleta.coleta_id)
+
+    def inserir(self, data_ordinal: int, coleta_usd: float, taxa_percentual: float,
+                dias: int, coleta_id: int) -> int:
+        """Insere uma coleta mantendo a ordem por (data, id) e retorna seu índice."""
+        indice = self._posicao(data_ordinal, coleta_id)
+        self._inserir_linha(indice, (data_ordinal, coleta_usd, taxa_percentual, dias, coleta_id))
+        self.acumulado.append(0.0)
+        self._reparar_acumulado(indice)
+        return indice
+
+    def atualizar(self, indice: int, data_ordinal: int, coleta_usd: float, taxa_percentual: float) -> int:
+        """Altera data, valor e taxa de uma coleta e retorna seu novo índice.
+
+        Se a nova data sair da ordem, a coleta é movida para a posição correta.
+        """
+        chave = (data_ordinal, self.ids[indice])
+        no_lugar = ((indice == 0 or (self.ordinais[indice - 1], self.ids[indice - 1]) <= chave)
+                    and (indice == len(self) - 1 or chave <= (self.ordinais[indice + 1], self.ids[indice + 1])))
+        if no_lugar:
+            self._indexar(self.ordinais[indice], self.valores[indice], -1)
+            self._indexar(data_ordinal, coleta_usd, 1)
+            self.ordinais[indice] = data_ordinal
+            self.taxas[indice] = taxa_percentual
+            if self.valores[indice] != coleta_usd:
+                self.valores[indice] = coleta_usd
+                self._reparar_acumulado(indice)
+            return indice
+
+        _, _, _, dias, coleta_id = self._remover_linha(indice)
+        novo_indice = self._posicao(data_ordinal, coleta_id)
+        self._inserir_linha(novo_indice, (data_ordinal, coleta_usd, taxa_percentual, dias, coleta_id))
+        self._reparar_acumulado(min(indice, novo_indice))
+        return novo_indice
+
+    def pop(self, indice: int = -1) -> Coleta:
+        """Remove e retorna a coleta do índice informado."""
+        coleta = self[indice]
+        if indice < 0:
+            indice += len(self)
+        self._remover_linha(indice)
+        del self.acumulado[-1]
+        self._reparar_acumulado(indice)
+        return coleta
+
+    def _posicao(self, data_ordinal: int, coleta_id: int) -> int:
+        """Posição de inserção pela data; na mesma data, pela ordem dos ids."""
+        indice = bisect_right(self.ordinais, data_ordinal)
+        while indice > 0 and self.ordinais[indice - 1] == data_ordinal and self.ids[indice - 1] > coleta_id:
+            indice -= 1
+        return indice
+
+    def _inserir_linha(self, indice: int, linha: tuple) -> None:
+        for nome, valor in zip(self.COLUNAS, linha):
+            getattr(self, nome).insert(indice, valor)
+        self._indexar(linha[0], linha[1], 1)
+
+    def _remover_linha(self, indice: int) -> tuple:
+        linha = tuple(getattr(self, nome)[indice] for nome in self.COLUNAS)
+        for nome in self.COLUNAS:
+            del getattr(self, nome)[indice]
+        self._indexar(linha[0], linha[1], -1)
+        return linha
+
+    @staticmethod
+    def chave(data_ordinal: int, coleta_usd: float) -> int:
+        """Chave de duplicidade de uma coleta: data e valor em centavos."""
+        return data_ordinal * FATOR_CHAVE + round(coleta_usd * 100)
+
+    def _indexar(self, data_ordinal: int, coleta_usd: float, quantidade: int) -> None:
+        """Soma `quantidade` ocorrências da chave no índice de duplicidade (se já montado)."""
+        if self._indice_duplicidade is None:
+            return
+        chave = self.chave(data_ordinal, coleta_usd)
+        total = self._indice_duplicidade.get(chave, 0) + quantidade
+        if total > 0:
+            self._indice_duplicidade[chave] = total
+        else:
+            self._indice_duplicidade.pop(chave, None)
+
+    def _indice(self) -> Dict[int, int]:
+        """Índice de duplicidade, montado no primeiro uso."""
+        if self._indice_duplicidade is None:
+            indice: Dict[int, int] = {}
+            for chave in map(self.chave, self.ordinais, self.valores):
+                indice[chave] = indice.get(chave, 0) + 1
+            self._indice_duplicidade = indice
+        return self._indice_duplicidade
+
+    def contem(self, data_ordinal: int, coleta_usd: float) -> bool:
+        """Indica, em O(1), se já existe uma coleta com a mesma data e valor (em centavos)."""
+        return self.chave(data_ordinal, coleta_usd) in self._indice()
+
+    def contem_chave(self, chave: int) -> bool:
+        """Como `contem`, para uma chave já calculada com `chave()`."""
+        return chave in self._indice()
+
+    def contar_duplicadas(self) -> int:
+        """Quantidade de coletas que repetem data e valor de outra."""
+        return sum(quantidade - 1 for quantidade in self._indice().values())
+
+    def ordenar(self) -> None:
+        """Ordena as coletas por data e, na mesma data, por id."""
+        ordem = sorted(range(len(self)), key=lambda i: (self.ordinais[i], self.ids[i]))
+        if all(posicao == indice for indice, posicao in enumerate(ordem)):
+            return
+        for nome in self.COLUNAS:
+            coluna = getattr(self, nome)
+            setattr(self, nome, array(coluna.typecode, [coluna[i] for i in ordem]))
+        self._reparar_acumulado(0)
+
+    def localizar(self, data_ordinal: int, coleta_id: int) -> int:
+        """Índice da coleta com a data e o id informados (-1 se não existir)."""
+        indice = bisect_left(self.ordinais, data_ordinal)
+        while indice < len(self) and self.ordinais[indice] == data_ordinal:
+            if self.ids[indice] == coleta_id:
+                return indice
+            indice += 1
+        return -1
+
+    def intervalo(self, inicio_ordinal: int, fim_ordinal: int) -> Tuple[int, int]:
+        """Índices [início, fim) das coletas entre as duas datas (inclusive).
+
+        Requer as coletas ordenadas por data.
+        """
+        return (bisect_left(self.ordinais, inicio_ordinal),
+                bisect_right(self.ordinais, fim_ordinal))
+
+    def copia(self) -> 'ColetaStore':
+        """Cópia independente das colunas."""
+        copia = ColetaStore()
+        for nome in self.COLUNAS + ('acumulado',):
+            setattr(copia, nome, getattr(self, nome)[:])
+        return copia
+
+    def acumulado_ate(self, indice: int) -> float:
+        """Total coletado até a linha informada (inclusive), em O(1)."""
+        return self.acumulado[indice] if 0 <= indice < len(self.acumulado) else 0.0
+
+    def acumulado_em(self, data_ordinal: int) -> float:
+        """Total coletado até a data (ordinal) informada, em O(log n).
+
+        Requer as coletas ordenadas por data.
+        """
+        return self.acumulado_ate(bisect_right(self.ordinais, data_ordinal) - 1)
+
+    def _reparar_acumulado(self, inicio: int) -> None:
+        """Refaz as somas prefixadas a partir da linha `inicio`."""
+        if inicio >= len(self.valores):
+            return
+        base = self.acumulado_ate(inicio - 1)
+        self.acumulado[inicio:] = array('d', accumulate(self.valores[inicio:], initial=base))[1:]
+
+    def soma_valores(self) -> float:
+        """Soma dos valores coletados (USD)."""
+        return self._somar(self.valores)
+
+    def soma_taxas(self) -> float:
+        """Soma das taxas percentuais."""
+        return self._somar(self.taxas)
+
+    @staticmethod
+    def _somar(coluna: array) -> float:
+        if np is not None and len(coluna):
+            return float(np.frombuffer(coluna, dtype=np.float64).sum())
+        return sum(coluna)
@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from utils.datas import data_para_ordinal
+
 class PoolConfig:
     """Representa a configuração de uma pool de liquidez."""
     
@@ -11,6 +13,14 @@ class PoolConfig:
         self.valor_inicial = valor_inicial
         self.tipo_moeda = tipo_moeda
     
+    @property
+    def data_abertura_ordinal(self) -> Optional[int]:
+        """Data de abertura como ordinal (None se inválida)."""
+        try:
+            return data_para_ordinal(self.data_abertura)
+        except ValueError:
+            return None
+
     def to_dict(self) -> Dict[str, Any]:
         """Converte a configuração para dicionário."""
         return {
@@ -0,0 +1,38 @@
+from typing import Dict, Any
+
+class ResumoPool:
+    """Totais de uma pool, persistidos para evitar carregar todo o histórico."""
+
+    def __init__(self, pool_id: str, total_coletas: int = 0, total_usd: float = 0.0, total_taxa: float = 0.0):
+        self.pool_id = pool_id
+        self.total_coletas = total_coletas
+        self.total_usd = total_usd
+        self.total_taxa = total_taxa
+
+    def ajustar(self, coletas: int, usd: float, taxa: float) -> None:
+        """Soma as variações informadas aos totais."""
+        self.total_coletas += coletas
+        self.total_usd += usd
+        self.total_taxa += taxa
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte o resumo para dicionário."""
+        return {
+            'pool_id': self.pool_id,
+            'total_coletas': self.total_coletas,
+            'total_usd': self.total_usd,
+            'total_taxa': self.total_taxa
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ResumoPool':
+        """Cria uma instância a partir de um dicionário."""
+        return cls(
+            pool_id=data.get('pool_id', ''),
+            total_coletas=int(data.get('total_coletas', 0)),
+            total_usd=float(data.get('total_usd', 0.0)),
+            total_taxa=float(data.get('total_taxa', 0.0))
+        )
+
+    def __str__(self) -> str:
+        return f"ResumoPool({self.pool_id}, {self.total_coletas} coletas, ${self.total_usd:.2f})"
@@ -1,9 +1,22 @@
-"""Utilitários para o Monitor de Liquidez."""
+"""Utilitários para o Monitor de Liquidez.
+
+Este pacote não importa o PySide6: `core` e `models` dependem dele e precisam
+funcionar sem interface gráfica. Os utilitários de interface (`utils.icons`,
+`utils.styles`) são importados diretamente pela GUI.
+"""
 
 from .paths import get_app_directory, get_data_file_path, get_user_data_directory, get_legacy_file_path
+from .datas import data_para_ordinal, ordinal_para_data
+from .arquivos import escrever_csv_atomico, gravar_csv_temporario
+
+__all__ = ['get_app_directory', 'get_data_file_path', 'get_user_data_directory', 'get_legacy_file_path',
+           'data_para_ordinal', 'ordinal_para_data', 'escrever_csv_atomico', 'gravar_csv_temporario',
+           'ModernStyles']
+
 
-try:
-    from .styles import ModernStyles
-    __all__ = ['get_app_directory', 'get_data_file_path', 'get_user_data_directory', 'get_legacy_file_path', 'ModernStyles']
-except ImportError:
-    __all__ = ['get_app_directory', 'get_data_file_path', 'get_user_data_directory', 'get_legacy_file_path']
\ No newline at end of file
+def __getattr__(nome):
+    # Estilos da interface carregados só quando usados
+    if nome == 'ModernStyles':
+        from .styles import ModernStyles
+        return ModernStyles
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
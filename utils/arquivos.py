@@ -0,0 +1,26 @@
+import csv
+import os
+from typing import Iterable
+
+
+def gravar_csv_temporario(caminho: str, linhas: Iterable[list]) -> str:
+    """Grava as linhas em `caminho`.tmp (sincronizado no disco) e retorna o temporário."""
+    temporario = f'{caminho}.tmp'
+    with open(temporario, 'w', newline='', encoding='utf-8') as file:
+        csv.writer(file).writerows(linhas)
+        file.flush()
+        os.fsync(file.fileno())
+    return temporario
+
+
+def escrever_csv_atomico(caminho: str, linhas: Iterable[list]) -> None:
+    """Grava as linhas em um arquivo temporário e substitui o destino de forma atômica.
+
+    Se a gravação falhar, o temporário é removido e o destino não muda.
+    """
+    temporario = f'{caminho}.tmp'
+    try:
+        os.replace(gravar_csv_temporario(caminho, linhas), caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
@@ -0,0 +1,19 @@
+from datetime import date
+from functools import lru_cache
+
+FORMATO_DATA = "%d/%m/%Y"
+
+@lru_cache(maxsize=None)
+def data_para_ordinal(data: str) -> int:
+    """Converte uma data dd/MM/yyyy no ordinal do calendário (ValueError se inválida)."""
+    try:
+        dia, mes, ano = data.split('/')
+        return date(int(ano), int(mes), int(dia)).toordinal()
+    except (ValueError, AttributeError):
+        raise ValueError(f"Data inválida: {data!r} (esperado dd/MM/yyyy)")
+
+@lru_cache(maxsize=None)
+def ordinal_para_data(ordinal: int) -> str:
+    """Formata um ordinal do calendário como dd/MM/yyyy."""
+    d = date.fromordinal(ordinal)
+    return f"{d.day:02d}/{d.month:02d}/{d.year:04d}"
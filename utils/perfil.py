@@ -0,0 +1,40 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+class PerfilInicializacao:
+    """Mede o tempo de cada etapa da inicialização (ativado por --startup-profile)."""
+
+    def __init__(self):
+        self.ativo = False
+        self.inicio = time.perf_counter()
+        self.etapas: List[Tuple[str, float]] = []
+
+    def ativar(self) -> None:
+        """Passa a registrar as etapas medidas."""
+        self.ativo = True
+
+    @contextmanager
+    def medir(self, nome: str):
+        """Mede o tempo do bloco, se o perfil estiver ativo."""
+        if not self.ativo:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.etapas.append((nome, time.perf_counter() - inicio))
+
+    def imprimir(self) -> None:
+        """Imprime o tempo de cada etapa e o total desde o início do processo."""
+        if not self.ativo:
+            return
+        print("Perfil de inicialização:")
+        for nome, duracao in self.etapas:
+            print(f"  {nome:<40} {duracao * 1000:8.1f} ms")
+        print(f"  {'total':<40} {(time.perf_counter() - self.inicio) * 1000:8.1f} ms")
+
+
+# Instância única compartilhada por main.py e pela janela principal
+perfil_inicializacao = PerfilInicializacao()
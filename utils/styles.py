@@ -121,7 +121,7 @@ class ModernStyles:
         colors = ModernStyles.COLORS
         
         return f"""
-            QTableWidget {{
+            QTableView {{
                 gridline-color: {colors['gray_200']};
                 background-color: {colors['background']};
                 alternate-background-color: {colors['gray_50']};
@@ -147,14 +147,14 @@ class ModernStyles:
                 border-right: none;
                 border-top-right-radius: 8px;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 12px 8px;
                 border-bottom: 1px solid {colors['gray_200']};
             }}
-            QTableWidget::item:hover {{
+            QTableView::item:hover {{
                 background-color: {colors['primary_light']};
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {colors['primary']};
                 color: white;
             }}